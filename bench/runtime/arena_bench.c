@@ -0,0 +1,65 @@
+/*
+ * Microbenchmark for the runtime's arena allocator.
+ *
+ * Usage: arena_bench [allocations]   (default 10000000)
+ *
+ * Build with -DSLOP_ARENA_DEFAULT_SIZE=N to vary the first block size
+ * (`make bench-arena` runs several). Two workloads:
+ *   one arena   allocations of 8 to 64 bytes from one arena
+ *   per request the same allocations in batches of 1000, resetting the
+ *               arena between batches, as a server would per request
+ * Prints nanoseconds per allocation and the arena's blocks and bytes.
+ */
+
+#include "slop_runtime.h"
+
+#include <time.h>
+
+static double now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1e9 + ts.tv_nsec;
+}
+
+static void report(const char* name, slop_arena* arena, double ns, int64_t n) {
+    size_t blocks = 0, bytes = 0;
+    for (slop_arena* b = arena; b; b = b->next) {
+        blocks++;
+        bytes += b->capacity;
+    }
+    printf("%10zu %-12s %10.2f %8zu %12zu\n", (size_t)SLOP_ARENA_DEFAULT_SIZE, name,
+           ns / n, blocks, bytes);
+}
+
+int main(int argc, char** argv) {
+    int64_t n = argc > 1 ? atoll(argv[1]) : 10000000;
+    uint64_t sink = 0;
+
+    const char* header = getenv("ARENA_BENCH_HEADER");
+    if (!header || strcmp(header, "0") != 0) {
+        printf("%10s %-12s %10s %8s %12s\n", "first", "workload", "ns/alloc", "blocks", "bytes");
+    }
+
+    slop_arena arena = slop_arena_new(SLOP_ARENA_DEFAULT_SIZE);
+    double t0 = now_ns();
+    for (int64_t i = 0; i < n; i++) {
+        uint8_t* p = (uint8_t*)slop_arena_alloc(&arena, 8 + (size_t)(i & 7) * 8);
+        p[0] = (uint8_t)i;
+        sink += p[0];
+    }
+    report("one arena", &arena, now_ns() - t0, n);
+    slop_arena_free(&arena);
+
+    arena = slop_arena_new(SLOP_ARENA_DEFAULT_SIZE);
+    t0 = now_ns();
+    for (int64_t i = 0; i < n; i++) {
+        if (i % 1000 == 0) slop_arena_reset(&arena);
+        uint8_t* p = (uint8_t*)slop_arena_alloc(&arena, 8 + (size_t)(i & 7) * 8);
+        p[0] = (uint8_t)i;
+        sink += p[0];
+    }
+    report("per request", &arena, now_ns() - t0, n);
+    slop_arena_free(&arena);
+
+    return sink == 0;
+}
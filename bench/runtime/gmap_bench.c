@@ -0,0 +1,78 @@
+/*
+ * Microbenchmark for the runtime's integer-keyed map, through the typed
+ * accessors the transpiler generates (SLOP_INT_MAP_DEFINE).
+ *
+ * Usage: gmap_bench [max_keys]   (default 10000000)
+ *
+ * For each size from 1e3 up to max_keys, inserts that many distinct keys
+ * in scrambled order, looks each one up, looks up as many absent keys,
+ * then removes them all. Prints nanoseconds per operation and the bytes
+ * the map holds per entry when full.
+ */
+
+#include "slop_runtime.h"
+
+#include <time.h>
+
+typedef struct { int64_t id; int64_t count; } bench_value;
+typedef struct { bool has_value; bench_value value; } bench_option;
+typedef struct { bench_value* data; size_t len; size_t cap; } bench_list;
+SLOP_INT_MAP_DEFINE(int64_t, bench_value, bench_map, bench_option, bench_list)
+
+static double now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1e9 + ts.tv_nsec;
+}
+
+/* Distinct keys in an order unrelated to their values */
+static int64_t key_at(int64_t i) {
+    return (int64_t)((uint64_t)i * 0x9E3779B97F4A7C15ULL);
+}
+
+/* Heap bytes held by a map's entry, value and index arrays */
+static size_t map_bytes(bench_map* m) {
+    return m->gmap_cap * (sizeof(slop_gmap_entry_t) + m->gmap_value_size + 2 * sizeof(uint32_t));
+}
+
+int main(int argc, char** argv) {
+    int64_t max_keys = argc > 1 ? atoll(argv[1]) : 10000000;
+    int64_t sink = 0;
+
+    printf("%10s %12s %12s %12s %12s %12s\n",
+           "keys", "insert ns", "hit ns", "miss ns", "remove ns", "bytes/key");
+    for (int64_t n = 1000; n <= max_keys; n *= 10) {
+        bench_map* m = bench_map_new(NULL);
+        double t0 = now_ns();
+        for (int64_t i = 0; i < n; i++) {
+            bench_value v = {i, 1};
+            bench_map_put(m, key_at(i), v);
+        }
+        double t1 = now_ns();
+        double bytes = (double)map_bytes(m) / n;
+        for (int64_t i = 0; i < n; i++) {
+            bench_option r = bench_map_get(m, key_at(i));
+            sink += r.has_value ? r.value.id : 0;
+        }
+        double t2 = now_ns();
+        for (int64_t i = 0; i < n; i++) {
+            sink += bench_map_has(m, key_at(n + i));
+        }
+        double t3 = now_ns();
+        for (int64_t i = 0; i < n; i++) {
+            bench_map_remove(m, key_at(i));
+        }
+        double t4 = now_ns();
+        printf("%10ld %12.1f %12.1f %12.1f %12.1f %12.1f\n", (long)n,
+               (t1 - t0) / n, (t2 - t1) / n, (t3 - t2) / n, (t4 - t3) / n, bytes);
+        fflush(stdout);
+
+        if (m->gmap_len != 0 || sink != (n - 1) * n / 2) {
+            fprintf(stderr, "gmap_bench: wrong results at %ld keys\n", (long)n);
+            return 1;
+        }
+        sink = 0;
+        map_free(m);
+    }
+    return 0;
+}
@@ -0,0 +1,120 @@
+/*
+ * Benchmark and quality check for the runtime's string hashes
+ * (_slop_hash_wyhash, the default slop_hash_string, and _slop_hash_fnv1a,
+ * selected with SLOP_HASH_FNV1A).
+ *
+ * Usage: hash_bench [keys]   (default 1000000)
+ *
+ * Throughput: hashes 8 B, 64 B and 1 KB keys and prints nanoseconds per
+ * hash and GB/s.
+ *
+ * Quality: hashes `keys` distinct keys from several families (decimal
+ * counters, URL paths, header-like names, binary counters) and prints,
+ * for each hash, the number of full 64-bit collisions and a chi-square
+ * statistic of the low 16 bits (the bits a 65536-slot slop_map probes
+ * from) divided by its degrees of freedom: about 1.0 is uniform.
+ */
+
+#include "slop_runtime.h"
+
+#include <time.h>
+
+typedef uint64_t (*hash_fn)(const uint8_t*, size_t);
+
+static const struct { const char* name; hash_fn fn; } hashes[] = {
+    {"wyhash", _slop_hash_wyhash},
+    {"fnv1a", _slop_hash_fnv1a},
+};
+#define HASH_COUNT (sizeof(hashes) / sizeof(hashes[0]))
+
+/* Keeps the hash calls from being optimized away */
+static volatile uint64_t sink;
+
+static double now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1e9 + ts.tv_nsec;
+}
+
+static void throughput(size_t key_len) {
+    /* Many keys, so consecutive hashes do not see the same bytes */
+    size_t count = 4096;
+    uint8_t* buf = (uint8_t*)malloc(count * key_len);
+    for (size_t i = 0; i < count * key_len; i++) buf[i] = (uint8_t)(i * 131 + (i >> 7));
+    size_t rounds = (size_t)(256e6 / (double)(count * key_len)) + 1;
+
+    for (size_t h = 0; h < HASH_COUNT; h++) {
+        uint64_t sum = 0;
+        double t0 = now_ns();
+        for (size_t r = 0; r < rounds; r++) {
+            for (size_t i = 0; i < count; i++) {
+                sum += hashes[h].fn(buf + i * key_len, key_len);
+            }
+        }
+        double ns = (now_ns() - t0) / (double)(rounds * count);
+        sink = sum;
+        printf("%-8s %6zu B %10.2f ns %10.2f GB/s\n", hashes[h].name, key_len, ns, key_len / ns);
+    }
+    free(buf);
+}
+
+static int compare_u64(const void* a, const void* b) {
+    uint64_t x = *(const uint64_t*)a, y = *(const uint64_t*)b;
+    return (x > y) - (x < y);
+}
+
+/* Key i of a family, written to buf; returns its length */
+static size_t make_key(int family, size_t i, char* buf) {
+    switch (family) {
+    case 0: return (size_t)sprintf(buf, "%zu", i);
+    case 1: return (size_t)sprintf(buf, "/api/v1/users/%zu/orders?page=%zu", i / 16, i % 16);
+    case 2: return (size_t)sprintf(buf, "X-Request-Header-%zu-%zu", i % 1000, i / 1000);
+    default: memcpy(buf, &i, sizeof i); return sizeof i;
+    }
+}
+
+static const char* family_names[] = {"decimal", "url", "header", "binary"};
+
+static void quality(size_t keys) {
+    size_t buckets = 1 << 16;
+    uint64_t* values = (uint64_t*)malloc(keys * sizeof(uint64_t));
+    size_t* counts = (size_t*)malloc(buckets * sizeof(size_t));
+    char buf[128];
+
+    printf("\n%-8s %-8s %12s %12s\n", "hash", "family", "collisions", "chi2/df");
+    for (int family = 0; family < 4; family++) {
+        for (size_t h = 0; h < HASH_COUNT; h++) {
+            memset(counts, 0, buckets * sizeof(size_t));
+            for (size_t i = 0; i < keys; i++) {
+                size_t len = make_key(family, i, buf);
+                values[i] = hashes[h].fn((const uint8_t*)buf, len);
+                counts[values[i] & (buckets - 1)]++;
+            }
+            qsort(values, keys, sizeof(uint64_t), compare_u64);
+            size_t collisions = 0;
+            for (size_t i = 1; i < keys; i++) collisions += values[i] == values[i - 1];
+
+            double expected = (double)keys / buckets, chi2 = 0;
+            for (size_t b = 0; b < buckets; b++) {
+                double d = counts[b] - expected;
+                chi2 += d * d / expected;
+            }
+            printf("%-8s %-8s %12zu %12.3f\n", hashes[h].name, family_names[family],
+                   collisions, chi2 / (buckets - 1));
+        }
+    }
+    free(values);
+    free(counts);
+}
+
+int main(int argc, char** argv) {
+    size_t keys = argc > 1 ? (size_t)atoll(argv[1]) : 1000000;
+
+    printf("slop_hash_string is %s\n\n", slop_hash_string((slop_string){2, "ab"}) ==
+           _slop_hash_fnv1a((const uint8_t*)"ab", 2) ? "fnv1a" : "wyhash");
+    throughput(8);
+    throughput(64);
+    throughput(1024);
+    quality(keys);
+    return 0;
+}
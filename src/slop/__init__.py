@@ -10,15 +10,36 @@ A language designed for hybrid human-machine code generation where:
 
 __version__ = "0.1.0"
 
-from slop.parser import parse, parse_file
-from slop.transpiler import transpile
-from slop.type_checker import TypeChecker, check_file, check_source
-from slop.hole_filler import check_hole_impl, CheckResult
-# Re-export type classes and constants from types module for backwards compatibility
-from slop.types import (
-    Type, PrimitiveType, RangeType, ListType, ArrayType, MapType,
-    RecordType, EnumType, UnionType, OptionType, ResultType, PtrType,
-    FnType, TypeVar, UnknownType, UNKNOWN,
-    STRING, INT, BOOL, UNIT, ARENA, BUILTIN_FUNCTIONS,
-    RangeBounds, Constraint,
-)
+# Public names are resolved on first use (PEP 562), so importing a single
+# submodule such as slop.cli does not load the whole compiler
+_EXPORTS = {
+    'slop.parser': ['parse', 'parse_file', 'parse_iter'],
+    'slop.transpiler': ['transpile'],
+    'slop.type_checker': ['TypeChecker', 'check_file', 'check_source'],
+    'slop.hole_filler': ['check_hole_impl', 'CheckResult'],
+    # Type classes and constants, re-exported for backwards compatibility
+    'slop.types': [
+        'Type', 'PrimitiveType', 'RangeType', 'ListType', 'ArrayType', 'MapType',
+        'RecordType', 'EnumType', 'UnionType', 'OptionType', 'ResultType', 'PtrType',
+        'FnType', 'TypeVar', 'UnknownType', 'UNKNOWN',
+        'STRING', 'INT', 'BOOL', 'UNIT', 'ARENA', 'BUILTIN_FUNCTIONS',
+        'RangeBounds', 'Constraint',
+    ],
+}
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'slop' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
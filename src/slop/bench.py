@@ -0,0 +1,336 @@
+"""
+SLOP Bench - Native vs. Python toolchain comparison
+
+`slop bench toolchain` runs each phase over a set of .slop files with both
+implementations. The phases are parse, check and transpile. Every run is
+a separate process, and the report records its wall time, its peak RSS
+and whether the two outputs agree. The JSON report has a stable layout,
+so reports from different commits can be diffed.
+
+Before comparing, the outputs are normalized to drop differences the
+two toolchains have by design:
+  parse      S-expression structure only. Positions are ignored, and the
+             Python parser's 'sym shorthand is read as (quote sym).
+  check      Line numbers of error diagnostics. The messages differ.
+  transpile  Names of the C functions defined, without the module prefix.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+REPORT_VERSION = 1
+PHASES = ('parse', 'check', 'transpile')
+
+# Component binary used for each phase
+PHASE_COMPONENTS = {'parse': 'parser', 'check': 'checker', 'transpile': 'transpiler'}
+
+_C_FUNCTION_DEF = re.compile(r'^[A-Za-z_][\w \t*]*?\b([A-Za-z_]\w*)\s*\([^;{]*\)\s*\{', re.M)
+
+
+# ============================================================
+# Output normalization
+# ============================================================
+
+def shape_sexpr(expr):
+    """Position-free structure of a Python parser node."""
+    from slop.parser import SList, Symbol, String
+
+    if isinstance(expr, SList):
+        return ['list', [shape_sexpr(item) for item in expr.items]]
+    if isinstance(expr, Symbol):
+        if len(expr.name) > 1 and expr.name.startswith("'"):
+            return ['list', [['symbol', 'quote'], ['symbol', expr.name[1:]]]]
+        return ['symbol', expr.name]
+    if isinstance(expr, String):
+        return ['string', expr.value]
+    return ['number', expr.value]
+
+
+def shape_json(node):
+    """Position-free structure of a node from `slop-parser --format json`."""
+    t = node['type']
+    if t == 'List':
+        return ['list', [shape_json(item) for item in node['items']]]
+    if t == 'Symbol':
+        return ['symbol', node['name']]
+    if t == 'String':
+        return ['string', node['value']]
+    return ['number', node['value']]
+
+
+def c_function_names(code: str, prefix: str = '') -> List[str]:
+    """Sorted names of the functions defined in C code, minus prefix."""
+    return sorted({name[len(prefix):] if prefix and name.startswith(prefix) else name
+                   for name in _C_FUNCTION_DEF.findall(code)})
+
+
+def normalize_native(phase: str, stdout: str):
+    """Normalized result of a native tool run, or None if it produced none."""
+    try:
+        data = json.loads(stdout)
+    except ValueError:
+        return None
+    if phase == 'parse':
+        return [shape_json(node) for node in data]
+    if phase == 'check':
+        return sorted(diag['line'] for module in data.values()
+                      for diag in module['diagnostics'] if diag['level'] == 'error')
+    names = set()
+    for module, code in data.items():
+        prefix = module.replace('-', '_') + '_'
+        # Inline helpers such as range-type constructors live in the header
+        names.update(c_function_names(code['header'] + code['impl'], prefix))
+    return sorted(names)
+
+
+def run_python_phase(phase: str, path: str):
+    """Run one phase with the Python toolchain, returning the normalized result."""
+    if phase == 'parse':
+        from slop.parser import parse
+        return [shape_sexpr(form) for form in parse(Path(path).read_text())]
+    if phase == 'check':
+        from slop.type_checker import check_file
+        return sorted(d.location.line if d.location else 0
+                      for d in check_file(path) if d.severity == 'error')
+    from slop.parser import parse, is_form, Symbol
+    from slop.transpiler import transpile
+    source = Path(path).read_text()
+    module = Path(path).stem
+    for form in parse(source):
+        if is_form(form, 'module') and len(form) > 1 and isinstance(form[1], Symbol):
+            module = form[1].name
+            break
+    return c_function_names(transpile(source), module.replace('-', '_') + '_')
+
+
+# ============================================================
+# Measurement
+# ============================================================
+
+# Spawns the measured command and reports its exit code, wall time and
+# peak RSS. On Linux a child's ru_maxrss includes the RSS of the process
+# that forked it, so the command is not forked from this (large) process
+# but from a minimal interpreter; its footprint is the floor recorded as
+# rss_floor_kb in the report.
+_LAUNCHER = """
+import os, sys, time
+report, argv = sys.argv[1], sys.argv[2:]
+start = time.perf_counter_ns()
+pid = os.posix_spawnp(argv[0], argv, os.environ)
+_, status, usage = os.wait4(pid, 0)
+elapsed = time.perf_counter_ns() - start
+with open(report, 'w') as f:
+    f.write(f"{os.waitstatus_to_exitcode(status)} {elapsed} {usage.ru_maxrss}")
+"""
+
+
+def measure(cmd: Sequence[str], env: Optional[dict] = None) -> dict:
+    """Run cmd, returning its status, stdout, wall time and peak RSS."""
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, 'report')
+        with open(os.path.join(tmp, 'stderr'), 'wb') as stderr:
+            result = subprocess.run([sys.executable, '-I', '-S', '-c', _LAUNCHER, report, *cmd],
+                                    stdout=subprocess.PIPE, stderr=stderr, env=env)
+        try:
+            with open(report) as f:
+                status, elapsed_ns, maxrss = map(int, f.read().split())
+        except (OSError, ValueError):
+            # The command could not be started
+            status, elapsed_ns, maxrss = result.returncode or 127, 0, 0
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    rss_kb = maxrss // 1024 if sys.platform == 'darwin' else maxrss
+    return {'status': status, 'stdout': result.stdout.decode(errors='replace'),
+            'wall_ms': elapsed_ns / 1e6, 'peak_rss_kb': rss_kb}
+
+
+def rss_floor_kb() -> Optional[int]:
+    """Peak RSS reported for a command that does nothing."""
+    true = shutil.which('true')
+    return measure([true])['peak_rss_kb'] if true else None
+
+
+def _best(runs: List[dict]) -> dict:
+    """Fastest wall time and largest peak RSS over repeated runs."""
+    return dict(runs[-1], wall_ms=min(r['wall_ms'] for r in runs),
+                peak_rss_kb=max(r['peak_rss_kb'] for r in runs))
+
+
+def bench_python(phase: str, path: str, repeat: int = 1) -> dict:
+    """Run a phase with the Python toolchain in a fresh interpreter."""
+    src = str(Path(__file__).parent.parent)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [src, os.environ.get('PYTHONPATH')])))
+    cmd = [sys.executable, '-m', 'slop.bench', phase, path]
+    run = _best([measure(cmd, env) for _ in range(repeat)])
+    try:
+        result = json.loads(run['stdout'])
+    except ValueError:
+        result = {'ok': False, 'output': None, 'phase_ms': None}
+    return {'ok': result['ok'], 'wall_ms': round(run['wall_ms'], 3),
+            'phase_ms': result['phase_ms'], 'peak_rss_kb': run['peak_rss_kb'],
+            'output': result['output']}
+
+
+def bench_native(phase: str, binary, path: str, repeat: int = 1) -> dict:
+    """Run a phase with a native binary."""
+    cmd = [str(binary), path]
+    if phase == 'parse':
+        cmd = [str(binary), '--format', 'json', path]
+    run = _best([measure(cmd) for _ in range(repeat)])
+    output = normalize_native(phase, run['stdout'])
+    # The checker exits non-zero when it reports errors; that still counts
+    ok = output is not None and (run['status'] == 0 or phase == 'check')
+    return {'ok': ok, 'wall_ms': round(run['wall_ms'], 3),
+            'peak_rss_kb': run['peak_rss_kb'], 'output': output if ok else None}
+
+
+def _worker():
+    """Python-side benchmark process: `python -m slop.bench <phase> <path>`."""
+    phase, path = sys.argv[1], sys.argv[2]
+    start = time.perf_counter()
+    try:
+        output, ok = run_python_phase(phase, path), True
+    except Exception:
+        output, ok = None, False
+    phase_ms = round((time.perf_counter() - start) * 1000, 3)
+    sys.stdout.write(json.dumps({'ok': ok, 'output': output, 'phase_ms': phase_ms}))
+
+
+# ============================================================
+# Reports
+# ============================================================
+
+def default_files(root: Path) -> List[Path]:
+    """examples/ and lib/compiler/ sources under root."""
+    return sorted(root.glob('examples/**/*.slop')) + sorted(root.glob('lib/compiler/**/*.slop'))
+
+
+def collect_files(paths: Sequence[str]) -> List[Path]:
+    """Expand directories to the .slop files below them."""
+    files = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.rglob('*.slop')) if p.is_dir() else [p])
+    return files
+
+
+def run_benchmark(files: Sequence[Path], phases: Sequence[str] = PHASES,
+                  binaries: Optional[Dict[str, Optional[Path]]] = None,
+                  repeat: int = 1, root: Optional[Path] = None,
+                  progress=None) -> dict:
+    """Benchmark every phase of every file with both toolchains.
+
+    Args:
+        files: .slop files to process
+        phases: Subset of PHASES
+        binaries: Component name -> native binary (default: slop.toolchain)
+        repeat: Runs per measurement; the fastest wall time is kept
+        root: Directory paths in the report are made relative to
+        progress: Optional callable(path, phase) called before each run
+
+    Returns:
+        The report as a JSON-serializable dict
+    """
+    from slop.toolchain import find_component
+
+    if binaries is None:
+        binaries = {}
+        for phase in phases:
+            component = find_component(PHASE_COMPONENTS[phase])
+            binaries[PHASE_COMPONENTS[phase]] = component.path if component else None
+
+    entries = []
+    for path in files:
+        name = str(path.relative_to(root)) if root and path.is_relative_to(root) else str(path)
+        entry = {'path': name, 'phases': {}}
+        for phase in phases:
+            if progress:
+                progress(name, phase)
+            python = bench_python(phase, str(path), repeat)
+            binary = binaries.get(PHASE_COMPONENTS[phase])
+            native = bench_native(phase, binary, str(path), repeat) if binary else None
+            equivalent = None
+            if native is not None:
+                equivalent = (python['ok'] == native['ok']
+                              and python.pop('output') == native.pop('output'))
+            else:
+                python.pop('output')
+            entry['phases'][phase] = {'python': python, 'native': native,
+                                      'equivalent': equivalent}
+        entries.append(entry)
+
+    return {
+        'version': REPORT_VERSION,
+        'commit': _git_commit(root),
+        'python': sys.version.split()[0],
+        'native': {name: str(binary) if binary else None for name, binary in binaries.items()},
+        'repeat': repeat,
+        'rss_floor_kb': rss_floor_kb(),
+        'files': entries,
+        'summary': summarize(entries, phases),
+    }
+
+
+def summarize(entries: List[dict], phases: Sequence[str]) -> Dict[str, dict]:
+    """Per-phase totals over all files."""
+    summary = {}
+    for phase in phases:
+        results = [e['phases'][phase] for e in entries]
+        compared = [r for r in results if r['native'] is not None]
+        python_ms = sum(r['python']['wall_ms'] for r in compared)
+        native_ms = sum(r['native']['wall_ms'] for r in compared)
+        summary[phase] = {
+            'files': len(results),
+            'compared': len(compared),
+            'equivalent': sum(1 for r in compared if r['equivalent']),
+            'python_ms': round(sum(r['python']['wall_ms'] for r in results), 3),
+            'native_ms': round(native_ms, 3) if compared else None,
+            'speedup': round(python_ms / native_ms, 2) if compared and native_ms else None,
+            'python_peak_rss_kb': max((r['python']['peak_rss_kb'] for r in results), default=0),
+            'native_peak_rss_kb': max((r['native']['peak_rss_kb'] for r in compared),
+                                      default=None),
+        }
+    return summary
+
+
+def format_summary(report: dict) -> str:
+    """Human-readable table of a report's summary."""
+    lines = [f"{'phase':<10} {'files':>5} {'equal':>7} {'python ms':>10} "
+             f"{'native ms':>10} {'speedup':>8} {'py RSS MB':>9} {'nat RSS MB':>10}"]
+    # Reports read back from JSON have their keys sorted
+    for phase in [p for p in PHASES if p in report['summary']]:
+        s = report['summary'][phase]
+        native_ms = f"{s['native_ms']:.1f}" if s['native_ms'] is not None else '-'
+        speedup = f"{s['speedup']:.1f}x" if s['speedup'] is not None else '-'
+        native_rss = (f"{s['native_peak_rss_kb'] / 1024:.1f}"
+                      if s['native_peak_rss_kb'] is not None else '-')
+        lines.append(f"{phase:<10} {s['files']:>5} {s['equivalent']:>3}/{s['compared']:<3} "
+                     f"{s['python_ms']:>10.1f} {native_ms:>10} {speedup:>8} "
+                     f"{s['python_peak_rss_kb'] / 1024:>9.1f} {native_rss:>10}")
+    differing = [(e['path'], phase) for e in report['files']
+                 for phase, r in e['phases'].items() if r['equivalent'] is False]
+    if differing:
+        lines.append("")
+        lines.append("Outputs differ:")
+        lines.extend(f"  {path} ({phase})" for path, phase in differing)
+    return '\n'.join(lines)
+
+
+def _git_commit(root: Optional[Path]) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+if __name__ == '__main__':
+    _worker()
@@ -0,0 +1,160 @@
+"""
+SLOP Binary AST - Decoder for `slop-parser --format bin`
+
+The layout is documented in lib/compiler/parser/binast.slop. Decoding
+walks a memoryview with precompiled struct formats and an explicit
+stack, so there is no intermediate dict per node and no recursion limit
+on nesting depth. Symbol names come from the stream's symbol table and
+are interned once each.
+
+`slop-parser --batch --format bin` wraps one such stream per file in a
+batch container, read by decode_binary_batch.
+"""
+
+import struct
+from sys import intern
+from typing import Dict, List, Tuple, Union
+
+from slop.parser import SExpr, Symbol, String, Number, SList
+
+
+BINAST_MAGIC = b'SLAB'
+BINAST_BATCH_MAGIC = b'SLBB'
+BINAST_VERSION = 1
+
+_TAG_LIST, _TAG_SYMBOL, _TAG_SYMBOL_REF, _TAG_STRING, _TAG_INT, _TAG_FLOAT = range(6)
+
+_HEADER = struct.Struct('<4sBI')
+_NODE = struct.Struct('<BII')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+
+
+class BinaryAstError(ValueError):
+    """Malformed or unsupported binary AST data."""
+    pass
+
+
+def _read_header(buf, pos: int, magic: bytes, what: str) -> Tuple[int, int]:
+    """Check a stream header at pos, returning (item count, position after it)."""
+    try:
+        found, version, count = _HEADER.unpack_from(buf, pos)
+    except struct.error:
+        raise BinaryAstError(f"truncated {what} header") from None
+    if found != magic:
+        raise BinaryAstError(f"not a {what} (bad magic)")
+    if version != BINAST_VERSION:
+        raise BinaryAstError(f"unsupported {what} version {version}")
+    return count, pos + _HEADER.size
+
+
+def decode_binary_ast(data) -> List[SExpr]:
+    """Decode a binary AST (bytes-like) into a list of top-level forms."""
+    buf = memoryview(data)
+    forms, end = _decode_forms(buf, 0)
+    if end != len(buf):
+        raise BinaryAstError("trailing data after binary AST")
+    return forms
+
+
+def decode_binary_batch(data) -> Dict[str, Tuple[Union[List[SExpr], str], bool]]:
+    """Decode a batch into {path: (result, success)}, in file order.
+
+    On success result is the file's list of top-level forms; on failure
+    it is the error message the parser printed for that file.
+    """
+    buf = memoryview(data)
+    count, pos = _read_header(buf, 0, BINAST_BATCH_MAGIC, "binary AST batch")
+    results = {}
+    try:
+        for _ in range(count):
+            path, pos = _read_text(buf, pos)
+            status = buf[pos]
+            pos += 1
+            if status == 0:
+                forms, pos = _decode_forms(buf, pos)
+                results[path] = (forms, True)
+            elif status == 1:
+                message, pos = _read_text(buf, pos)
+                results[path] = (message, False)
+            else:
+                raise BinaryAstError(f"unknown batch entry status {status}")
+    except IndexError:
+        raise BinaryAstError("truncated binary AST batch") from None
+    if pos != len(buf):
+        raise BinaryAstError("trailing data after binary AST batch")
+    return results
+
+
+def _read_text(buf, pos: int) -> Tuple[str, int]:
+    """Read a length-prefixed UTF-8 string at pos."""
+    try:
+        (n,) = _U32.unpack_from(buf, pos)
+    except struct.error:
+        raise BinaryAstError("truncated binary AST batch") from None
+    end = pos + 4 + n
+    if end > len(buf):
+        raise BinaryAstError("truncated binary AST batch")
+    return str(buf[pos + 4:end], 'utf-8'), end
+
+
+def _decode_forms(buf, pos: int) -> Tuple[List[SExpr], int]:
+    """Decode one binary AST starting at pos, returning (forms, end position)."""
+    count, pos = _read_header(buf, pos, BINAST_MAGIC, "binary AST")
+
+    node_unpack = _NODE.unpack_from
+    u32_unpack = _U32.unpack_from
+    i64_unpack = _I64.unpack_from
+    symbols: List[str] = []
+    top: List[SExpr] = []
+    # (items being filled, children still to read) for each open list
+    stack = []
+    items, remaining = top, count
+    try:
+        while True:
+            while remaining == 0:
+                if not stack:
+                    return top, pos
+                items, remaining = stack.pop()
+            remaining -= 1
+
+            tag, line, col = node_unpack(buf, pos)
+            pos += 9
+            if tag == _TAG_SYMBOL_REF:
+                (index,) = u32_unpack(buf, pos)
+                pos += 4
+                items.append(Symbol(symbols[index], line, col))
+            elif tag == _TAG_LIST:
+                (n,) = u32_unpack(buf, pos)
+                pos += 4
+                children: List[SExpr] = []
+                items.append(SList(children, line, col))
+                if n:
+                    stack.append((items, remaining))
+                    items, remaining = children, n
+            elif tag == _TAG_INT:
+                (value,) = i64_unpack(buf, pos)
+                pos += 8
+                items.append(Number(value, line, col))
+            else:
+                (n,) = u32_unpack(buf, pos)
+                pos += 4
+                end = pos + n
+                if end > len(buf):
+                    raise BinaryAstError("truncated binary AST")
+                text = str(buf[pos:end], 'utf-8')
+                pos = end
+                if tag == _TAG_SYMBOL:
+                    text = intern(text)
+                    symbols.append(text)
+                    items.append(Symbol(text, line, col))
+                elif tag == _TAG_STRING:
+                    items.append(String(text, line, col))
+                elif tag == _TAG_FLOAT:
+                    items.append(Number(float(text), line, col))
+                else:
+                    raise BinaryAstError(f"unknown node tag {tag}")
+    except struct.error:
+        raise BinaryAstError("truncated binary AST") from None
+    except IndexError:
+        raise BinaryAstError("symbol reference out of range") from None
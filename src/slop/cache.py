@@ -0,0 +1,284 @@
+"""
+SLOP Cache - Persistent on-disk caches shared across CLI invocations
+
+Layout (under SLOP_CACHE_DIR, default ./.slop-cache):
+  ast/            Parsed ASTs keyed by source content hash and parser version
+  build/<target>/ Incremental build state for one `slop build` target:
+                  manifest.json plus the generated .h/.c and .o files
+  toolchain.json  Content hashes of native toolchain binaries (slop.toolchain)
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from slop.parser import SExpr, Symbol, String, Number, SList, PARSER_VERSION, is_form
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the serialized node layout below changes
+_AST_FORMAT_VERSION = 1
+
+_SLIST, _SYMBOL, _STRING, _NUMBER = 0, 1, 2, 3
+
+
+def default_cache_dir() -> Path:
+    """Cache root: $SLOP_CACHE_DIR if set, else .slop-cache in the working directory."""
+    return Path(os.environ.get('SLOP_CACHE_DIR') or '.slop-cache')
+
+
+def _encode(expr: SExpr) -> tuple:
+    if isinstance(expr, SList):
+        return (_SLIST, [_encode(item) for item in expr.items], expr.line, expr.col)
+    if isinstance(expr, Symbol):
+        return (_SYMBOL, expr.name, expr.line, expr.col)
+    if isinstance(expr, String):
+        return (_STRING, expr.value, expr.line, expr.col)
+    return (_NUMBER, expr.value, expr.line, expr.col)
+
+
+def _decode(node: tuple) -> SExpr:
+    kind, value, line, col = node
+    if kind == _SLIST:
+        return SList([_decode(item) for item in value], line, col)
+    if kind == _SYMBOL:
+        return Symbol(value, line, col)
+    if kind == _STRING:
+        return String(value, line, col)
+    return Number(value, line, col)
+
+
+@dataclass
+class CacheStats:
+    """Summary of an on-disk cache directory."""
+    path: Path
+    entries: int
+    total_bytes: int
+    max_bytes: int
+
+
+class ParseCache:
+    """Content-addressed cache of parsed ASTs.
+
+    Entries are marshal-encoded node tuples (symbol names stay interned on
+    load). Least-recently-used entries are evicted once the directory grows
+    past max_bytes; a hit refreshes the entry's mtime. Any I/O or decode
+    failure is treated as a miss, so a damaged cache never breaks parsing.
+
+    The directory size is summed once per instance and then kept as a
+    running total, so puts only rescan the directory when the total goes
+    over budget. Entries written by other processes are picked up then.
+    """
+
+    SUFFIX = '.ast'
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.dir = (root or default_cache_dir()) / 'ast'
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes: Optional[int] = None
+
+    def _entry_path(self, source: str) -> Path:
+        h = hashlib.sha256()
+        h.update(f"{PARSER_VERSION}:{_AST_FORMAT_VERSION}:".encode())
+        h.update(source.encode('utf-8', 'surrogatepass'))
+        return self.dir / (h.hexdigest() + self.SUFFIX)
+
+    def get(self, source: str) -> Optional[List[SExpr]]:
+        """Return the cached AST for source, or None on a miss."""
+        path = self._entry_path(source)
+        try:
+            data = path.read_bytes()
+            ast = [_decode(node) for node in marshal.loads(data)]
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError, TypeError):
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return ast
+
+    def put(self, source: str, ast: List[SExpr]) -> None:
+        """Store the AST for source, evicting old entries if over budget."""
+        path = self._entry_path(source)
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            data = marshal.dumps([_encode(form) for form in ast])
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            # Write-then-rename so concurrent readers never see partial entries
+            fd, tmp = tempfile.mkstemp(dir=self.dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except (OSError, ValueError):
+            return
+        self._total_bytes += len(data) - replaced
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> list:
+        """List (mtime, size, path) for every entry."""
+        entries = []
+        try:
+            for entry in os.scandir(self.dir):
+                if entry.name.endswith(self.SUFFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._total_bytes = total
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(self.dir, len(entries), sum(size for _, size, _ in entries),
+                          self.max_bytes)
+
+    def clear(self) -> int:
+        """Remove all entries, returning how many were deleted."""
+        entries = self._entries()
+        for _, _, path in entries:
+            path.unlink(missing_ok=True)
+        self._total_bytes = 0
+        return len(entries)
+
+
+def hash_bytes(*parts: bytes) -> str:
+    """Stable content hash used for build cache keys."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(len(part).to_bytes(8, 'little'))
+        h.update(part)
+    return h.hexdigest()
+
+
+def hash_file(path) -> str:
+    with open(path, 'rb') as f:
+        return hash_bytes(f.read())
+
+
+# Top-level forms whose full text is part of a module's interface
+_INTERFACE_FORMS = ('export', 'type', 'const', 'ffi', 'ffi-struct')
+
+
+def interface_fingerprint(ast: List[SExpr], exports) -> str:
+    """Hash of what a module exposes to its importers.
+
+    Covers the export list, type, constant and FFI declarations, and the
+    name, parameters and @spec of each exported function. Function bodies,
+    contracts and private functions are left out, so editing them does not
+    change the fingerprint. Source positions are not included either.
+    """
+    forms = []
+    for form in ast:
+        if is_form(form, 'module'):
+            forms.extend(form.items[2:])
+        else:
+            forms.append(form)
+
+    parts = []
+    for form in forms:
+        if any(is_form(form, kind) for kind in _INTERFACE_FORMS):
+            parts.append(repr(form))
+        elif (is_form(form, 'fn') or is_form(form, 'impl')) and len(form) > 2:
+            name = form[1]
+            if isinstance(name, Symbol) and name.name in exports:
+                spec = [item for item in form.items[3:] if is_form(item, '@spec')]
+                parts.append(repr(SList(form.items[:3] + spec)))
+    return hash_bytes(*(part.encode() for part in parts))
+
+
+class BuildCache:
+    """Incremental build state for one build target.
+
+    Each target (entry file + output + build flavour) gets its own
+    directory holding the generated C sources, object files and a JSON
+    manifest. The manifest records, per module, the source hash, the
+    hashes of its imports at the time it was checked, the diagnostics it
+    produced and the hash of its generated C, plus the key of the last
+    successful link.
+    """
+
+    MANIFEST = 'manifest.json'
+    # Bump when the manifest layout changes
+    VERSION = 3
+
+    def __init__(self, target: str, root: Optional[Path] = None):
+        key = hashlib.sha256(target.encode()).hexdigest()[:16]
+        self.dir = (root or default_cache_dir()) / 'build' / key
+        self.manifest = self._load()
+
+    def _empty(self) -> dict:
+        return {'version': self.VERSION, 'toolchain': None, 'modules': {}, 'objects': {},
+                'link': None}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.dir / self.MANIFEST) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return self._empty()
+        if not isinstance(manifest, dict) or manifest.get('version') != self.VERSION:
+            return self._empty()
+        return manifest
+
+    def save(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.dir / self.MANIFEST)
+
+    def clean(self) -> None:
+        """Forget all state and delete generated files (slop build --rebuild)."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.manifest = self._empty()
+
+    @property
+    def modules(self) -> Dict[str, dict]:
+        return self.manifest['modules']
+
+    def write_if_changed(self, name: str, content: str) -> bool:
+        """Write a generated file, leaving it untouched if identical.
+
+        Returns True if the file was (re)written.
+        """
+        path = self.dir / name
+        data = content.encode()
+        try:
+            if path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return True
@@ -9,23 +9,21 @@ Commands:
   check      Validate types and contracts
   build      Full pipeline: fill → transpile → compile
   derive     Generate SLOP types from schemas (JSON Schema, OpenAPI, SQL)
+  cache      Inspect or clear the on-disk parse cache
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from slop.parser import parse, parse_file, pretty_print, find_holes, is_form, SList, get_imports
-from slop.transpiler import Transpiler, transpile, transpile_multi
-from slop.hole_filler import HoleFiller, extract_hole, classify_tier, replace_holes_in_ast
-from slop.formatter import format_source
-from slop.providers import (
-    MockProvider, create_default_configs, load_config, create_from_config, Tier,
-    load_project_config, ProjectConfig, BuildConfig
-)
-from slop.type_checker import TypeChecker, check_file, check_modules
-from slop.resolver import ModuleResolver, ResolverError
+# Subcommand modules are imported inside the functions that use them, so
+# light commands such as `slop ref` do not load the whole compiler
+if TYPE_CHECKING:
+    from slop.parser import SList
 
 
 def extract_requires_blocks(ast):
@@ -37,6 +35,7 @@ def extract_requires_blocks(ast):
       - prompt: the prompt text if present
       - functions: list of required function signatures
     """
+    from slop.parser import SList, is_form, pretty_print
     requires = []
     for form in ast:
         if is_form(form, '@requires') and len(form) > 1:
@@ -77,29 +76,18 @@ def extract_requires_blocks(ast):
 def find_native_component(name: str):
     """Find a native SLOP component binary.
 
+    Resolved once per process; see slop.toolchain for the search order.
+
     Args:
         name: Component name (e.g., 'parser', 'transpiler', 'checker')
 
     Returns:
         Path to binary if found, None otherwise
     """
-    from pathlib import Path
+    from slop.toolchain import find_component
 
-    binary_name = f"slop-{name}"
-    # Project root bin/ directory (cli.py is at src/slop/cli.py)
-    project_root = Path(__file__).parent.parent.parent
-    locations = [
-        project_root / "bin" / binary_name,
-        Path.cwd() / binary_name,
-        Path.cwd() / "build" / binary_name,
-        # Native components built in lib/compiler/{name}/
-        Path.cwd() / "lib" / "compiler" / name / binary_name,
-    ]
-
-    for loc in locations:
-        if loc.exists():
-            return loc
-    return None
+    component = find_component(name)
+    return component.path if component else None
 
 
 def parse_native(input_file: str):
@@ -130,6 +118,10 @@ def parse_native(input_file: str):
 def _json_to_ast(json_data):
     """Convert JSON AST to Python AST objects.
 
+    Walks the tree with an explicit stack, so nesting depth is not bound
+    by the recursion limit. Symbol names are interned, so repeated
+    symbols such as `let` or `Int` share one string.
+
     Args:
         json_data: Either a list (top-level) or a dict (single node)
 
@@ -138,24 +130,32 @@ def _json_to_ast(json_data):
     """
     from slop.parser import Symbol, String, Number, SList
 
-    if isinstance(json_data, list):
-        return [_json_to_ast(item) for item in json_data]
-
-    t = json_data['type']
-    line = json_data.get('line', 0)
-    col = json_data.get('col', 0)
-
-    if t == 'Symbol':
-        return Symbol(json_data['name'], line, col)
-    elif t == 'String':
-        return String(json_data['value'], line, col)
-    elif t == 'Number':
-        return Number(json_data['value'], line, col)
-    elif t == 'List':
-        items = [_json_to_ast(item) for item in json_data['items']]
-        return SList(items, line, col)
-    else:
-        raise ValueError(f"Unknown AST node type: {t}")
+    top = []
+    # (remaining children, list they are appended to) for each open list
+    stack = [(iter(json_data if isinstance(json_data, list) else [json_data]), top)]
+    while stack:
+        nodes, out = stack[-1]
+        for node in nodes:
+            t = node['type']
+            line = node.get('line', 0)
+            col = node.get('col', 0)
+            if t == 'Symbol':
+                out.append(Symbol(sys.intern(node['name']), line, col))
+            elif t == 'List':
+                items = []
+                out.append(SList(items, line, col))
+                stack.append((iter(node['items']), items))
+                break
+            elif t == 'String':
+                out.append(String(node['value'], line, col))
+            elif t == 'Number':
+                out.append(Number(node['value'], line, col))
+            else:
+                raise ValueError(f"Unknown AST node type: {t}")
+        else:
+            stack.pop()
+
+    return top if isinstance(json_data, list) else top[0]
 
 
 def parse_native_json(input_file: str):
@@ -168,19 +168,15 @@ def parse_native_json(input_file: str):
         Tuple of (result, success). On success, result is list of AST nodes.
         On failure, result is error message string.
     """
-    import subprocess
     import json
+    from slop.toolserver import run_tool
 
     parser_bin = find_native_component('parser')
     if not parser_bin:
         return None, False
 
     try:
-        result = subprocess.run(
-            [str(parser_bin), '--format', 'json', input_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_tool(parser_bin, [input_file], oneshot_args=['--format', 'json'])
         if result.returncode != 0:
             return result.stderr or "Native parser failed", False
 
@@ -194,25 +190,100 @@ def parse_native_json(input_file: str):
         return str(e), False
 
 
+def parse_native_binary(input_file: str):
+    """Parse using native parser with binary AST output, returns (ast, success).
+
+    Much cheaper than the JSON format on both sides (see slop.binast).
+    Returns (None, False) if the native parser is missing or predates
+    --format bin, so callers can fall back to parse_native_json.
+    """
+    from slop.binast import decode_binary_ast, BinaryAstError
+    from slop.toolserver import run_tool
+
+    parser_bin = find_native_component('parser')
+    if not parser_bin:
+        return None, False
+
+    try:
+        result = run_tool(parser_bin, ['--format', 'bin', input_file], text=False)
+        if result.returncode != 0:
+            if result.stdout.startswith(b'Unknown format'):
+                return None, False
+            message = result.stdout.decode(errors='replace').strip()
+            return message or "Native parser failed", False
+        return decode_binary_ast(result.stdout), True
+    except BinaryAstError as e:
+        return f"Failed to decode binary AST: {e}", False
+    except Exception as e:
+        return str(e), False
+
+
+def parse_native_ast(input_file: str):
+    """Parse with the native parser, preferring the binary AST format.
+
+    Returns (ast, success) like parse_native_json.
+    """
+    ast, success = parse_native_binary(input_file)
+    if success or ast is not None:
+        return ast, success
+    return parse_native_json(input_file)
+
+
+def parse_native_batch(input_files):
+    """Parse many files in one native parser process.
+
+    A file that fails to parse does not stop the others.
+
+    Args:
+        input_files: Paths to .slop files
+
+    Returns:
+        Dict mapping each path (as given) to (ast, success) like
+        parse_native_json, or None if the native parser is missing or
+        predates --batch, so callers can parse file by file instead.
+        ASTs are normalized as parse_file's are, so they can stand in
+        for them.
+    """
+    from slop.binast import decode_binary_batch, BinaryAstError, BINAST_BATCH_MAGIC
+    from slop.parser import normalize_forms
+    from slop.toolserver import run_tool
+
+    parser_bin = find_native_component('parser')
+    if not parser_bin:
+        return None
+    input_files = [str(path) for path in input_files]
+    if not input_files:
+        return {}
+
+    try:
+        result = run_tool(parser_bin, ['--format', 'bin', '--batch'] + input_files, text=False)
+    except OSError:
+        return None
+    if not result.stdout.startswith(BINAST_BATCH_MAGIC):
+        return None
+    try:
+        batch = decode_binary_batch(result.stdout)
+    except BinaryAstError as e:
+        return {path: (f"Failed to decode binary AST: {e}", False) for path in input_files}
+    return {path: (normalize_forms(ast), True) if success else (ast, success)
+            for path, (ast, success) in batch.items()}
+
+
 def transpile_native(input_file: str):
     """Transpile using native transpiler, returns (c_code, success).
 
     Returns tuple of (output, success). If native transpiler isn't available,
     returns (None, False).
     """
-    import subprocess
     import json
+    from slop.toolserver import run_tool
 
     transpiler_bin = find_native_component('transpiler')
     if not transpiler_bin:
         return None, False
 
     try:
-        result = subprocess.run(
-            [str(transpiler_bin), input_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_tool(transpiler_bin, [input_file])
         if result.returncode == 0:
             # Parse JSON output and combine into single C file
             data = json.loads(result.stdout)
@@ -246,19 +317,15 @@ def transpile_native_split(input_file: str):
       module_name -> (header, impl)
     If native transpiler isn't available, returns ({}, False).
     """
-    import subprocess
     import json
+    from slop.toolserver import run_tool
 
     transpiler_bin = find_native_component('transpiler')
     if not transpiler_bin:
         return {}, False
 
     try:
-        result = subprocess.run(
-            [str(transpiler_bin), input_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_tool(transpiler_bin, [input_file])
         if result.returncode == 0:
             data = json.loads(result.stdout)
             results = {}
@@ -285,8 +352,9 @@ def parse_with_fallback(input_file: str, prefer_native: bool = False, verbose: b
     Returns:
         Parsed AST (list of SExpr)
     """
+    from slop.parser import parse_file
     if prefer_native:
-        ast, success = parse_native_json(input_file)
+        ast, success = parse_native_ast(input_file)
         if success:
             if verbose:
                 print("Using native parser", file=sys.stderr)
@@ -303,6 +371,8 @@ def parse_with_fallback(input_file: str, prefer_native: bool = False, verbose: b
 
 def cmd_parse(args):
     """Parse and display SLOP file"""
+    from slop.parser import find_holes, parse_file, pretty_print
+    from slop.hole_filler import classify_tier, extract_hole
     use_native = not getattr(args, 'python', False)
 
     try:
@@ -361,14 +431,48 @@ def cmd_parse(args):
 def cmd_transpile(args):
     """Transpile SLOP to C (single or multi-module)"""
     import os
-    from slop.transpiler import transpile_multi_split
+    from slop.parser import parse_iter
+    from slop.resolver import ModuleResolver, ResolverError
+    from slop.transpiler import transpile_multi_split, transpile, transpile_multi
 
     try:
         input_path = Path(args.input)
         use_native = not getattr(args, 'python', False)
+        # An output ending in / gets separate .h/.c files per module
+        split_output = bool(args.output) and args.output.endswith('/')
 
         # Try native transpiler by default
-        if use_native:
+        if use_native and split_output:
+            transpiler_bin = find_native_component('transpiler')
+            if transpiler_bin:
+                # As in cmd_build: the transpiler writes the files itself.
+                # It parses the modules too, so only their headers are read here.
+                resolver = ModuleResolver([Path(p) for p in args.include])
+                graph = resolver.build_dependency_graph(input_path, headers_only=True)
+                errors = resolver.validate_imports(graph)
+                if errors:
+                    for e in errors:
+                        print(f"Import error: {e}", file=sys.stderr)
+                    return 1
+                order = resolver.topological_sort(graph)
+                os.makedirs(args.output, exist_ok=True)
+                try:
+                    written = _transpile_native_to_dir(
+                        transpiler_bin, [str(graph.modules[name].path) for name in order],
+                        args.output)
+                except RuntimeError as e:
+                    print(f"Native transpiler failed:\n{e}", file=sys.stderr)
+                    return 1
+                if written is not None:
+                    for files in written.values():
+                        print(f"Wrote {os.path.join(args.output, files['header'])}")
+                        print(f"Wrote {os.path.join(args.output, files['impl'])}")
+                    return 0
+                print("Native transpiler predates --out-dir, falling back to Python",
+                      file=sys.stderr)
+            else:
+                print("Native transpiler not found, falling back to Python", file=sys.stderr)
+        elif use_native:
             c_code, success = transpile_native(str(input_path))
             if success:
                 if args.output:
@@ -386,12 +490,11 @@ def cmd_transpile(args):
                     print("Native transpiler not found, falling back to Python", file=sys.stderr)
 
         # Python transpiler path
-        # Parse entry file to check for imports
+        # Only the entry file's header is needed to check for imports
         with open(input_path) as f:
             source = f.read()
-        ast = parse(source)
 
-        if _has_imports(ast):
+        if _has_imports(parse_iter(source, header_only=True)):
             # Multi-module path
             search_paths = [Path(p) for p in args.include]
             resolver = ModuleResolver(search_paths)
@@ -406,7 +509,7 @@ def cmd_transpile(args):
             order = resolver.topological_sort(graph)
 
             # Check if output is a directory (ends with /)
-            if args.output and args.output.endswith('/'):
+            if split_output:
                 # Multi-file output: separate .h/.c per module
                 os.makedirs(args.output, exist_ok=True)
                 results = transpile_multi_split(graph.modules, order)
@@ -447,7 +550,7 @@ def cmd_transpile(args):
 
 def _extract_fn_spec(form: SList) -> dict:
     """Extract function name, params, and return type from fn form."""
-    from slop.parser import Symbol
+    from slop.parser import Symbol, SList, is_form
     if len(form) < 3:
         return None
     name = form[1].name if isinstance(form[1], Symbol) else str(form[1])
@@ -470,7 +573,7 @@ def _extract_ffi_functions(ast) -> list:
 
     Handles both top-level (ffi ...) and (module ... (ffi ...)) forms.
     """
-    from slop.parser import Symbol
+    from slop.parser import Symbol, SList, is_form
     ffi_functions = []
 
     for form in ast:
@@ -498,7 +601,7 @@ def _extract_const_names(ast) -> list:
     Handles both top-level (const ...) and (module ... (const ...)) forms.
     Format: (const NAME Type value)
     """
-    from slop.parser import Symbol
+    from slop.parser import Symbol, is_form
     const_names = []
 
     for form in ast:
@@ -520,7 +623,7 @@ def _extract_const_specs(ast) -> list:
     Format: (const NAME Type value)
     Returns list of dicts with 'name' and 'type_expr' (as string)
     """
-    from slop.parser import Symbol
+    from slop.parser import Symbol, is_form, pretty_print
     const_specs = []
 
     def extract_const(form):
@@ -547,7 +650,7 @@ def _extract_ffi_specs(ast) -> list:
 
     FFI form: (ffi "header.h" (func-name ((param Type)...) ReturnType) ...)
     """
-    from slop.parser import Symbol, pretty_print
+    from slop.parser import Symbol, pretty_print, SList, is_form
     ffi_specs = []
 
     def extract_from_ffi_form(ffi_form):
@@ -587,7 +690,7 @@ def _extract_imported_functions(ast) -> list:
       - (import mod func1 func2 Type1 Type2)  -- direct list
       - (import mod (func1 func2 Type1 Type2))  -- grouped in SList
     """
-    from slop.parser import Symbol
+    from slop.parser import Symbol, SList, is_form
     imported_names = []
 
     def extract_from_import(import_form):
@@ -617,7 +720,7 @@ def _extract_imported_functions(ast) -> list:
 
 def _parse_import_form(import_form) -> tuple:
     """Parse import form, return (module_name, [imported_names])."""
-    from slop.parser import Symbol
+    from slop.parser import Symbol, SList
 
     if len(import_form) < 2:
         return (None, [])
@@ -646,6 +749,7 @@ def _extract_imported_specs(ast, search_paths=None, from_path=None) -> list:
 
     Returns list of dicts: {'name': str, 'params': str, 'return_type': str}
     """
+    from slop.parser import is_form, parse_file
     from slop.resolver import ModuleResolver
     from slop.providers import load_project_config
     from slop.type_checker import _find_project_config
@@ -719,7 +823,7 @@ def _extract_imported_types(ast, search_paths=None, from_path=None) -> list:
     where type_def is the pretty-printed (type Name ...) form.
     """
     from slop.resolver import ModuleResolver
-    from slop.parser import Symbol
+    from slop.parser import Symbol, is_form, parse_file, pretty_print
     from slop.providers import load_project_config
     from slop.type_checker import _find_project_config
 
@@ -797,7 +901,7 @@ def extract_file_context(filepath: str, fn_name: str = None) -> dict:
         Context dictionary with type_defs, fn_specs, ffi_specs, const_specs,
         imported_specs, imported_types, and params (if fn_name provided).
     """
-    from slop.parser import Symbol
+    from slop.parser import Symbol, is_form, parse_file, pretty_print
 
     ast = parse_file(filepath)
 
@@ -878,7 +982,7 @@ def extract_documentation(ast) -> dict:
 
     Returns dict with module info, types, functions, and constants.
     """
-    from slop.parser import Symbol, String
+    from slop.parser import Symbol, String, SList, is_form, pretty_print
 
     doc = {
         'module': None,
@@ -1179,6 +1283,7 @@ def render_markdown(doc: dict) -> str:
 
 def cmd_doc(args):
     """Generate documentation from SLOP source."""
+    from slop.parser import parse_file
     import json
 
     try:
@@ -1205,6 +1310,15 @@ def cmd_doc(args):
 def cmd_fill(args):
     """Fill holes with LLM"""
     import logging
+    from slop import timings
+    from slop.parser import find_holes, is_form, parse_file, pretty_print
+    from slop.hole_filler import HoleFiller, classify_tier, extract_hole, replace_holes_in_ast
+    from slop.formatter import format_source
+    from slop.providers import (
+        MockProvider, create_default_configs, create_from_config, load_config, load_project_config
+    )
+    from slop.type_checker import check_file
+
     if args.verbose >= 2:
         logging.basicConfig(
             level=logging.DEBUG,
@@ -1235,12 +1349,14 @@ def cmd_fill(args):
             print("Error: No input file specified and no [project].entry in slop.toml", file=sys.stderr)
             return 1
 
+        timings.step('parse')
         ast = parse_file(input_file)
 
         # Pre-check scaffold for type errors before filling
         if not quiet:
             print("  Pre-checking scaffold...")
 
+        timings.step('check')
         diagnostics = check_file(input_file)
         type_errors = [d for d in diagnostics if d.severity == 'error']
         type_warnings = [d for d in diagnostics if d.severity == 'warning']
@@ -1258,6 +1374,7 @@ def cmd_fill(args):
             return 1
 
         # Check for @requires blocks
+        timings.step('collect context')
         requires_blocks = extract_requires_blocks(ast)
         requires_fns = []  # Function signatures from @requires for context
 
@@ -1448,6 +1565,7 @@ def cmd_fill(args):
         filler = HoleFiller(configs, provider)
         if not quiet:
             print("Filling holes...")
+        timings.step('fill', holes=len(all_holes))
 
         # Fill holes and track replacements
         replacements = {}  # id(hole) -> filled_expr
@@ -1613,6 +1731,7 @@ def cmd_fill(args):
                         print(f"  x {info.prompt[:50]}... ({tier.name}){error_info}")
 
         # Replace holes in AST
+        timings.step('write')
         logger.debug(f"Replacements: {len(replacements)} entries, ids={list(replacements.keys())}")
         if replacements:
             filled_ast = replace_holes_in_ast(ast, replacements)
@@ -1654,6 +1773,7 @@ def cmd_fill(args):
 
 def _extract_context(form: SList) -> dict:
     """Extract context from a function form for hole filling"""
+    from slop.parser import SList, is_form
     context = {}
 
     if is_form(form, 'fn') or is_form(form, 'impl'):
@@ -1673,81 +1793,220 @@ def _extract_context(form: SList) -> dict:
     return context
 
 
+def _expand_check_paths(patterns: list) -> list:
+    """Expand the paths given to `slop check` into .slop files.
+
+    Directories stand for every .slop file below them and glob patterns
+    (including **) are matched; other paths are kept as given. Each file
+    is listed once, in the order first named.
+    """
+    import glob
+
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise ValueError(f"No files match {pattern}")
+        elif Path(pattern).is_dir():
+            matches = sorted(str(p) for p in Path(pattern).rglob('*.slop'))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if Path(path).is_dir():
+                continue
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _lint_module(ast) -> tuple:
+    """Unfilled holes (errors) and functions missing @intent or @spec
+    (warnings), as lists of (form, message)."""
+    from slop.parser import find_holes, is_form
+    from slop.hole_filler import extract_hole
+
+    errors = []
+    warnings = []
+    for form in ast:
+        holes = find_holes(form)
+        for h in holes:
+            info = extract_hole(h)
+            errors.append((h, f"Unfilled hole: {info.prompt}"))
+
+        if is_form(form, 'fn') or is_form(form, 'impl'):
+            has_intent = any(is_form(item, '@intent') for item in form.items)
+            has_spec = any(is_form(item, '@spec') for item in form.items)
+
+            fn_name = form[1].name if len(form) > 1 else "unknown"
+
+            if not has_intent:
+                warnings.append((form, f"Function '{fn_name}' missing @intent"))
+            if not has_spec:
+                warnings.append((form, f"Function '{fn_name}' missing @spec"))
+    return errors, warnings
+
+
+def _check_json(results: dict) -> dict:
+    """The --json report for `slop check`: results maps each path to a list
+    of (level, line, col, message)."""
+    report = {'files': {}, 'errors': 0, 'warnings': 0}
+    for path, diagnostics in results.items():
+        errors = sum(1 for d in diagnostics if d[0] == 'error')
+        warnings = sum(1 for d in diagnostics if d[0] == 'warning')
+        report['files'][path] = {
+            'errors': errors,
+            'warnings': warnings,
+            'diagnostics': [dict(zip(('level', 'line', 'col', 'message'), d))
+                            for d in diagnostics],
+        }
+        report['errors'] += errors
+        report['warnings'] += warnings
+    return report
+
+
+def _check_native(checker_bin, paths: list, as_json: bool, jobs: int = None) -> int:
+    """Run the native checker over each file for `slop check`.
+
+    Files are checked concurrently by up to `jobs` checker servers
+    (default: CPU count); output is printed in the order of paths.
+    """
+    import json
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+    from slop.toolserver import run_tool
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    # Each thread borrows a worker number, and with it its own server
+    workers = queue.SimpleQueue()
+    for worker in range(jobs):
+        workers.put(worker)
+
+    def check(path):
+        worker = workers.get()
+        try:
+            return run_tool(checker_bin, [path], worker=worker)
+        finally:
+            workers.put(worker)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        checked = list(executor.map(check, paths))
+
+    results = {}
+    failed = False
+    for path, result in zip(paths, checked):
+        failed = failed or result.returncode != 0
+        if not as_json:
+            # Print native checker output
+            if result.stdout:
+                print(result.stdout, end='')
+            if result.stderr:
+                print(result.stderr, end='', file=sys.stderr)
+            continue
+        try:
+            modules = json.loads(result.stdout)
+            results[path] = [(d.get('level', 'error'), d.get('line', 0), d.get('col', 0),
+                              d.get('message', ''))
+                             for mod in modules.values() for d in mod.get('diagnostics', [])]
+        except (ValueError, AttributeError):
+            message = (result.stderr or result.stdout).strip() or "checker failed"
+            results[path] = [('error', 0, 0, message)]
+    if as_json:
+        print(json.dumps(_check_json(results), indent=2))
+    return 1 if failed else 0
+
+
 def cmd_check(args):
-    """Validate SLOP file with type checking"""
+    """Validate SLOP files with type checking"""
+    import json
+    from slop import timings
+    from slop.resolver import ModuleResolver
+    from slop.type_checker import check_files
+
     try:
+        paths = _expand_check_paths(args.input)
+        if not paths:
+            print("Error: No .slop files to check", file=sys.stderr)
+            return 1
+        single = len(paths) == 1 and not args.json
         use_native = not getattr(args, 'python', False)
 
         # Try native checker by default
         if use_native:
             checker_bin = find_native_component('checker')
             if checker_bin:
-                import subprocess
-                result = subprocess.run(
-                    [str(checker_bin), args.input],
-                    capture_output=True,
-                    text=True,
-                )
-                # Print native checker output
-                if result.stdout:
-                    print(result.stdout, end='')
-                if result.stderr:
-                    print(result.stderr, end='', file=sys.stderr)
-                return result.returncode
+                return _check_native(checker_bin, paths, args.json, args.jobs)
             else:
                 print("Native checker not found, falling back to Python", file=sys.stderr)
 
-        ast = parse_file(args.input)
-
-        errors = []
-        warnings = []
-
-        # Check for unfilled holes and missing annotations
-        for form in ast:
-            holes = find_holes(form)
-            for h in holes:
-                info = extract_hole(h)
-                errors.append(f"Unfilled hole: {info.prompt}")
-
-            if is_form(form, 'fn') or is_form(form, 'impl'):
-                has_intent = any(is_form(item, '@intent') for item in form.items)
-                has_spec = any(is_form(item, '@spec') for item in form.items)
-
-                fn_name = form[1].name if len(form) > 1 else "unknown"
-
-                if not has_intent:
-                    warnings.append(f"Function '{fn_name}' missing @intent")
-                if not has_spec:
-                    warnings.append(f"Function '{fn_name}' missing @spec")
+        # Parse every file once; the type checker reuses these modules
+        timings.step('parse')
+        parser_bin = find_native_component('parser') if use_native else None
+        resolver = ModuleResolver(parse_batch=parse_native_batch if parser_bin else None)
+        resolver.prefetch([Path(path) for path in paths])
+        lint = {}
+        for path in paths:
+            try:
+                ast = resolver.load_module(Path(path).resolve()).ast
+            except Exception:
+                if single:
+                    raise
+                continue  # check_files reports the parse error
+            lint[path] = _lint_module(ast)
 
         # Run type checker
-        print("  Type checking...")
-        diagnostics = check_file(args.input)
-
-        type_errors = [d for d in diagnostics if d.severity == 'error']
-        type_warnings = [d for d in diagnostics if d.severity == 'warning']
+        if single:
+            print("  Type checking...")
+        timings.step('check')
+        diagnostics = check_files(paths, jobs=args.jobs, resolver=resolver)
 
-        # Print all diagnostics
-        for w in warnings:
-            print(f"warning: {w}")
-        for w in type_warnings:
-            print(str(w))
-        for e in errors:
-            print(f"error: {e}")
-        for e in type_errors:
-            print(str(e))
+        if args.json:
+            results = {}
+            for path in paths:
+                errors, warnings = lint.get(path, ([], []))
+                results[path] = [('warning', form.line, form.col, message)
+                                 for form, message in warnings]
+                results[path] += [('error', form.line, form.col, message)
+                                  for form, message in errors]
+                results[path] += [(d.severity,
+                                   d.location.line if d.location else 0,
+                                   d.location.column if d.location else 0,
+                                   d.message)
+                                  for d in diagnostics[path]]
+            report = _check_json(results)
+            print(json.dumps(report, indent=2))
+            return 1 if report['errors'] else 0
+
+        total_errors = 0
+        total_warnings = 0
+        for path in paths:
+            errors, warnings = lint.get(path, ([], []))
+            type_errors = [d for d in diagnostics[path] if d.severity == 'error']
+            type_warnings = [d for d in diagnostics[path] if d.severity == 'warning']
+            prefix = '' if single else f"{path}: "
+
+            # Print all diagnostics
+            for _, w in warnings:
+                print(f"{prefix}warning: {w}")
+            for w in type_warnings:
+                print(str(w))
+            for _, e in errors:
+                print(f"{prefix}error: {e}")
+            for e in type_errors:
+                print(str(e))
 
-        total_errors = len(errors) + len(type_errors)
-        total_warnings = len(warnings) + len(type_warnings)
+            total_errors += len(errors) + len(type_errors)
+            total_warnings += len(warnings) + len(type_warnings)
 
+        checked = '' if single else f" in {len(paths)} files"
         if total_errors > 0:
-            print(f"\n{total_errors} error(s), {total_warnings} warning(s)")
+            print(f"\n{total_errors} error(s), {total_warnings} warning(s){checked}")
             return 1
 
         if total_warnings > 0:
-            print(f"✓ OK with {total_warnings} warning(s)")
+            print(f"✓ OK with {total_warnings} warning(s){checked}")
         else:
-            print("✓ All checks passed")
+            print(f"✓ All checks passed{checked}")
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1811,8 +2070,166 @@ def _get_runtime_path() -> Path:
         return Path(__file__).parent / "runtime"
 
 
+def _toolchain_key(native_checker_bin=None, native_transpiler_bin=None) -> str:
+    """Identify the checker/transpiler in use so cached results from a
+    different toolchain are never reused."""
+    from slop.toolchain import find_component
+
+    parts = []
+    for name, native_bin in (('checker', native_checker_bin), ('transpiler', native_transpiler_bin)):
+        if native_bin:
+            component = find_component(name)
+            if component is not None and component.path == Path(native_bin):
+                # Content hash: relinking an identical binary keeps the cache
+                parts.append(f"{native_bin}:{component.sha256}")
+            else:
+                parts.append(f"{native_bin}:{os.stat(native_bin).st_mtime_ns}")
+    if not native_checker_bin or not native_transpiler_bin:
+        here = Path(__file__).parent
+        for name in ('type_checker.py', 'transpiler.py', 'parser.py'):
+            parts.append(f"{name}:{(here / name).stat().st_mtime_ns}")
+    return '|'.join(parts)
+
+
+def _transitive_deps(graph, name: str) -> list:
+    """All modules reachable through name's imports, in discovery order."""
+    seen = []
+    stack = list(graph.dependencies.get(name, ()))
+    while stack:
+        dep = stack.pop()
+        if dep in seen or dep == name:
+            continue
+        seen.append(dep)
+        stack.extend(graph.dependencies.get(dep, ()))
+    return seen
+
+
+def _generated_hash(build_dir: Path, c_name: str):
+    """Hash of a module's generated header and impl, or None if either is missing."""
+    from slop.cache import hash_bytes
+    try:
+        return hash_bytes((build_dir / f"slop_{c_name}.h").read_bytes(),
+                          (build_dir / f"slop_{c_name}.c").read_bytes())
+    except OSError:
+        return None
+
+
+def _stale_modules(graph, order, build_cache, toolchain):
+    """Work out which modules must be re-checked.
+
+    A module is stale when its own source changed or when the interface
+    fingerprint of something it imports changed. Fingerprints include
+    those of the module's own imports, so interface changes propagate
+    transitively while body-only edits stop at the edited module.
+
+    Returns (stale, skipped, state): stale and skipped map module names to
+    a human-readable reason, and state holds the new source hash,
+    fingerprint and import fingerprints for each module's manifest record.
+    """
+    from slop.cache import hash_bytes, hash_file, interface_fingerprint
+
+    toolchain_changed = build_cache.manifest.get('toolchain') != toolchain
+    stale = {}
+    skipped = {}
+    state = {}
+    for name in order:  # dependencies first
+        info = graph.modules[name]
+        deps = {dep: state[dep]['interface'] for dep in graph.dependencies[name] if dep in state}
+        own = interface_fingerprint(info.ast, info.exports)
+        state[name] = {
+            'source': hash_file(info.path),
+            'interface': hash_bytes(own.encode(), *(deps[dep].encode() for dep in sorted(deps))),
+            'deps': deps,
+        }
+
+        record = build_cache.modules.get(name)
+        c_name = name.replace('-', '_')
+        if record is None:
+            stale[name] = "not built before"
+        elif toolchain_changed:
+            stale[name] = "toolchain changed"
+        elif record['source'] != state[name]['source']:
+            stale[name] = "source changed"
+        elif set(record['deps']) != set(deps):
+            stale[name] = "imports changed"
+        elif record['deps'] != deps:
+            changed = [dep for dep in deps if record['deps'][dep] != deps[dep]]
+            stale[name] = f"interface of {', '.join(changed)} changed"
+        elif (generated := _generated_hash(build_cache.dir, c_name)) is None:
+            stale[name] = "generated C missing"
+        elif record.get('generated') != generated:
+            # e.g. written by a build that failed before saving its manifest
+            stale[name] = "generated C changed"
+        else:
+            edited = [dep for dep in _transitive_deps(graph, name) if dep in stale]
+            if edited:
+                skipped[name] = f"{', '.join(edited)} changed but not its interface"
+            else:
+                skipped[name] = "unchanged"
+    return stale, skipped, state
+
+
+def _compile_parallel(commands: dict, jobs: int = None) -> dict:
+    """Run independent compiler commands through a bounded worker pool.
+
+    Args:
+        commands: Dict mapping module name to its cc command
+        jobs: Maximum concurrent compiler processes (default: CPU count)
+
+    Returns:
+        Dict mapping module name to compiler output, for failed modules only
+    """
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+    from slop import timings
+
+    if not commands:
+        return {}
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(commands)))
+
+    def run(name):
+        with timings.phase('cc', module=name):
+            return subprocess.run(commands[name], capture_output=True, text=True)
+
+    # Threads are enough: the work happens in the cc child processes
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = dict(zip(commands, executor.map(run, commands)))
+    return {name: (result.stderr or result.stdout)
+            for name, result in results.items() if result.returncode != 0}
+
+
+def _transpile_native_to_dir(native_transpiler_bin, source_files, out_dir):
+    """Have the native transpiler write slop_<mod>.h/.c straight into out_dir.
+
+    Only a small manifest comes back over stdout, so the generated C is
+    never decoded from JSON or rewritten by the CLI.
+
+    Returns:
+        Dict mapping module name to its {'header', 'impl'} file names, or
+        None if the transpiler predates --out-dir (caller falls back to JSON)
+
+    Raises:
+        RuntimeError: with the transpiler's errors if it failed, or if
+            its manifest cannot be read
+    """
+    import json
+    from slop.toolserver import run_tool
+
+    result = run_tool(native_transpiler_bin, ['--out-dir', str(out_dir)] + source_files)
+    if not result.stdout.startswith('{"out_dir":'):
+        # Older transpilers take --out-dir for a file name
+        return None
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr or result.stdout)
+    try:
+        return json.loads(result.stdout)['modules']
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise RuntimeError(f"Malformed manifest from {native_transpiler_bin}: {e}") from e
+
+
 def _has_imports(ast) -> bool:
     """Check if AST contains import declarations."""
+    from slop.parser import is_form
     for form in ast:
         if is_form(form, 'module'):
             for item in form.items[2:]:
@@ -1825,6 +2242,7 @@ def _has_imports(ast) -> bool:
 
 def _has_exports(ast) -> bool:
     """Check if AST contains export declarations (module with exports)."""
+    from slop.parser import is_form
     for form in ast:
         if is_form(form, 'module') and len(form.items) > 2:
             # Check for (export ...) form in module declaration
@@ -1836,6 +2254,12 @@ def _has_exports(ast) -> bool:
 
 def cmd_build(args):
     """Full build pipeline"""
+    from slop import timings
+    from slop.parser import find_holes, parse_file, parse_header
+    from slop.providers import load_project_config
+    from slop.type_checker import check_modules
+    from slop.resolver import ModuleResolver, ResolverError
+
     try:
         # Load project config (auto-detect slop.toml or use explicit -c)
         config_path = getattr(args, 'config', None)
@@ -1877,9 +2301,11 @@ def cmd_build(args):
 
         # Use native by default unless --python flag is set
         use_native = not getattr(args, 'python', False)
+        parser_bin = None
         native_transpiler_bin = None
         native_checker_bin = None
         if use_native:
+            timings.step('find toolchain')
             # Report which native components are available
             parser_bin = find_native_component('parser')
             if parser_bin:
@@ -1896,6 +2322,7 @@ def cmd_build(args):
                 print(f"  Using native transpiler: {native_transpiler_bin}")
             else:
                 print("  Native transpiler not found, falling back to Python")
+            _warn_stale_components()
 
         # Create output directory if needed
         output_dir = Path(output).parent
@@ -1904,20 +2331,26 @@ def cmd_build(args):
 
         # Parse
         print("  Parsing...")
-        ast = parse_file(str(input_path))
-
-        # Check if this is a multi-module build
+        timings.step('parse')
+        # The header says whether this is a multi-module build; the resolver
+        # or the single-file path below parses the whole file
         search_paths = [Path(p) for p in include_paths]
-        is_multi_module = _has_imports(ast)
+        is_multi_module = _has_imports(parse_header(str(input_path)))
 
         if is_multi_module:
             # Multi-module build
             print("  Resolving modules...")
-            resolver = ModuleResolver(search_paths)
+            timings.step('resolve')
+            # The native parser reads each frontier of imports in one batch
+            resolver = ModuleResolver(search_paths,
+                                      parse_batch=parse_native_batch if parser_bin else None)
             try:
-                graph = resolver.build_dependency_graph(input_path)
+                graph = resolver.build_dependency_graph(input_path, jobs=args.module_jobs)
                 order = resolver.topological_sort(graph)
                 print(f"    Build order: {', '.join(order)}")
+                if args.verbose:
+                    print(f"    Resolved {len(graph.modules)} modules with "
+                          f"{resolver.fs_probes} filesystem probes")
             except ResolverError as e:
                 print(f"  Module resolution failed: {e}")
                 return 1
@@ -1939,34 +2372,54 @@ def cmd_build(args):
             if total_holes > 0:
                 print(f"  Warning: {total_holes} unfilled holes")
 
+            # Incremental build state for this target (see slop.cache.BuildCache)
+            from slop.cache import BuildCache, hash_bytes, hash_file
+            build_cache = BuildCache(f"{input_path.resolve()}|{Path(output).resolve()}|"
+                                     f"{library_mode}|{debug}")
+            if getattr(args, 'rebuild', False):
+                build_cache.clean()
+            toolchain = _toolchain_key(native_checker_bin, native_transpiler_bin)
+            stale, skipped, module_state = _stale_modules(graph, order, build_cache, toolchain)
+            records = {}
+
             # Type check all modules
             print("  Type checking...")
+            timings.step('check')
+            if len(stale) < len(order):
+                print(f"    {len(order) - len(stale)} unchanged module(s) skipped")
+            if args.verbose:
+                for name in order:
+                    if name in stale:
+                        print(f"    [{name}] rebuilding: {stale[name]}")
+                    else:
+                        print(f"    [{name}] skipped: {skipped[name]}")
             total_errors = 0
             total_warnings = 0
+            diagnostics_by_module = {}  # mod_name -> [(severity, text)]
 
-            if native_checker_bin:
+            if not stale:
+                pass
+            elif native_checker_bin:
                 # Use native type checker - pass files in dependency order
-                import subprocess
                 import json
+                from slop.toolserver import run_tool
                 source_files = [str(graph.modules[name].path) for name in order]
-                cmd = [native_checker_bin] + source_files
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = run_tool(native_checker_bin, source_files)
                 # Note: native checker returns non-zero on errors, but we still
                 # want to parse the JSON to show the diagnostics
                 try:
                     all_diagnostics_json = json.loads(result.stdout)
                     for mod_name, data in all_diagnostics_json.items():
+                        diags = diagnostics_by_module.setdefault(mod_name, [])
                         for diag in data.get('diagnostics', []):
                             level = diag.get('level', 'error')
                             msg = diag.get('message', '')
                             line = diag.get('line', 0)
                             col = diag.get('col', 0)
                             if level == 'warning':
-                                print(f"    [{mod_name}] warning at {line}:{col}: {msg}")
-                                total_warnings += 1
+                                diags.append(('warning', f"warning at {line}:{col}: {msg}"))
                             else:
-                                print(f"    [{mod_name}] error at {line}:{col}: {msg}")
-                                total_errors += 1
+                                diags.append(('error', f"error at {line}:{col}: {msg}"))
                 except json.JSONDecodeError as e:
                     # If JSON parsing fails, show stderr
                     if result.stderr:
@@ -1975,17 +2428,30 @@ def cmd_build(args):
                         print(f"  Type check failed with exit code {result.returncode}")
                         return 1
             else:
-                # Fall back to Python type checker
-                all_diagnostics = check_modules(graph.modules, order)
+                # Fall back to Python type checker; unchanged modules only
+                # contribute their exported signatures
+                unchanged = {name for name in order if name not in stale}
+                all_diagnostics = check_modules(graph.modules, order, interface_only=unchanged,
+                                                jobs=args.module_jobs or 1)
                 for mod_name, diagnostics in all_diagnostics.items():
-                    type_errors = [d for d in diagnostics if d.severity == 'error']
-                    type_warnings = [d for d in diagnostics if d.severity == 'warning']
-                    for w in type_warnings:
-                        print(f"    [{mod_name}] {w}")
-                    for e in type_errors:
-                        print(f"    [{mod_name}] {e}")
-                    total_errors += len(type_errors)
-                    total_warnings += len(type_warnings)
+                    if mod_name in unchanged:
+                        continue
+                    diagnostics_by_module[mod_name] = (
+                        [('warning', str(d)) for d in diagnostics if d.severity == 'warning'] +
+                        [('error', str(d)) for d in diagnostics if d.severity == 'error'])
+
+            for mod_name in order:
+                if mod_name in stale:
+                    diags = diagnostics_by_module.get(mod_name, [])
+                else:
+                    diags = [tuple(d) for d in build_cache.modules[mod_name]['diagnostics']]
+                records[mod_name] = dict(module_state[mod_name], diagnostics=diags)
+                for severity, text in diags:
+                    print(f"    [{mod_name}] {text}")
+                    if severity == 'warning':
+                        total_warnings += 1
+                    else:
+                        total_errors += 1
 
             if total_errors > 0:
                 print(f"  Type check failed: {total_errors} error(s)")
@@ -1997,114 +2463,156 @@ def cmd_build(args):
                 print("  Type check passed")
 
             # Transpile all modules to separate files
-            print("  Transpiling to C...")
-            import tempfile
             import subprocess
             import json
 
+            timings.step('transpile')
             results = {}
-            if native_transpiler_bin:
-                # Use native transpiler - it outputs JSON with per-module header/impl
+            if not stale:
+                print("  Transpiling to C... (up to date)")
+            elif native_transpiler_bin:
+                print("  Transpiling to C...")
+                from slop.toolserver import run_tool
                 source_files = [str(graph.modules[name].path) for name in order]
-                cmd = [native_transpiler_bin] + source_files
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    print(f"Native transpiler failed:\n{result.stderr}")
-                    return 1
+                # Preferred: the transpiler writes the sources into the build
+                # directory itself; objects are keyed on content, so rewriting
+                # identical files does not trigger recompilation
+                build_cache.dir.mkdir(parents=True, exist_ok=True)
                 try:
-                    results = json.loads(result.stdout)
-                    # Convert from {"mod": {"header": ..., "impl": ...}} to {"mod": (header, impl)}
-                    results = {name: (data['header'], data['impl']) for name, data in results.items()}
-                except json.JSONDecodeError as e:
-                    print(f"Failed to parse native transpiler output: {e}")
+                    written = _transpile_native_to_dir(
+                        native_transpiler_bin, source_files, build_cache.dir)
+                except RuntimeError as e:
+                    print(f"Native transpiler failed:\n{e}", file=sys.stderr)
                     return 1
+                if written is None:
+                    # Older transpiler: outputs JSON with per-module header/impl
+                    result = run_tool(native_transpiler_bin, source_files)
+                    if result.returncode != 0:
+                        print(f"Native transpiler failed:\n{result.stderr or result.stdout}",
+                              file=sys.stderr)
+                        return 1
+                    try:
+                        results = json.loads(result.stdout)
+                        # Convert from {"mod": {"header": ..., "impl": ...}} to {"mod": (header, impl)}
+                        results = {name: (data['header'], data['impl']) for name, data in results.items()}
+                    except json.JSONDecodeError as e:
+                        print(f"Failed to parse native transpiler output: {e}")
+                        return 1
+                elif args.verbose:
+                    print(f"    Wrote {len(written)} module(s) to {build_cache.dir}")
             else:
+                print("  Transpiling to C...")
                 # Fall back to Python transpiler
                 from slop.transpiler import transpile_multi_split
-                results = transpile_multi_split(graph.modules, order)
-
-            # Write to temp directory and compile
+                # Only stale modules get new C. Unchanged modules were only
+                # checked for their interface, so their bodies lack inferred
+                # types; the transpiler reads just their interface, and the C
+                # generated when they were last rebuilt is kept (their
+                # dependencies' interfaces are unchanged, so it is current)
+                results = transpile_multi_split(graph.modules, order, only=set(stale))
+
+            # Write generated sources into the persistent build directory;
+            # unchanged files keep their contents so their objects are reused
+            timings.step('write C')
             runtime_path = _get_runtime_path()
+            build_dir = build_cache.dir
+            build_dir.mkdir(parents=True, exist_ok=True)
+            for mod_name, (header, impl) in results.items():
+                # Prefix with slop_ to avoid C stdlib conflicts (e.g., ctype.h)
+                c_mod_name = mod_name.replace('-', '_')
+                if native_transpiler_bin:
+                    # Native transpiler impl doesn't include headers, add them
+                    impl = f'#include "slop_runtime.h"\n#include "slop_{c_mod_name}.h"\n\n{impl}'
+                build_cache.write_if_changed(f"slop_{c_mod_name}.h", header)
+                build_cache.write_if_changed(f"slop_{c_mod_name}.c", impl)
+            for mod_name in order:
+                records[mod_name]['generated'] = _generated_hash(
+                    build_dir, mod_name.replace('-', '_'))
 
-            with tempfile.TemporaryDirectory() as tmpdir:
-                c_files = []
-                for mod_name, (header, impl) in results.items():
-                    # Prefix with slop_ to avoid C stdlib conflicts (e.g., ctype.h)
-                    c_mod_name = mod_name.replace('-', '_')
-                    header_path = os.path.join(tmpdir, f"slop_{c_mod_name}.h")
-                    impl_path = os.path.join(tmpdir, f"slop_{c_mod_name}.c")
-                    with open(header_path, 'w') as f:
-                        f.write(header)
-                    with open(impl_path, 'w') as f:
-                        # Native transpiler impl doesn't include headers, add them
-                        if native_transpiler_bin:
-                            f.write('#include "slop_runtime.h"\n')
-                            f.write(f'#include "slop_{c_mod_name}.h"\n\n')
-                        f.write(impl)
-                    c_files.append(impl_path)
+            print("  Compiling...")
+            timings.step('compile')
 
-                print("  Compiling...")
+            # Build link flags from config
+            link_flags = []
+            for lpath in link_paths:
+                link_flags.extend(["-L", lpath])
+            for lib in link_libraries:
+                link_flags.extend(["-l", lib])
 
-                # Build link flags from config
-                link_flags = []
-                for lpath in link_paths:
-                    link_flags.extend(["-L", lpath])
-                for lib in link_libraries:
-                    link_flags.extend(["-l", lib])
+            cflags = ["-O2"]
+            if debug:
+                cflags = ["-g", "-DSLOP_DEBUG"] + cflags
+            if library_mode == 'shared':
+                cflags.append("-fPIC")
+            runtime_hash = hash_file(Path(str(runtime_path)) / "slop_runtime.h")
+
+            # Compile each translation unit whose inputs changed
+            objects = {}
+            obj_files = []
+            pending = {}  # mod_name -> cc command
+            for mod_name in order:
+                c_mod_name = mod_name.replace('-', '_')
+                c_file = build_dir / f"slop_{c_mod_name}.c"
+                obj_file = build_dir / f"slop_{c_mod_name}.o"
+                headers = [build_dir / f"slop_{dep.replace('-', '_')}.h"
+                           for dep in [mod_name] + _transitive_deps(graph, mod_name)]
+                obj_key = hash_bytes(
+                    c_file.read_bytes(),
+                    *[h.read_bytes() for h in headers if h.exists()],
+                    runtime_hash.encode(), ' '.join(cflags).encode())
+                objects[mod_name] = obj_key
+                obj_files.append(str(obj_file))
+                if build_cache.manifest['objects'].get(mod_name) == obj_key and obj_file.exists():
+                    continue
+                pending[mod_name] = ["cc", "-c"] + cflags + ["-I", str(runtime_path), "-I", str(build_dir),
+                                                             "-o", str(obj_file), str(c_file)]
+            if len(pending) < len(order):
+                print(f"    {len(order) - len(pending)} object file(s) up to date")
+
+            failures = _compile_parallel(pending, args.jobs)
+            if failures:
+                for mod_name in order:
+                    if mod_name in failures:
+                        print(f"  [{mod_name}] compilation failed:\n{failures[mod_name]}")
+                print(f"  Compilation failed in {len(failures)} module(s)")
+                return 1
 
+            if library_mode == 'static':
+                artifact = f"{output}.a"
+                link_cmd = ["ar", "rcs", artifact] + obj_files
+            elif library_mode == 'shared':
+                ext = ".dylib" if sys.platform == "darwin" else ".so"
+                artifact = f"{output}{ext}"
+                link_cmd = ["cc", "-shared", "-o", artifact] + obj_files + link_flags
+            else:
+                artifact = output
+                link_cmd = ["cc"] + (["-g"] if debug else []) + ["-o", artifact] + obj_files + link_flags
+
+            timings.step('link')
+            link_key = hash_bytes(*[objects[name].encode() for name in order],
+                                  ' '.join(link_cmd).encode())
+            if build_cache.manifest['link'] == link_key and Path(artifact).exists():
+                print(f"✓ {artifact} is up to date")
+            else:
                 if library_mode == 'static':
-                    # Compile to object files, then create static library
-                    obj_files = []
-                    for c_file in c_files:
-                        obj_file = c_file.replace('.c', '.o')
-                        compile_cmd = ["cc", "-c", "-O2", "-I", str(runtime_path), "-I", tmpdir, "-o", obj_file, c_file]
-                        if debug:
-                            compile_cmd.insert(1, "-g")
-                            compile_cmd.insert(2, "-DSLOP_DEBUG")
-                        result = subprocess.run(compile_cmd, capture_output=True, text=True)
-                        if result.returncode != 0:
-                            print(f"Compilation failed:\n{result.stderr}")
-                            return 1
-                        obj_files.append(obj_file)
-
-                    lib_file = f"{output}.a"
-                    ar_cmd = ["ar", "rcs", lib_file] + obj_files
-                    result = subprocess.run(ar_cmd, capture_output=True, text=True)
-                    if result.returncode != 0:
-                        print(f"Archive failed:\n{result.stderr}")
-                        return 1
-                    print(f"✓ Built {lib_file}")
-
-                elif library_mode == 'shared':
-                    ext = ".dylib" if sys.platform == "darwin" else ".so"
-                    lib_file = f"{output}{ext}"
-                    compile_cmd = ["cc", "-shared", "-fPIC", "-O2", "-I", str(runtime_path), "-I", tmpdir,
-                                  "-o", lib_file] + c_files + link_flags
-                    if debug:
-                        compile_cmd.insert(1, "-g")
-                        compile_cmd.insert(2, "-DSLOP_DEBUG")
-                    result = subprocess.run(compile_cmd, capture_output=True, text=True)
-                    if result.returncode != 0:
-                        print(f"Compilation failed:\n{result.stderr}")
-                        return 1
-                    print(f"✓ Built {lib_file}")
-
-                else:
-                    # Default: build executable
-                    compile_cmd = ["cc", "-O2", "-I", str(runtime_path), "-I", tmpdir, "-o", output] + c_files + link_flags
-                    if debug:
-                        compile_cmd.insert(1, "-g")
-                        compile_cmd.insert(2, "-DSLOP_DEBUG")
-                    result = subprocess.run(compile_cmd, capture_output=True, text=True)
-                    if result.returncode != 0:
-                        print(f"Compilation failed:\n{result.stderr}")
-                        return 1
-                    print(f"✓ Built {output}")
+                    # ar only adds members, so start from an empty archive
+                    Path(artifact).unlink(missing_ok=True)
+                result = subprocess.run(link_cmd, capture_output=True, text=True)
+                if result.returncode != 0:
+                    label = "Archive" if library_mode == 'static' else "Linking"
+                    print(f"{label} failed:\n{result.stderr}")
+                    return 1
+                print(f"✓ Built {artifact}")
 
+            build_cache.manifest.update(toolchain=toolchain, modules=records, objects=objects,
+                                        link=link_key)
+            build_cache.save()
             return 0
 
         else:
             # Single-file build (backward compatible)
+            ast = parse_file(str(input_path))
+
             # Check for holes
             total_holes = sum(len(find_holes(form)) for form in ast)
             if total_holes > 0:
@@ -2112,14 +2620,11 @@ def cmd_build(args):
 
             # Type check
             print("  Type checking...")
+            timings.step('check')
             if native_checker_bin:
                 # Use native type checker
-                import subprocess
-                check_result = subprocess.run(
-                    [str(native_checker_bin), str(input_path)],
-                    capture_output=True,
-                    text=True,
-                )
+                from slop.toolserver import run_tool
+                check_result = run_tool(native_checker_bin, [str(input_path)])
                 # Print output (contains warnings/errors)
                 if check_result.stdout:
                     for line in check_result.stdout.strip().split('\n'):
@@ -2151,6 +2656,7 @@ def cmd_build(args):
 
             # Transpile using native transpiler if available, else Python
             print("  Transpiling to C...")
+            timings.step('transpile')
             transpiler = None
             native_module_headers = {}  # Module headers from native transpiler (for library builds)
             module_name = input_path.stem
@@ -2198,6 +2704,7 @@ def cmd_build(args):
 
         # Compile
         print("  Compiling...")
+        timings.step('compile')
         import subprocess
 
         runtime_path = _get_runtime_path()
@@ -2412,7 +2919,9 @@ def cmd_test(args):
     """Run tests from @example annotations"""
     import subprocess
     import tempfile
-    from slop.parser import Symbol, Number, String
+    from slop import timings
+    from slop.parser import Symbol, Number, String, is_form, parse_file, pretty_print
+    from slop.resolver import ModuleResolver, ResolverError
 
     try:
         input_path = Path(args.input)
@@ -2435,6 +2944,7 @@ def cmd_test(args):
                 if inc_path.exists() and str(inc_path) not in [str(Path(x).resolve()) for x in args.include]:
                     args.include.append(str(inc_path))
 
+        timings.step('parse')
         ast = parse_file(str(input_path))
 
         # Extract functions with @example annotations
@@ -2570,6 +3080,7 @@ def cmd_test(args):
 
         # Transpile the source
         print("  Transpiling...")
+        timings.step('transpile')
         use_native = not getattr(args, 'python', False)
         c_code = None
         used_native_transpiler = False  # Track if native transpiler was used (always prefixes)
@@ -2641,6 +3152,7 @@ def cmd_test(args):
         # Generate test harness
         # Prefixing needed for: native transpiler (always), multi-module, or modules with exports
         print("  Generating test harness...")
+        timings.step('harness')
         test_code = generate_test_harness(test_cases, c_code, enable_prefixing=(used_native_transpiler or is_multi_module or has_exports))
 
         # Write to temp file and compile
@@ -2653,6 +3165,7 @@ def cmd_test(args):
 
             # Compile
             print("  Compiling...")
+            timings.step('compile')
             runtime_path = _get_runtime_path()
             compile_cmd = [
                 "cc", "-O0", "-g",
@@ -2672,6 +3185,7 @@ def cmd_test(args):
 
             # Run tests
             print("  Running tests...")
+            timings.step('run tests')
             result = subprocess.run([test_bin_path], capture_output=True)
             # Decode with error handling for non-UTF-8 output from string tests
             stdout = result.stdout.decode('utf-8', errors='replace')
@@ -2833,7 +3347,7 @@ def generate_test_harness(test_cases, c_code, enable_prefixing=True):
         enable_prefixing: Whether to add module prefixes to function names
                          (should match the transpiler's prefixing setting)
     """
-    from slop.parser import Symbol, Number, String as SlopString
+    from slop.parser import Symbol, Number, String as SlopString, pretty_print
 
     lines = []
 
@@ -3032,7 +3546,7 @@ def generate_test_harness(test_cases, c_code, enable_prefixing=True):
 
 def sexpr_to_c(expr):
     """Convert a SLOP s-expression to a C expression string."""
-    from slop.parser import Symbol, Number, String as SlopString
+    from slop.parser import Symbol, Number, String as SlopString, SList, pretty_print
 
     if isinstance(expr, Number):
         return str(expr.value)
@@ -3112,7 +3626,7 @@ def cmd_verify(args):
     # Use native parser by default unless --python flag is set
     use_native = not getattr(args, 'python', False)
     if use_native:
-        ast, success = parse_native_json(args.input)
+        ast, success = parse_native_ast(args.input)
         if not success:
             # ast contains error message on failure
             if ast:
@@ -3191,12 +3705,107 @@ def cmd_verify(args):
     return 0
 
 
+def _warn_stale_components():
+    """Point out native binaries that are older than their SLOP sources."""
+    from slop.toolchain import COMPONENTS, find_component
+
+    for name in COMPONENTS:
+        component = find_component(name)
+        if component is not None and component.stale:
+            print(f"  Warning: {component.path} is older than its sources "
+                  f"(see `slop toolchain info`)")
+
+
+def cmd_toolchain(args):
+    """Report which native toolchain binaries will be used"""
+    import json
+    from slop.toolchain import COMPONENTS, find_component
+
+    components = {name: find_component(name) for name in COMPONENTS}
+    if args.json:
+        print(json.dumps({name: c.to_dict() if c else None for name, c in components.items()},
+                         indent=2))
+        return 0
+
+    for name, component in components.items():
+        if component is None:
+            print(f"{name:<11} not found, using the Python implementation")
+            continue
+        print(f"{name:<11} {component.path}")
+        print(f"{'':<11} version {component.version or 'unknown'}, "
+              f"sha256 {component.sha256[:16]}, {component.size} bytes")
+        newest = component.newest_source()
+        if newest is None:
+            print(f"{'':<11} sources not found, staleness unknown")
+        elif component.stale:
+            print(f"{'':<11} STALE: {newest[0]} is newer than the binary")
+        else:
+            print(f"{'':<11} up to date with {component.source_dir}")
+    return 0
+
+
+def cmd_bench(args):
+    """Compare the native and Python toolchains phase by phase"""
+    import json
+    from slop.bench import collect_files, default_files, format_summary, run_benchmark
+    from slop.toolchain import PROJECT_ROOT
+
+    files = collect_files(args.paths) if args.paths else default_files(PROJECT_ROOT)
+    if not files:
+        print("No .slop files to benchmark", file=sys.stderr)
+        return 1
+    phases = args.phase or ['parse', 'check', 'transpile']
+
+    def progress(path, phase):
+        if args.verbose:
+            print(f"  {phase:<10} {path}", file=sys.stderr)
+
+    report = run_benchmark(files, phases, repeat=args.repeat,
+                           root=PROJECT_ROOT.resolve(), progress=progress)
+    for name, binary in report['native'].items():
+        if binary is None:
+            print(f"Note: slop-{name} not found, only the Python toolchain was measured",
+                  file=sys.stderr)
+    print(format_summary(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True) + '\n')
+        print(f"Report written to {args.output}")
+    return 0
+
+
+def cmd_cache(args):
+    """Inspect or clear the on-disk parse cache"""
+    from slop.cache import ParseCache
+
+    cache = ParseCache()
+    if args.action == 'clear':
+        removed = cache.clear()
+        print(f"Removed {removed} cached AST(s) from {cache.dir}")
+        return 0
+
+    stats = cache.stats()
+    print(f"Parse cache: {stats.path}")
+    print(f"  Entries: {stats.entries}")
+    print(f"  Size:    {stats.total_bytes / (1024 * 1024):.1f} MB"
+          f" / {stats.max_bytes / (1024 * 1024):.1f} MB")
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='SLOP - Symbolic LLM-Optimized Programming',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the on-disk parse and toolchain caches '
+                             '(also SLOP_NO_CACHE=1)')
+    parser.add_argument('--timings', action='store_const', const='-',
+                        help='Print per-phase wall/CPU time and peak memory to stderr '
+                             '(also SLOP_TIMINGS=1)')
+    parser.add_argument('--timings-trace', metavar='FILE', dest='timings',
+                        help='Write the phase timings to FILE as a Chrome trace '
+                             '(also SLOP_TIMINGS=FILE)')
 
     subparsers = parser.add_subparsers(dest='command')
 
@@ -3237,9 +3846,14 @@ def main():
 
     # check
     p = subparsers.add_parser('check', help='Validate')
-    p.add_argument('input')
+    p.add_argument('input', nargs='+',
+                   help='.slop files, directories or glob patterns (e.g. "src/**/*.slop")')
     p.add_argument('--python', action='store_true',
                    help='Use Python toolchain instead of native')
+    p.add_argument('-j', '--jobs', type=int, default=None,
+                   help='Parallel type checker processes (default: CPU count)')
+    p.add_argument('--json', action='store_true',
+                   help='Print diagnostics for all files as JSON')
 
     # check-hole
     p = subparsers.add_parser('check-hole', help='Validate expression against expected type')
@@ -3269,6 +3883,16 @@ def main():
                    help='Build as library instead of executable')
     p.add_argument('--python', action='store_true',
                    help='Use Python toolchain instead of native')
+    p.add_argument('--rebuild', action='store_true',
+                   help='Ignore the incremental build cache for this target')
+    # SUPPRESS keeps the subparser from resetting the global `slop -v build`
+    p.add_argument('-v', '--verbose', action='store_true', default=argparse.SUPPRESS,
+                   help='Report which modules are rebuilt or skipped, and why')
+    p.add_argument('-j', '--jobs', type=int, default=None,
+                   help='Parallel C compiler jobs (default: CPU count)')
+    p.add_argument('--module-jobs', type=int, default=None, metavar='N',
+                   help='Parse and type check independent modules in N processes '
+                        '(default: 1; only pays off for large module graphs)')
 
     # derive
     p = subparsers.add_parser('derive', help='Generate SLOP from schemas')
@@ -3326,12 +3950,47 @@ def main():
     p.add_argument('--python', action='store_true',
         help='Use Python toolchain instead of native')
 
+    # cache
+    p = subparsers.add_parser('cache', help='Inspect or clear the on-disk parse cache')
+    p.add_argument('action', choices=['stats', 'clear'],
+        help='stats: show entry count and size, clear: remove all entries')
+
+    # toolchain
+    p = subparsers.add_parser('toolchain', help='Show the native toolchain binaries in use')
+    p.add_argument('action', choices=['info'],
+        help='info: paths, versions, hashes and staleness of the native binaries')
+    p.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    # bench
+    p = subparsers.add_parser('bench', help='Benchmark the native toolchain against Python')
+    # A sub-subparser, so options may come between the target and paths
+    targets = p.add_subparsers(dest='target', required=True)
+    p = targets.add_parser('toolchain',
+        help='Time parse/check/transpile with both implementations')
+    p.add_argument('paths', nargs='*',
+        help='Files or directories (default: examples/ and lib/compiler/)')
+    p.add_argument('-o', '--output', help='Write the JSON report to this file')
+    p.add_argument('--phase', action='append', choices=['parse', 'check', 'transpile'],
+        help='Phase to run (repeatable, default: all)')
+    p.add_argument('--repeat', type=int, default=1,
+        help='Runs per measurement, keeping the fastest (default: 1)')
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return 0
 
+    # `ref` never reads SLOP sources; skipping the caches keeps it from
+    # importing the parser at all
+    if (args.command not in ('cache', 'ref') and not args.no_cache
+            and not os.environ.get('SLOP_NO_CACHE')):
+        from slop.cache import ParseCache, default_cache_dir
+        from slop.parser import set_parse_cache
+        from slop.toolchain import set_hash_cache_dir
+        set_parse_cache(ParseCache())
+        set_hash_cache_dir(default_cache_dir())
+
     commands = {
         'parse': cmd_parse,
         'transpile': cmd_transpile,
@@ -3345,9 +4004,23 @@ def main():
         'ref': cmd_ref,
         'doc': cmd_doc,
         'test': cmd_test,
+        'cache': cmd_cache,
+        'toolchain': cmd_toolchain,
+        'bench': cmd_bench,
     }
 
-    return commands[args.command](args)
+    if not args.timings and not os.environ.get('SLOP_TIMINGS'):
+        return commands[args.command](args)
+    from slop import timings
+    timings_to = args.timings or timings.destination_from_env()
+    if timings_to is None:
+        return commands[args.command](args)
+    timings.enable()
+    try:
+        with timings.phase(args.command):
+            return commands[args.command](args)
+    finally:
+        timings.report(timings_to)
 
 
 if __name__ == '__main__':
@@ -5,13 +5,21 @@ Intentionally simple - S-expressions are trivially parseable.
 """
 
 from dataclasses import dataclass
-from typing import Union, List, Optional, Any
+from typing import Union, List, Optional, Any, Iterable, Iterator, Tuple
+import itertools
+import os
+from sys import intern
+from pathlib import Path
 import re
 
 
 # AST Node Types
+#
+# Nodes are slotted: the self-hosted compiler sources produce millions of
+# them, and a per-instance __dict__ would dominate memory. Symbol names are
+# interned by the lexer so repeated names share one string.
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
     name: str
     line: int = 0
@@ -19,7 +27,7 @@ class Symbol:
     resolved_type: Optional[Any] = None  # Set by type checker
     def __repr__(self): return self.name
 
-@dataclass
+@dataclass(slots=True)
 class String:
     value: str
     line: int = 0
@@ -29,7 +37,7 @@ class String:
         escaped = self.value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\t', '\\t')
         return f'"{escaped}"'
 
-@dataclass
+@dataclass(slots=True)
 class Number:
     value: Union[int, float]
     line: int = 0
@@ -37,7 +45,7 @@ class Number:
     resolved_type: Optional[Any] = None  # Set by type checker
     def __repr__(self): return str(self.value)
 
-@dataclass
+@dataclass(slots=True)
 class SList:
     items: List['SExpr']
     line: int = 0
@@ -90,7 +98,118 @@ class ParseError(Exception):
         super().__init__(f"Parse error at {line}:{col}: {message}")
 
 
+# Character classes for the hand-written scanner. These mirror the
+# alternatives in RegexLexer.TOKEN_PATTERNS exactly.
+_SYMBOL_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_@$')
+_ASCII_DIGITS = frozenset('0123456789')
+_OPERATOR_CHARS = frozenset('+-*/!<>=&|^%?')
+_PUNCTUATION = {'(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE',
+                "'": 'QUOTE', ':': 'COLON'}
+
+_SYMBOL_RE = re.compile(r'[a-zA-Z_@$][a-zA-Z0-9_\-/*<>=!?.]*')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+_NUMBER_RE = re.compile(r'-?\d+\.?\d*')
+_OPERATOR_RE = re.compile(r'[+\-*/!<>=&|^%?]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 class Lexer:
+    """Single-pass scanner dispatching on the first character of each token.
+
+    Whitespace and comments are skipped without being materialized, and
+    line/col are tracked incrementally from the start of the current line.
+    Produces the same (kind, value, line, col) stream as RegexLexer.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def iter_tokens(self) -> Iterator[Tuple[str, str, int, int]]:
+        """Yield tokens lazily; errors surface when the bad character is reached."""
+        src = self.source
+        n = len(src)
+        pos = 0
+        line = 1
+        line_start = 0  # Offset of the first character on the current line
+
+        while pos < n:
+            ch = src[pos]
+
+            if ch == ' ' or ch == '\t' or ch == '\r':
+                pos += 1
+                continue
+            if ch == '\n':
+                pos += 1
+                line += 1
+                line_start = pos
+                continue
+
+            col = pos - line_start + 1
+
+            kind = _PUNCTUATION.get(ch)
+            if kind is not None:
+                yield (kind, ch, line, col)
+                pos += 1
+            elif ch in _SYMBOL_START:
+                m = _SYMBOL_RE.match(src, pos)
+                yield ('SYMBOL', intern(m.group()), line, col)
+                pos = m.end()
+            elif ch == ';':
+                end = src.find('\n', pos)
+                pos = n if end < 0 else end
+            elif ch == '"':
+                m = _STRING_RE.match(src, pos)
+                if m is None:
+                    raise ParseError(f"Unexpected character: '{ch}'", line, col)
+                value = m.group()
+                yield ('STRING', value, line, col)
+                last_nl = value.rfind('\n')
+                if last_nl >= 0:
+                    line += value.count('\n')
+                    line_start = pos + last_nl + 1
+                pos = m.end()
+            elif ch in _ASCII_DIGITS or ch == '-' or ch.isdecimal():
+                m = _NUMBER_RE.match(src, pos)
+                if m is None:
+                    # Lone '-' not followed by a digit: an operator run
+                    m = _OPERATOR_RE.match(src, pos)
+                    yield ('OPERATOR', m.group(), line, col)
+                else:
+                    yield ('NUMBER', m.group(), line, col)
+                pos = m.end()
+            elif ch == '.':
+                if src.startswith('..', pos):
+                    yield ('RANGE', '..', line, col)
+                    pos += 2
+                else:
+                    yield ('OPERATOR', '.', line, col)
+                    pos += 1
+            elif ch in _OPERATOR_CHARS:
+                m = _OPERATOR_RE.match(src, pos)
+                yield ('OPERATOR', intern(m.group()), line, col)
+                pos = m.end()
+            elif ch.isspace():
+                # Remaining (form feed, vertical tab, Unicode) whitespace
+                m = _WHITESPACE_RE.match(src, pos)
+                value = m.group()
+                last_nl = value.rfind('\n')
+                if last_nl >= 0:
+                    line += value.count('\n')
+                    line_start = pos + last_nl + 1
+                pos = m.end()
+            else:
+                raise ParseError(f"Unexpected character: '{ch}'", line, col)
+
+    def tokenize(self):
+        return list(self.iter_tokens())
+
+
+class RegexLexer:
+    """Reference lexer built on a single alternation regex.
+
+    Superseded by Lexer; kept for differential tests and benchmarks.
+    """
+
     TOKEN_PATTERNS = [
         ('COMMENT', r';[^\n]*'),
         ('WHITESPACE', r'\s+'),
@@ -159,8 +278,8 @@ INFIX_PRECEDENCE = {
 
 
 class Parser:
-    def __init__(self, source: str):
-        self.tokens = Lexer(source).tokenize()
+    def __init__(self, source: str = '', tokens: Optional[List[Tuple[str, str, int, int]]] = None):
+        self.tokens = tokens if tokens is not None else Lexer(source).tokenize()
         self.pos = 0
         self.in_contract = False  # Track if inside @pre/@post/@assume
 
@@ -492,15 +611,160 @@ def _normalize_bare_forms(ast: List[SExpr]) -> List[SExpr]:
     return result
 
 
-def parse(source: str) -> List[SExpr]:
-    forms = Parser(source).parse()
+def normalize_forms(forms: List[SExpr]) -> List[SExpr]:
+    """Apply parse()'s normalizations to raw forms, e.g. from slop-parser."""
     forms = [_normalize_quotes(form) for form in forms]
-    forms = _normalize_bare_forms(forms)
-    return forms
+    return _normalize_bare_forms(forms)
+
+
+def parse(source: str) -> List[SExpr]:
+    return normalize_forms(Parser(source).parse())
+
+# Bump whenever parse() output changes shape, to invalidate cached ASTs
+PARSER_VERSION = 1
+
+# Optional on-disk cache consulted by parse_file (see slop.cache.ParseCache)
+_parse_cache = None
+
+
+def set_parse_cache(cache) -> Any:
+    """Install (or with None, remove) the cache used by parse_file.
+
+    Returns the previously installed cache.
+    """
+    global _parse_cache
+    previous = _parse_cache
+    _parse_cache = cache
+    return previous
+
+
+def get_parse_cache() -> Any:
+    """Return the cache used by parse_file, or None if none is installed."""
+    return _parse_cache
+
 
 def parse_file(path: str) -> List[SExpr]:
     with open(path) as f:
-        return parse(f.read())
+        source = f.read()
+    if _parse_cache is None:
+        return parse(source)
+    ast = _parse_cache.get(source)
+    if ast is None:
+        ast = parse(source)
+        _parse_cache.put(source, ast)
+    return ast
+
+
+# Streaming parse
+
+HEADER_FORMS = ('export', 'import')
+
+
+def _split_forms(tokens: Iterable[tuple]) -> Iterator[List[tuple]]:
+    """Group a token stream into the token runs of successive top-level forms.
+
+    A run ends when bracket depth returns to zero. QUOTE and COLON prefixes
+    stay attached to the token(s) they apply to. A stray closing bracket is
+    yielded as a run of its own so the parser can report it.
+    """
+    run = []
+    depth = 0
+    after_colon = False
+    for tok in tokens:
+        run.append(tok)
+        kind = tok[0]
+        if after_colon:
+            # Parser takes the token after ':' verbatim, brackets included
+            after_colon = False
+        elif kind == 'COLON':
+            after_colon = True
+            continue
+        elif kind == 'QUOTE':
+            continue
+        elif kind == 'LPAREN' or kind == 'LBRACE':
+            depth += 1
+            continue
+        elif kind == 'RPAREN' or kind == 'RBRACE':
+            depth -= 1
+        if depth <= 0:
+            yield run
+            run = []
+            depth = 0
+    if run:
+        yield run
+
+
+def _parse_run(run: List[tuple]) -> List[SExpr]:
+    """Parse and normalize the tokens of a single top-level form."""
+    forms = Parser(tokens=run).parse()
+    forms = [_normalize_quotes(form) for form in forms]
+    return _normalize_bare_forms(forms)
+
+
+def _is_header_run(run: List[tuple]) -> bool:
+    return (len(run) > 1 and run[0][0] == 'LPAREN' and
+            run[1][0] == 'SYMBOL' and run[1][1] in HEADER_FORMS)
+
+
+def _iter_header(tokens: Iterator[tuple]) -> Iterator[SExpr]:
+    """Yield only the export/import forms at the head of a token stream.
+
+    For a (module name ...) file this yields a single truncated module form
+    holding the name and its leading export/import forms. Otherwise the
+    leading top-level export/import forms are yielded. Scanning stops at the
+    first form of any other kind, so function bodies are never lexed.
+    """
+    head = list(itertools.islice(tokens, 2))
+    if (len(head) == 2 and head[0][0] == 'LPAREN' and
+            head[1][0] == 'SYMBOL' and head[1][1] == 'module'):
+        _, _, line, col = head[0]
+        items = [Symbol('module', head[1][2], head[1][3])]
+        for run in _split_forms(tokens):
+            if run[0][0] == 'RPAREN':
+                break  # End of module
+            if len(items) > 1 and not _is_header_run(run):
+                break
+            items.extend(_parse_run(run))
+        yield SList(items, line, col)
+        return
+
+    for run in _split_forms(itertools.chain(head, tokens)):
+        if not _is_header_run(run):
+            break
+        yield from _parse_run(run)
+
+
+def parse_iter(source_or_file, header_only: bool = False) -> Iterator[SExpr]:
+    """Parse lazily, yielding one top-level form at a time.
+
+    Args:
+        source_or_file: SLOP source text (str), a path (os.PathLike),
+                        or an open text file
+        header_only: If True, stop after the module's export/import forms
+                     (see _iter_header)
+
+    Lexing is driven by the consumer, so a ParseError for a later form is
+    only raised once iteration reaches it.
+    """
+    if isinstance(source_or_file, os.PathLike):
+        with open(source_or_file) as f:
+            source = f.read()
+    elif hasattr(source_or_file, 'read'):
+        source = source_or_file.read()
+    else:
+        source = source_or_file
+
+    tokens = Lexer(source).iter_tokens()
+    if header_only:
+        yield from _iter_header(tokens)
+        return
+    for run in _split_forms(tokens):
+        yield from _parse_run(run)
+
+
+def parse_header(path: str) -> List[SExpr]:
+    """Parse only the module header (name, exports, imports) of a file."""
+    return list(parse_iter(Path(path), header_only=True))
 
 
 # AST utilities
@@ -2,15 +2,18 @@
 SLOP Module Resolver - Handles module discovery, dependency graphs, and linking.
 """
 
+import os
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from slop.parser import (
-    SExpr, SList, Symbol, parse_file, is_form,
+    SExpr, SList, Symbol, get_parse_cache, parse_file, parse_header, is_form,
     get_imports, get_exports, parse_import, parse_export,
     ImportSpec, ExportSpec
 )
+from slop import timings
 
 
 @dataclass
@@ -39,15 +42,82 @@ class ResolverError(Exception):
 class ModuleResolver:
     """Resolves module imports and builds dependency graphs."""
 
-    def __init__(self, search_paths: List[Path] = None):
+    def __init__(self, search_paths: List[Path] = None,
+                 parse_batch: Optional[Callable] = None):
         """Initialize resolver with optional search paths.
 
         Args:
             search_paths: Directories to search for modules (in order).
                          Current directory of importing file is always searched first.
+            parse_batch: Optional callable parsing many files at once, with the
+                         signature of cli.parse_native_batch. When set, each
+                         dependency frontier is parsed in a single call; files
+                         it fails on are parsed again with parse_file.
         """
         self.search_paths = search_paths or []
+        self.parse_batch = parse_batch
         self.cache: Dict[Path, ModuleInfo] = {}
+        self.header_cache: Dict[Path, ModuleInfo] = {}
+        # Filesystem calls (stat/scandir) made while resolving modules
+        self.fs_probes = 0
+        # dir -> (generation validated, mtime_ns, {module_name: path})
+        self._dir_indexes: Dict[Path, Tuple[int, Optional[int], Dict[str, Path]]] = {}
+        self._search_index: Optional[Tuple[int, tuple, Dict[str, Path]]] = None
+        self._resolved: Dict[Path, Path] = {}
+        self._generation = 0
+
+    def refresh(self):
+        """Re-validate directory indexes (by mtime) on their next use.
+
+        build_dependency_graph calls this once per graph; within a graph
+        each search directory is stat'ed at most once.
+        """
+        self._generation += 1
+
+    def _dir_index(self, dir_path: Path) -> Dict[str, Path]:
+        """Map module name -> .slop file for the files directly in dir_path."""
+        cached = self._dir_indexes.get(dir_path)
+        if cached is not None and cached[0] == self._generation:
+            return cached[2]
+
+        self.fs_probes += 1
+        try:
+            mtime = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if cached is not None and cached[1] == mtime:
+            index = cached[2]
+        else:
+            index = {}
+            if mtime is not None:
+                self.fs_probes += 1
+                try:
+                    with os.scandir(dir_path) as entries:
+                        for entry in entries:
+                            if entry.name.endswith('.slop') and entry.is_file():
+                                index[entry.name[:-len('.slop')]] = Path(entry.path)
+                except OSError:
+                    pass
+
+        self._dir_indexes[dir_path] = (self._generation, mtime, index)
+        return index
+
+    def _search_dirs_index(self) -> Dict[str, Path]:
+        """Merged index of the configured search paths and the current directory.
+
+        Earlier directories win, matching the documented search order.
+        """
+        key = tuple(self.search_paths)
+        cached = self._search_index
+        if cached is not None and cached[0] == self._generation and cached[1] == key:
+            return cached[2]
+
+        merged: Dict[str, Path] = {}
+        for dir_path in reversed(list(self.search_paths) + [Path('.')]):
+            merged.update(self._dir_index(dir_path))
+        self._search_index = (self._generation, key, merged)
+        return merged
 
     def resolve_module(self, module_name: str, from_path: Optional[Path] = None) -> Path:
         """Find the .slop file for a module name.
@@ -57,6 +127,9 @@ class ModuleResolver:
         2. Configured search paths (in order)
         3. Current working directory
 
+        Each directory is scanned once into a name -> path index, so a
+        lookup is a dictionary hit rather than a stat per directory.
+
         Args:
             module_name: Name of module to find
             from_path: Path of the importing file (for relative resolution)
@@ -67,24 +140,19 @@ class ModuleResolver:
         Raises:
             ResolverError: If module cannot be found
         """
-        filename = f"{module_name}.slop"
-        search_dirs = []
-
-        # Start with directory of importing file
+        candidate = None
         if from_path:
-            search_dirs.append(from_path.parent)
-
-        # Add configured search paths
-        search_dirs.extend(self.search_paths)
-
-        # Add current directory as fallback
-        search_dirs.append(Path('.'))
-
-        for dir_path in search_dirs:
-            candidate = dir_path / filename
-            if candidate.exists():
-                return candidate.resolve()
-
+            candidate = self._dir_index(from_path.parent).get(module_name)
+        if candidate is None:
+            candidate = self._search_dirs_index().get(module_name)
+        if candidate is not None:
+            resolved = self._resolved.get(candidate)
+            if resolved is None:
+                self.fs_probes += 1
+                resolved = self._resolved[candidate] = candidate.resolve()
+            return resolved
+
+        search_dirs = ([from_path.parent] if from_path else []) + list(self.search_paths) + [Path('.')]
         searched = ', '.join(str(p) for p in search_dirs)
         raise ResolverError(f"Module '{module_name}' not found (searched: {searched})")
 
@@ -103,9 +171,37 @@ class ModuleResolver:
         if path in self.cache:
             return self.cache[path]
 
-        # Parse file
-        ast = parse_file(str(path))
+        with timings.phase('parse', module=path.stem):
+            info = self._module_info(path, parse_file(str(path)))
+        self.cache[path] = info
+        return info
+
+    def load_module_header(self, path: Path) -> ModuleInfo:
+        """Load only the name, exports and imports of a .slop file.
+
+        Function bodies are never parsed; the returned ModuleInfo.ast holds
+        just the header forms. A fully loaded module is returned as-is if
+        one is already cached.
+
+        Args:
+            path: Path to .slop file
+
+        Returns:
+            ModuleInfo with header-only AST and extracted exports/imports
+        """
+        path = path.resolve()
+
+        if path in self.cache:
+            return self.cache[path]
+        if path in self.header_cache:
+            return self.header_cache[path]
+
+        info = self._module_info(path, parse_header(str(path)))
+        self.header_cache[path] = info
+        return info
 
+    def _module_info(self, path: Path, ast: List[SExpr]) -> ModuleInfo:
+        """Extract module name, exports and imports from a parsed file."""
         # Find module form
         module_name = path.stem  # Default to filename
         module_forms = ast
@@ -129,7 +225,7 @@ class ModuleResolver:
         for imp_form in get_imports(module_forms):
             imports.append(parse_import(imp_form))
 
-        info = ModuleInfo(
+        return ModuleInfo(
             name=module_name,
             path=path,
             ast=ast,
@@ -137,47 +233,112 @@ class ModuleResolver:
             imports=imports
         )
 
-        self.cache[path] = info
-        return info
-
-    def build_dependency_graph(self, entry_path: Path) -> ModuleGraph:
+    def build_dependency_graph(self, entry_path: Path, headers_only: bool = False,
+                               jobs: Optional[int] = None) -> ModuleGraph:
         """Build complete dependency graph starting from entry module.
 
+        Modules are discovered breadth-first, one frontier at a time. With
+        jobs > 1, the uncached modules of each frontier are parsed in a
+        process pool; results are merged in discovery order, so the graph
+        (and topological_sort) is identical to the sequential one.
+
         Args:
             entry_path: Path to the entry point .slop file
+            headers_only: If True, load only module headers (see
+                          load_module_header); ModuleInfo.ast will not
+                          contain function bodies
+            jobs: Number of parser processes (None or 1 parses in-process)
 
         Returns:
             ModuleGraph with all modules and their dependencies
         """
+        self.refresh()
         graph = ModuleGraph()
-        to_process = [entry_path.resolve()]
+        frontier = deque([entry_path.resolve()])
         processed = set()
+        pool = None
+
+        try:
+            while frontier:
+                # Dedupe while keeping first-seen order
+                paths = []
+                while frontier:
+                    path = frontier.popleft()
+                    if path not in processed:
+                        processed.add(path)
+                        paths.append(path)
+
+                if self.parse_batch is not None and not headers_only:
+                    # Anything the batch could not parse goes through
+                    # parse_file, which reports errors the usual way
+                    self.prefetch(paths)
+                    infos = [self.load_module(path) for path in paths]
+                elif jobs and jobs > 1 and len(paths) > 1:
+                    if pool is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        pool = ProcessPoolExecutor(max_workers=jobs)
+                    infos = self._load_parallel(pool, paths, headers_only)
+                else:
+                    infos = [self.load_module_header(path) if headers_only else self.load_module(path)
+                             for path in paths]
+
+                for path, info in zip(paths, infos):
+                    graph.modules[info.name] = info
+                    graph.dependencies[info.name] = []
+
+                    # Process imports
+                    for imp in info.imports:
+                        graph.dependencies[info.name].append(imp.module_name)
+
+                        # Resolve and queue import
+                        try:
+                            dep_path = self.resolve_module(imp.module_name, path)
+                            if dep_path not in processed:
+                                frontier.append(dep_path)
+                        except ResolverError:
+                            # Will be caught during validation
+                            pass
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
-        while to_process:
-            path = to_process.pop(0)
-            if path in processed:
-                continue
-            processed.add(path)
-
-            # Load module
-            info = self.load_module(path)
-            graph.modules[info.name] = info
-            graph.dependencies[info.name] = []
-
-            # Process imports
-            for imp in info.imports:
-                graph.dependencies[info.name].append(imp.module_name)
+        return graph
 
-                # Resolve and queue import
-                try:
-                    dep_path = self.resolve_module(imp.module_name, path)
-                    if dep_path not in processed:
-                        to_process.append(dep_path)
-                except ResolverError:
-                    # Will be caught during validation
-                    pass
+    def prefetch(self, paths: List[Path]) -> None:
+        """Parse the uncached modules among paths in one parse_batch call.
 
-        return graph
+        Files the batch fails on are left uncached, so load_module parses
+        them again and reports the error. Does nothing without parse_batch.
+        """
+        if self.parse_batch is None:
+            return
+        misses = [path for path in map(Path.resolve, paths) if path not in self.cache]
+        if not misses:
+            return
+        with timings.phase('parse batch', files=len(misses)):
+            results = self.parse_batch(misses)
+        for path in misses:
+            ast, success = (results or {}).get(str(path), (None, False))
+            if success:
+                self.cache[path] = self._module_info(path, ast)
+
+    def _load_parallel(self, pool, paths: List[Path],
+                       headers_only: bool) -> List[ModuleInfo]:
+        """Load a frontier of modules, parsing cache misses in worker processes."""
+        cache = self.cache if not headers_only else self.header_cache
+        futures = {}
+        for path in paths:
+            if path not in self.cache and path not in cache:
+                futures[path] = pool.submit(_load_module_worker, path, headers_only)
+
+        infos = []
+        for path in paths:
+            if path in futures:
+                info = futures[path].result()
+                if info is not None:
+                    cache[path] = info
+            infos.append(self.load_module_header(path) if headers_only else self.load_module(path))
+        return infos
 
     def detect_cycles(self, graph: ModuleGraph) -> Optional[List[str]]:
         """Detect circular dependencies in module graph.
@@ -251,11 +412,11 @@ class ModuleResolver:
                     in_degree[dep] += 1
 
         # Start with modules that have no dependents
-        queue = [name for name, degree in in_degree.items() if degree == 0]
+        queue = deque(name for name, degree in in_degree.items() if degree == 0)
         result = []
 
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             result.append(node)
 
             for dep in graph.dependencies.get(node, []):
@@ -299,6 +460,20 @@ class ModuleResolver:
         return errors
 
 
+def _load_module_worker(path: Path, headers_only: bool) -> Optional[ModuleInfo]:
+    """Process-pool entry point: parse one module in a worker.
+
+    With a parse cache installed the worker only fills the cache and returns
+    None; loading the marshalled entry in the parent is cheaper than
+    unpickling the ModuleInfo, and keeps symbol names interned.
+    """
+    resolver = ModuleResolver()
+    if headers_only:
+        return resolver.load_module_header(path)
+    info = resolver.load_module(path)
+    return None if get_parse_cache() is not None else info
+
+
 def resolve_modules(entry_path: str, search_paths: List[str] = None) -> Tuple[ModuleGraph, List[str]]:
     """Convenience function to resolve modules from entry point.
 
@@ -81,59 +81,111 @@
  * Arena Allocator
  * ============================================================ */
 
+/*
+ * An arena is a list of blocks: the first lives in the slop_arena itself
+ * and overflow blocks are chained through next. Allocation bumps an
+ * offset in the tail block; when that is full a new block twice its size
+ * (at least SLOP_ARENA_DEFAULT_SIZE, at most SLOP_ARENA_MAX_BLOCK_SIZE
+ * unless one allocation needs more) is appended, so allocation is O(1)
+ * however often the arena has overflowed.
+ */
+
+#ifndef SLOP_ARENA_MAX_BLOCK_SIZE
+#define SLOP_ARENA_MAX_BLOCK_SIZE ((size_t)64 << 20)
+#endif
+
 typedef struct slop_arena {
     uint8_t* base;
     size_t offset;
     size_t capacity;
     struct slop_arena* next;  /* For overflow arenas */
+    struct slop_arena* tail;  /* Block allocations come from; NULL for this one */
 } slop_arena;
 
 static inline slop_arena slop_arena_new(size_t capacity) {
     slop_arena arena;
+    if (capacity == 0) capacity = SLOP_ARENA_DEFAULT_SIZE;
     arena.base = (uint8_t*)malloc(capacity);
     arena.offset = 0;
     arena.capacity = capacity;
     arena.next = NULL;
+    arena.tail = NULL;
     return arena;
 }
 
+/* Move to a block with room for size bytes, appending one if needed */
+static inline slop_arena* _slop_arena_grow(slop_arena* arena, size_t size) {
+    slop_arena* block = arena->tail ? arena->tail : arena;
+    /* Blocks kept by slop_arena_reset are reused first */
+    while (block->next) {
+        block = block->next;
+        if (block->offset + size <= block->capacity) {
+            arena->tail = block;
+            return block;
+        }
+    }
+    size_t new_cap = block->capacity * 2;
+    if (new_cap > SLOP_ARENA_MAX_BLOCK_SIZE) new_cap = SLOP_ARENA_MAX_BLOCK_SIZE;
+    if (new_cap < SLOP_ARENA_DEFAULT_SIZE) new_cap = SLOP_ARENA_DEFAULT_SIZE;
+    if (new_cap < size) new_cap = size;
+    block->next = (slop_arena*)malloc(sizeof(slop_arena));
+    *block->next = slop_arena_new(new_cap);
+    arena->tail = block->next;
+    return block->next;
+}
+
 static inline void* slop_arena_alloc(slop_arena* arena, size_t size) {
     /* Align to 8 bytes */
     size = (size + 7) & ~7;
-    
-    /* Check if we need overflow arena */
-    if (arena->offset + size > arena->capacity) {
-        if (arena->next == NULL) {
-            size_t new_cap = arena->capacity * 2;
-            if (new_cap < size) new_cap = size * 2;
-            arena->next = (slop_arena*)malloc(sizeof(slop_arena));
-            *arena->next = slop_arena_new(new_cap);
-        }
-        return slop_arena_alloc(arena->next, size);
+
+    slop_arena* block = arena->tail ? arena->tail : arena;
+    if (block->offset + size > block->capacity) {
+        block = _slop_arena_grow(arena, size);
     }
-    
-    void* ptr = arena->base + arena->offset;
-    arena->offset += size;
+
+    void* ptr = block->base + block->offset;
+    block->offset += size;
     return ptr;
 }
 
-static inline void slop_arena_free(slop_arena* arena) {
-    if (arena->next) {
-        slop_arena_free(arena->next);
-        free(arena->next);
+/* Free overflow blocks from block onwards */
+static inline void _slop_arena_free_blocks(slop_arena* block) {
+    while (block) {
+        slop_arena* next = block->next;
+        free(block->base);
+        free(block);
+        block = next;
     }
+}
+
+static inline void slop_arena_free(slop_arena* arena) {
+    _slop_arena_free_blocks(arena->next);
     free(arena->base);
     arena->base = NULL;
     arena->offset = 0;
     arena->capacity = 0;
+    arena->next = NULL;
+    arena->tail = NULL;
 }
 
+/* Empty the arena. The last (largest) overflow block is kept for reuse,
+ * so an arena reset between requests does not regrow from its first
+ * block every time. */
 static inline void slop_arena_reset(slop_arena* arena) {
     arena->offset = 0;
+    arena->tail = NULL;
     if (arena->next) {
-        slop_arena_free(arena->next);
-        free(arena->next);
-        arena->next = NULL;
+        slop_arena* last = arena->next;
+        while (last->next) last = last->next;
+        slop_arena* block = arena->next;
+        while (block != last) {
+            slop_arena* next = block->next;
+            free(block->base);
+            free(block);
+            block = next;
+        }
+        last->offset = 0;
+        arena->next = last;
     }
 }
 
@@ -329,35 +381,172 @@ static inline slop_list_string string_split(slop_arena* arena, slop_string s, sl
 }
 
 /* ============================================================
- * Map Type (simple hash map)
+ * Map Type (string-keyed hash map)
+ *
+ * Open addressing with linear probing over a power-of-two table, so a
+ * probe step is a mask rather than a division. Each entry caches its
+ * key's hash, so probing compares hashes before keys. Removing a key
+ * leaves a tombstone, which keeps probe chains that ran past it intact;
+ * tombstones are reused by later puts and dropped when the table is
+ * rebuilt.
+ *
+ * The table lives in the arena. When it grows, the old table's memory
+ * is kept as spare space for values stored through slop_map_value_alloc
+ * (the typed puts below) rather than left unused in the arena.
+ *
+ * A map literal is a static array of len entries in no particular order
+ * with cap 0: lookups scan it, and the first put copies it into a table.
  * ============================================================ */
 
 typedef struct {
     slop_string key;
     void* value;
+    uint64_t hash;          /* slop_hash_string(key), cached */
     bool occupied;
+    bool tombstone;         /* removed; probing continues past it */
 } slop_map_entry;
 
 typedef struct {
     size_t len;
-    size_t cap;
+    size_t cap;             /* power of two, or 0 for a literal */
     slop_map_entry* entries;
+    size_t tombstones;
+    uint8_t* spare;         /* unused memory of a previous table */
+    size_t spare_len;
 } slop_map;
 
-static inline uint64_t slop_hash_string(slop_string s) {
+#ifndef SLOP_MAP_MIN_CAPACITY
+#define SLOP_MAP_MIN_CAPACITY 8
+#endif
+
+/*
+ * String hash. slop_hash_string is one of:
+ *   SLOP_HASH_WYHASH (default)  wyhash-style: 8 bytes per step, 64x64->128
+ *                               multiply mixing
+ *   SLOP_HASH_FNV1A             FNV-1a, one byte per step
+ * Both are plain C; the 128-bit multiply uses __int128 where the
+ * compiler has it and 32-bit halves otherwise. Words are read with
+ * memcpy, so keys need no alignment and no padding past their end.
+ */
+
+static inline uint64_t _slop_hash_fnv1a(const uint8_t* p, size_t len) {
     uint64_t hash = 14695981039346656037ULL;
-    for (size_t i = 0; i < s.len; i++) {
-        hash ^= (uint8_t)s.data[i];
+    for (size_t i = 0; i < len; i++) {
+        hash ^= p[i];
         hash *= 1099511628211ULL;
     }
     return hash;
 }
 
+static inline uint64_t _slop_wy_read8(const uint8_t* p) {
+    uint64_t v;
+    memcpy(&v, p, 8);
+    return v;
+}
+
+static inline uint64_t _slop_wy_read4(const uint8_t* p) {
+    uint32_t v;
+    memcpy(&v, p, 4);
+    return v;
+}
+
+/* 1 to 3 bytes */
+static inline uint64_t _slop_wy_read3(const uint8_t* p, size_t len) {
+    return ((uint64_t)p[0] << 16) | ((uint64_t)p[len >> 1] << 8) | p[len - 1];
+}
+
+/* Full 128-bit product of a and b: low half in *a, high half in *b */
+static inline void _slop_wy_mum(uint64_t* a, uint64_t* b) {
+#ifdef __SIZEOF_INT128__
+    __uint128_t r = (__uint128_t)*a * *b;
+    *a = (uint64_t)r;
+    *b = (uint64_t)(r >> 64);
+#else
+    uint64_t ha = *a >> 32, hb = *b >> 32, la = (uint32_t)*a, lb = (uint32_t)*b;
+    uint64_t rh = ha * hb, rm0 = ha * lb, rm1 = hb * la, rl = la * lb;
+    uint64_t t = rl + (rm0 << 32), carry = t < rl;
+    uint64_t lo = t + (rm1 << 32);
+    carry += lo < t;
+    *a = lo;
+    *b = rh + (rm0 >> 32) + (rm1 >> 32) + carry;
+#endif
+}
+
+static inline uint64_t _slop_wy_mix(uint64_t a, uint64_t b) {
+    _slop_wy_mum(&a, &b);
+    return a ^ b;
+}
+
+static inline uint64_t _slop_hash_wyhash(const uint8_t* p, size_t len) {
+    static const uint64_t secret[4] = {
+        0x2d358dccaa6c78a5ULL, 0x8bb84b93962eacc9ULL,
+        0x4b33a62ed433d4a3ULL, 0x4d5a2da51de1aa47ULL,
+    };
+    uint64_t seed = _slop_wy_mix(secret[0], secret[1]);
+    uint64_t a, b;
+    if (len <= 16) {
+        if (len >= 4) {
+            /* Two overlapping pairs of 4-byte reads cover 4..16 bytes */
+            size_t mid = (len >> 3) << 2;
+            a = (_slop_wy_read4(p) << 32) | _slop_wy_read4(p + mid);
+            b = (_slop_wy_read4(p + len - 4) << 32) | _slop_wy_read4(p + len - 4 - mid);
+        } else if (len > 0) {
+            a = _slop_wy_read3(p, len);
+            b = 0;
+        } else {
+            a = b = 0;
+        }
+    } else {
+        size_t i = len;
+        if (i > 48) {
+            /* Three independent lanes of 16 bytes */
+            uint64_t seed1 = seed, seed2 = seed;
+            do {
+                seed = _slop_wy_mix(_slop_wy_read8(p) ^ secret[1], _slop_wy_read8(p + 8) ^ seed);
+                seed1 = _slop_wy_mix(_slop_wy_read8(p + 16) ^ secret[2], _slop_wy_read8(p + 24) ^ seed1);
+                seed2 = _slop_wy_mix(_slop_wy_read8(p + 32) ^ secret[3], _slop_wy_read8(p + 40) ^ seed2);
+                p += 48;
+                i -= 48;
+            } while (i > 48);
+            seed ^= seed1 ^ seed2;
+        }
+        while (i > 16) {
+            seed = _slop_wy_mix(_slop_wy_read8(p) ^ secret[1], _slop_wy_read8(p + 8) ^ seed);
+            p += 16;
+            i -= 16;
+        }
+        /* The last 16 bytes, overlapping what came before */
+        a = _slop_wy_read8(p + i - 16);
+        b = _slop_wy_read8(p + i - 8);
+    }
+    a ^= secret[1];
+    b ^= seed;
+    _slop_wy_mum(&a, &b);
+    return _slop_wy_mix(a ^ secret[0] ^ len, b ^ secret[1]);
+}
+
+static inline uint64_t slop_hash_string(slop_string s) {
+#if defined(SLOP_HASH_FNV1A)
+    return _slop_hash_fnv1a((const uint8_t*)s.data, s.len);
+#else
+    return _slop_hash_wyhash((const uint8_t*)s.data, s.len);
+#endif
+}
+
+/* Smallest table that holds n keys under the 3/4 load factor */
+static inline size_t _slop_map_capacity_for(size_t n) {
+    size_t cap = SLOP_MAP_MIN_CAPACITY;
+    while (cap * 3 < n * 4) cap *= 2;
+    return cap;
+}
+
 static inline slop_map slop_map_new(slop_arena* arena, size_t capacity) {
+    /* capacity is the number of keys expected */
+    size_t cap = _slop_map_capacity_for(capacity);
     slop_map_entry* entries = (slop_map_entry*)slop_arena_alloc(
-        arena, capacity * sizeof(slop_map_entry));
-    memset(entries, 0, capacity * sizeof(slop_map_entry));
-    return (slop_map){0, capacity, entries};
+        arena, cap * sizeof(slop_map_entry));
+    memset(entries, 0, cap * sizeof(slop_map_entry));
+    return (slop_map){.len = 0, .cap = cap, .entries = entries};
 }
 
 /* Return pointer to arena-allocated map (for slop_map* type) */
@@ -367,54 +556,104 @@ static inline slop_map* slop_map_new_ptr(slop_arena* arena, size_t capacity) {
     return map;
 }
 
-static inline void* slop_map_get(slop_map* map, slop_string key) {
-    uint64_t hash = slop_hash_string(key);
-    size_t idx = hash % map->cap;
-    
-    for (size_t i = 0; i < map->cap; i++) {
-        size_t probe = (idx + i) % map->cap;
-        if (!map->entries[probe].occupied) {
-            return NULL;
+/* Index of the entry holding key, or SIZE_MAX */
+static inline size_t _slop_map_find(slop_map* map, slop_string key, uint64_t hash) {
+    if (map->cap == 0) {
+        for (size_t i = 0; i < map->len; i++) {
+            if (slop_string_eq(map->entries[i].key, key)) return i;
         }
-        if (slop_string_eq(map->entries[probe].key, key)) {
-            return map->entries[probe].value;
+        return SIZE_MAX;
+    }
+    size_t mask = map->cap - 1;
+    for (size_t i = hash & mask;; i = (i + 1) & mask) {
+        slop_map_entry* e = &map->entries[i];
+        if (e->occupied) {
+            if (e->hash == hash && slop_string_eq(e->key, key)) return i;
+        } else if (!e->tombstone) {
+            return SIZE_MAX;
         }
     }
-    return NULL;
 }
 
-static inline void slop_map_put(slop_arena* arena, slop_map* map, 
-                                 slop_string key, void* value) {
-    /* Grow if needed (75% load factor) */
-    if (map->len * 4 >= map->cap * 3) {
-        size_t new_cap = map->cap * 2;
-        slop_map new_map = slop_map_new(arena, new_cap);
-        for (size_t i = 0; i < map->cap; i++) {
-            if (map->entries[i].occupied) {
-                slop_map_put(arena, &new_map, 
-                            map->entries[i].key, map->entries[i].value);
-            }
+static inline void* slop_map_get(slop_map* map, slop_string key) {
+    size_t i = _slop_map_find(map, key, slop_hash_string(key));
+    return i == SIZE_MAX ? NULL : map->entries[i].value;
+}
+
+/* Move the live entries into a new table with room for at least n keys */
+static inline void _slop_map_rebuild(slop_arena* arena, slop_map* map, size_t n) {
+    size_t cap = _slop_map_capacity_for(n);
+    slop_map_entry* entries = (slop_map_entry*)slop_arena_alloc(
+        arena, cap * sizeof(slop_map_entry));
+    memset(entries, 0, cap * sizeof(slop_map_entry));
+
+    size_t mask = cap - 1;
+    size_t count = map->cap == 0 ? map->len : map->cap;
+    for (size_t i = 0; i < count; i++) {
+        slop_map_entry e = map->entries[i];
+        if (map->cap == 0) {
+            e.hash = slop_hash_string(e.key);
+        } else if (!e.occupied) {
+            continue;
         }
-        *map = new_map;
+        size_t j = e.hash & mask;
+        while (entries[j].occupied) j = (j + 1) & mask;
+        entries[j] = (slop_map_entry){e.key, e.value, e.hash, true, false};
     }
-    
+
+    if (map->cap > 0) {
+        /* The old table is the map's own arena memory (a literal's is not) */
+        map->spare = (uint8_t*)map->entries;
+        map->spare_len = map->cap * sizeof(slop_map_entry);
+    }
+    map->entries = entries;
+    map->cap = cap;
+    map->tombstones = 0;
+}
+
+/* Make room for n keys in total without further rebuilding */
+static inline void slop_map_reserve(slop_arena* arena, slop_map* map, size_t n) {
+    if (map->cap == 0 || (n + map->tombstones) * 4 > map->cap * 3) {
+        _slop_map_rebuild(arena, map, n > map->len ? n : map->len);
+    }
+}
+
+static inline void slop_map_put(slop_arena* arena, slop_map* map,
+                                 slop_string key, void* value) {
     uint64_t hash = slop_hash_string(key);
-    size_t idx = hash % map->cap;
-    
-    for (size_t i = 0; i < map->cap; i++) {
-        size_t probe = (idx + i) % map->cap;
-        if (!map->entries[probe].occupied) {
-            map->entries[probe].key = key;
-            map->entries[probe].value = value;
-            map->entries[probe].occupied = true;
-            map->len++;
+    if (map->cap == 0 || (map->len + map->tombstones + 1) * 4 > map->cap * 3) {
+        size_t i = _slop_map_find(map, key, hash);
+        if (i != SIZE_MAX && map->cap > 0) {
+            map->entries[i].value = value;
             return;
         }
-        if (slop_string_eq(map->entries[probe].key, key)) {
-            map->entries[probe].value = value;
-            return;
+        /* Grow only when live keys fill the table; otherwise just drop tombstones */
+        size_t n = map->len + 1;
+        _slop_map_rebuild(arena, map, (n * 4 > map->cap * 3) ? n * 2 : n);
+    }
+
+    size_t mask = map->cap - 1;
+    size_t slot = SIZE_MAX;
+    for (size_t i = hash & mask;; i = (i + 1) & mask) {
+        slop_map_entry* e = &map->entries[i];
+        if (e->occupied) {
+            if (e->hash == hash && slop_string_eq(e->key, key)) {
+                e->value = value;
+                return;
+            }
+        } else if (e->tombstone) {
+            if (slot == SIZE_MAX) slot = i;
+        } else {
+            if (slot == SIZE_MAX) {
+                slot = i;
+            } else {
+                map->tombstones--;
+            }
+            break;
         }
     }
+    map->entries[slot] = (slop_map_entry){key, value, hash, true, false};
+    map->len++;
 }
 
 static inline bool slop_map_has(slop_map* map, slop_string key) {
@@ -422,24 +661,41 @@ static inline bool slop_map_has(slop_map* map, slop_string key) {
 }
 
 static inline bool slop_map_remove(slop_map* map, slop_string key) {
-    uint64_t hash = slop_hash_string(key);
-    size_t idx = hash % map->cap;
-    for (size_t i = 0; i < map->cap; i++) {
-        size_t probe = (idx + i) % map->cap;
-        if (!map->entries[probe].occupied) return false;
-        if (slop_string_eq(map->entries[probe].key, key)) {
-            map->entries[probe].occupied = false;
-            map->len--;
-            return true;
-        }
+    size_t i = _slop_map_find(map, key, slop_hash_string(key));
+    if (i == SIZE_MAX) return false;
+    if (map->cap == 0) {
+        map->entries[i] = map->entries[map->len - 1];
+    } else if (!map->entries[(i + 1) & (map->cap - 1)].occupied &&
+               !map->entries[(i + 1) & (map->cap - 1)].tombstone) {
+        /* Nothing probes past an empty slot, so this one can be empty too */
+        map->entries[i] = (slop_map_entry){0};
+    } else {
+        map->entries[i].occupied = false;
+        map->entries[i].tombstone = true;
+        map->tombstones++;
     }
-    return false;
+    map->len--;
+    return true;
+}
+
+/* Arena memory for a value stored in the map, taken from the space of
+ * the map's previous table when there is room */
+static inline void* slop_map_value_alloc(slop_arena* arena, slop_map* map, size_t size) {
+    size = (size + 7) & ~(size_t)7;
+    if (size <= map->spare_len) {
+        void* ptr = map->spare;
+        map->spare += size;
+        map->spare_len -= size;
+        return ptr;
+    }
+    return slop_arena_alloc(arena, size);
 }
 
 static inline slop_list_string slop_map_keys(slop_arena* arena, slop_map* map) {
     slop_list_string result = slop_list_string_new(arena, map->len > 0 ? map->len : 1);
-    for (size_t i = 0; i < map->cap; i++) {
-        if (map->entries[i].occupied) {
+    size_t count = map->cap == 0 ? map->len : map->cap;
+    for (size_t i = 0; i < count; i++) {
+        if (map->cap == 0 || map->entries[i].occupied) {
             slop_list_string_push(arena, &result, map->entries[i].key);
         }
     }
@@ -467,7 +723,7 @@ static inline slop_list_string slop_map_keys(slop_arena* arena, slop_map* map) {
     } \
     \
     static inline void Name##_put(slop_arena* arena, Name* map, slop_string key, V value) { \
-        V* stored = (V*)slop_arena_alloc(arena, sizeof(V)); \
+        V* stored = (V*)slop_map_value_alloc(arena, map, sizeof(V)); \
         *stored = value; \
         slop_map_put(arena, map, key, stored); \
     } \
@@ -479,52 +735,164 @@ static inline slop_list_string slop_map_keys(slop_arena* arena, slop_map* map) {
 /* ============================================================
  * Generic Map Operations (for transpiled SLOP code)
  *
- * Integer-keyed map with fixed-size value storage (up to 256 bytes).
- * Used for SLOP Map types with integer keys (e.g., Map PetId Pet).
+ * Integer-keyed map. Used for SLOP Map types with integer keys
+ * (e.g., Map PetId Pet).
+ *
+ * Keys live in a dense array in insertion order, and values in a
+ * parallel array at their own size (fixed by the first map_put, since
+ * a map holds one value type); an open-addressing index (linear
+ * probing, power-of-two size) maps each key's hash to its entry.
+ * Removing a key leaves a tombstone in both; tombstones are dropped
+ * whenever the entry array fills up, and the index is kept at most
+ * half full (tombstones included), so probes stay short.
+ *
+ * A map made with an arena (slop_gmap_new, the typed Name_new) keeps
+ * its arrays in that arena and is released with it; map_empty() maps
+ * own malloc'd arrays, released by map_free.
  * ============================================================ */
 
-/* Generic map entry with fixed-size value storage */
 typedef struct slop_gmap_entry_t {
     int64_t gmap_key;
-    uint8_t gmap_value[256];
-    size_t gmap_value_size;
     bool gmap_occupied;
 } slop_gmap_entry_t;
 
 typedef struct slop_gmap_t {
-    size_t gmap_len;
-    size_t gmap_cap;
+    size_t gmap_len;                  /* live entries */
+    size_t gmap_used;                 /* entries in use, including removed ones */
+    size_t gmap_cap;                  /* entry array capacity (power of two) */
+    size_t gmap_value_size;           /* 0 until the first map_put */
     slop_gmap_entry_t* gmap_entries;
+    uint8_t* gmap_values;             /* gmap_cap values of gmap_value_size bytes */
+    uint32_t* gmap_index;             /* 2 * gmap_cap slots, see below */
+    slop_arena* gmap_arena;           /* owner of the arrays, or NULL for malloc */
 } slop_gmap_t;
 
-/* Create empty generic map */
-static inline void* map_empty(void) {
-    slop_gmap_t* m = (slop_gmap_t*)malloc(sizeof(slop_gmap_t));
+/* Index slot values; anything else is an entry number + 1 */
+#define SLOP_GMAP_EMPTY 0u
+#define SLOP_GMAP_DELETED UINT32_MAX
+
+static inline uint64_t _slop_gmap_hash(int64_t gmap_k) {
+    /* Fibonacci hashing; fold the high half down so the index mask sees it */
+    uint64_t h = (uint64_t)gmap_k * 0x9E3779B97F4A7C15ULL;
+    return h ^ (h >> 32);
+}
+
+static inline void* _slop_gmap_value(slop_gmap_t* m, size_t idx) {
+    return m->gmap_values + idx * m->gmap_value_size;
+}
+
+static inline void* _slop_gmap_alloc(slop_gmap_t* m, size_t size) {
+    return m->gmap_arena ? slop_arena_alloc(m->gmap_arena, size) : malloc(size);
+}
+
+static inline void* _slop_gmap_zalloc(slop_gmap_t* m, size_t size) {
+    void* ptr = _slop_gmap_alloc(m, size);
+    memset(ptr, 0, size);
+    return ptr;
+}
+
+static inline void _slop_gmap_release(slop_gmap_t* m, void* ptr) {
+    if (!m->gmap_arena) free(ptr);
+}
+
+/* Resize an array holding old_size bytes to new_size bytes */
+static inline void* _slop_gmap_resize(slop_gmap_t* m, void* ptr, size_t old_size, size_t new_size) {
+    if (!m->gmap_arena) return realloc(ptr, new_size);
+    void* grown = slop_arena_alloc(m->gmap_arena, new_size);
+    if (old_size) memcpy(grown, ptr, old_size);
+    return grown;
+}
+
+/* Rebuild the index for entries [0, gmap_used), dropping removed ones and
+ * growing when more than half of the entries are still live */
+static inline void _slop_gmap_rebuild(slop_gmap_t* m) {
+    size_t live = 0;
+    for (size_t idx = 0; idx < m->gmap_used; idx++) {
+        if (m->gmap_entries[idx].gmap_occupied) {
+            if (live != idx) {
+                m->gmap_entries[live] = m->gmap_entries[idx];
+                memcpy(_slop_gmap_value(m, live), _slop_gmap_value(m, idx), m->gmap_value_size);
+            }
+            live++;
+        }
+    }
+    m->gmap_used = live;
+    if (live * 2 >= m->gmap_cap) {
+        m->gmap_entries = (slop_gmap_entry_t*)_slop_gmap_resize(m, m->gmap_entries,
+            live * sizeof(slop_gmap_entry_t), 2 * m->gmap_cap * sizeof(slop_gmap_entry_t));
+        m->gmap_values = (uint8_t*)_slop_gmap_resize(m, m->gmap_values,
+            live * m->gmap_value_size, 2 * m->gmap_cap * m->gmap_value_size);
+        m->gmap_cap *= 2;
+    }
+    _slop_gmap_release(m, m->gmap_index);
+    size_t mask = m->gmap_cap * 2 - 1;
+    m->gmap_index = (uint32_t*)_slop_gmap_zalloc(m, (mask + 1) * sizeof(uint32_t));
+    for (size_t idx = 0; idx < live; idx++) {
+        size_t slot = _slop_gmap_hash(m->gmap_entries[idx].gmap_key) & mask;
+        while (m->gmap_index[slot] != SLOP_GMAP_EMPTY) slot = (slot + 1) & mask;
+        m->gmap_index[slot] = (uint32_t)(idx + 1);
+    }
+}
+
+/* Index slot holding gmap_k, or SIZE_MAX if the key is absent */
+static inline size_t _slop_gmap_find(slop_gmap_t* m, int64_t gmap_k) {
+    size_t mask = m->gmap_cap * 2 - 1;
+    size_t slot = _slop_gmap_hash(gmap_k) & mask;
+    for (;;) {
+        uint32_t ix = m->gmap_index[slot];
+        if (ix == SLOP_GMAP_EMPTY) return SIZE_MAX;
+        if (ix != SLOP_GMAP_DELETED && m->gmap_entries[ix - 1].gmap_key == gmap_k) return slot;
+        slot = (slot + 1) & mask;
+    }
+}
+
+/* Create an empty generic map in arena (or on the heap when arena is
+ * NULL); value_size is 0 to take it from the first map_put */
+static inline slop_gmap_t* slop_gmap_new(slop_arena* arena, size_t value_size) {
+    slop_gmap_t* m = (slop_gmap_t*)(arena ? slop_arena_alloc(arena, sizeof(slop_gmap_t))
+                                          : malloc(sizeof(slop_gmap_t)));
+    size_t cap = 1;
+    while (cap < SLOP_MAP_INITIAL_CAPACITY) cap *= 2;
+    m->gmap_arena = arena;
     m->gmap_len = 0;
-    m->gmap_cap = SLOP_MAP_INITIAL_CAPACITY;
-    m->gmap_entries = (slop_gmap_entry_t*)calloc(m->gmap_cap, sizeof(slop_gmap_entry_t));
+    m->gmap_used = 0;
+    m->gmap_cap = cap;
+    m->gmap_value_size = value_size;
+    m->gmap_entries = (slop_gmap_entry_t*)_slop_gmap_zalloc(m, cap * sizeof(slop_gmap_entry_t));
+    m->gmap_values = value_size ? (uint8_t*)_slop_gmap_alloc(m, cap * value_size) : NULL;
+    m->gmap_index = (uint32_t*)_slop_gmap_zalloc(m, cap * 2 * sizeof(uint32_t));
     return m;
 }
 
+/* Create empty generic map */
+static inline void* map_empty(void) {
+    return slop_gmap_new(NULL, 0);
+}
+
+/* Release a map from map_empty() and everything it stores (arena maps
+ * are released with their arena, so this does nothing for them) */
+static inline void map_free(void* gmap_ptr) {
+    slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
+    if (m->gmap_arena) return;
+    free(m->gmap_entries);
+    free(m->gmap_values);
+    free(m->gmap_index);
+    free(m);
+}
+
 /* Check if key exists - use unique param name to avoid shadowing */
 static inline bool map_has(void* gmap_ptr, int64_t gmap_lookup_key) {
-    slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
-        if (m->gmap_entries[idx].gmap_occupied && m->gmap_entries[idx].gmap_key == gmap_lookup_key) {
-            return true;
-        }
-    }
-    return false;
+    return _slop_gmap_find((slop_gmap_t*)gmap_ptr, gmap_lookup_key) != SIZE_MAX;
 }
 
 /* Remove key (returns map for functional style) */
 static inline void* map_remove(void* gmap_ptr, int64_t gmap_lookup_key) {
     slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
-        if (m->gmap_entries[idx].gmap_occupied && m->gmap_entries[idx].gmap_key == gmap_lookup_key) {
-            m->gmap_entries[idx].gmap_occupied = false;
-            return m;
-        }
+    size_t slot = _slop_gmap_find(m, gmap_lookup_key);
+    if (slot != SIZE_MAX) {
+        m->gmap_entries[m->gmap_index[slot] - 1].gmap_occupied = false;
+        m->gmap_index[slot] = SLOP_GMAP_DELETED;
+        m->gmap_len--;
     }
     return m;
 }
@@ -537,35 +905,57 @@ static inline void* map_remove(void* gmap_ptr, int64_t gmap_lookup_key) {
 static inline void* _slop_map_put_impl(void* gmap_ptr, int64_t gmap_k, const void* gmap_v, size_t gmap_vsz) {
     slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
 
+    if (m->gmap_value_size == 0) {
+        m->gmap_value_size = gmap_vsz;
+        m->gmap_values = (uint8_t*)_slop_gmap_alloc(m, m->gmap_cap * gmap_vsz);
+    }
+    /* Checked in every build: a value of another size would overrun its slot */
+    if (gmap_vsz != m->gmap_value_size) {
+        fprintf(stderr, "SLOP map_put: value of %zu bytes in a map of %zu-byte values\n",
+                gmap_vsz, m->gmap_value_size);
+        abort();
+    }
+
     /* Check if key exists - update in place */
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
-        if (m->gmap_entries[idx].gmap_occupied && m->gmap_entries[idx].gmap_key == gmap_k) {
-            memcpy(m->gmap_entries[idx].gmap_value, gmap_v, gmap_vsz);
-            m->gmap_entries[idx].gmap_value_size = gmap_vsz;
-            return m;
-        }
+    size_t slot = _slop_gmap_find(m, gmap_k);
+    if (slot != SIZE_MAX) {
+        memcpy(_slop_gmap_value(m, m->gmap_index[slot] - 1), gmap_v, gmap_vsz);
+        return m;
     }
 
     /* Add new entry */
-    if (m->gmap_len >= m->gmap_cap) {
-        size_t new_cap = m->gmap_cap * 2;
-        m->gmap_entries = (slop_gmap_entry_t*)realloc(m->gmap_entries, new_cap * sizeof(slop_gmap_entry_t));
-        memset(m->gmap_entries + m->gmap_cap, 0, (new_cap - m->gmap_cap) * sizeof(slop_gmap_entry_t));
-        m->gmap_cap = new_cap;
+    if (m->gmap_used == m->gmap_cap) {
+        _slop_gmap_rebuild(m);
+    }
+
+    size_t mask = m->gmap_cap * 2 - 1;
+    slot = _slop_gmap_hash(gmap_k) & mask;
+    while (m->gmap_index[slot] != SLOP_GMAP_EMPTY && m->gmap_index[slot] != SLOP_GMAP_DELETED) {
+        slot = (slot + 1) & mask;
     }
+    m->gmap_index[slot] = (uint32_t)(m->gmap_used + 1);
 
-    m->gmap_entries[m->gmap_len].gmap_key = gmap_k;
-    memcpy(m->gmap_entries[m->gmap_len].gmap_value, gmap_v, gmap_vsz);
-    m->gmap_entries[m->gmap_len].gmap_value_size = gmap_vsz;
-    m->gmap_entries[m->gmap_len].gmap_occupied = true;
+    m->gmap_entries[m->gmap_used].gmap_key = gmap_k;
+    m->gmap_entries[m->gmap_used].gmap_occupied = true;
+    memcpy(_slop_gmap_value(m, m->gmap_used), gmap_v, gmap_vsz);
+    m->gmap_used++;
     m->gmap_len++;
 
     return m;
 }
 
+/* Pointer to the value stored for a key, or NULL. Valid until the next
+ * map_put of a new key. */
+static inline void* _slop_map_get_ptr(void* gmap_ptr, int64_t gmap_k) {
+    slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
+    size_t slot = _slop_gmap_find(m, gmap_k);
+    return slot == SIZE_MAX ? NULL : _slop_gmap_value(m, m->gmap_index[slot] - 1);
+}
+
 /* Map get - returns Option-like struct matching generated types layout:
  * typedef struct { uint8_t tag; union { T some; } data; } slop_option_T;
- * We use a large enough buffer to hold any value type.
+ * Kept for code generated before the typed accessors below; values over
+ * 256 bytes need those.
  */
 typedef struct {
     uint8_t tag;
@@ -576,12 +966,11 @@ static inline slop_gmap_option_raw _slop_map_get_raw(void* gmap_ptr, int64_t gma
     slop_gmap_option_raw result = {1, {{0}}}; /* tag=1 means none */
     slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
 
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
-        if (m->gmap_entries[idx].gmap_occupied && m->gmap_entries[idx].gmap_key == gmap_k) {
-            result.tag = 0; /* tag=0 means some */
-            memcpy(result.data.some, m->gmap_entries[idx].gmap_value, m->gmap_entries[idx].gmap_value_size);
-            break;
-        }
+    void* value = _slop_map_get_ptr(m, gmap_k);
+    if (value) {
+        SLOP_PRE(m->gmap_value_size <= sizeof(result.data.some), "map value fits in 256 bytes");
+        result.tag = 0; /* tag=0 means some */
+        memcpy(result.data.some, value, m->gmap_value_size);
     }
     return result;
 }
@@ -593,19 +982,20 @@ typedef struct { uint8_t* data; size_t len; size_t cap; } slop_gmap_list;
 
 static inline slop_gmap_list _slop_map_values_raw(void* gmap_ptr, size_t value_size) {
     slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
-    size_t count = 0;
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
-        if (m->gmap_entries[idx].gmap_occupied) count++;
-    }
+    size_t count = m->gmap_len;
     if (count == 0) {
         return (slop_gmap_list){NULL, 0, 0};
     }
-    uint8_t* data = (uint8_t*)malloc(count * value_size);
+    uint8_t* data = (uint8_t*)_slop_gmap_alloc(m, count * value_size);
+    if (m->gmap_used == count) {
+        /* No removed entries: the values are already contiguous */
+        memcpy(data, m->gmap_values, count * value_size);
+        return (slop_gmap_list){data, count, count};
+    }
     size_t write_idx = 0;
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
+    for (size_t idx = 0; idx < m->gmap_used; idx++) {
         if (m->gmap_entries[idx].gmap_occupied) {
-            memcpy(data + (write_idx * value_size),
-                   m->gmap_entries[idx].gmap_value, value_size);
+            memcpy(data + (write_idx * value_size), _slop_gmap_value(m, idx), value_size);
             write_idx++;
         }
     }
@@ -615,16 +1005,13 @@ static inline slop_gmap_list _slop_map_values_raw(void* gmap_ptr, size_t value_s
 /* Map keys - returns list of all int64_t keys */
 static inline slop_list_int _slop_map_keys_raw(void* gmap_ptr) {
     slop_gmap_t* m = (slop_gmap_t*)gmap_ptr;
-    size_t count = 0;
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
-        if (m->gmap_entries[idx].gmap_occupied) count++;
-    }
+    size_t count = m->gmap_len;
     if (count == 0) {
         return (slop_list_int){0, 0, NULL};
     }
-    int64_t* data = (int64_t*)malloc(count * sizeof(int64_t));
+    int64_t* data = (int64_t*)_slop_gmap_alloc(m, count * sizeof(int64_t));
     size_t write_idx = 0;
-    for (size_t idx = 0; idx < m->gmap_len; idx++) {
+    for (size_t idx = 0; idx < m->gmap_used; idx++) {
         if (m->gmap_entries[idx].gmap_occupied) {
             data[write_idx++] = m->gmap_entries[idx].gmap_key;
         }
@@ -647,21 +1034,9 @@ static inline slop_gmap_list _slop_take_raw(slop_gmap_list lst, int64_t n) {
  * Define a macro that generates them for a given value type:
  */
 #define SLOP_MAP_OPS_DEFINE(V, OptName, ListName) \
-    static inline OptName map_get_##V(void* m, int64_t k) { \
-        slop_gmap_option_raw raw = _slop_map_get_raw(m, k); \
-        OptName result; \
-        result.tag = raw.tag; \
-        if (raw.tag == 0) memcpy(&result.data.some, raw.some, sizeof(V)); \
-        return result; \
-    } \
-    static inline ListName map_values_##V(void* m) { \
-        slop_gmap_list raw = _slop_map_values_raw(m, sizeof(V)); \
-        return (ListName){(V*)raw.data, raw.len, raw.cap}; \
-    } \
-    static inline ListName take_##V(int64_t n, ListName lst) { \
-        if ((size_t)n < lst.len) lst.len = (size_t)n; \
-        return lst; \
-    }
+    SLOP_MAP_GET_DEFINE(V, OptName) \
+    SLOP_MAP_VALUES_DEFINE(V, ListName) \
+    SLOP_TAKE_DEFINE(V, ListName)
 
 /*
  * Type-specific map operations are generated by the transpiler.
@@ -671,17 +1046,16 @@ static inline slop_gmap_list _slop_take_raw(slop_gmap_list lst, int64_t n) {
 
 #define SLOP_MAP_GET_DEFINE(V, OptType) \
     static inline OptType map_get_##V(void* m, int64_t k) { \
-        slop_gmap_option_raw raw = _slop_map_get_raw(m, k); \
         OptType result = {0}; \
-        result.has_value = (raw.tag == 0); \
-        if (raw.tag == 0) memcpy(&result.value, raw.data.some, sizeof(V)); \
+        V* v = (V*)_slop_map_get_ptr(m, k); \
+        if (v) { result.has_value = true; result.value = *v; } \
         return result; \
     }
 
 #define SLOP_MAP_VALUES_DEFINE(V, ListType) \
     static inline ListType map_values_##V(void* m) { \
         slop_gmap_list raw = _slop_map_values_raw(m, sizeof(V)); \
-        return (ListType){(V*)raw.data, raw.len, raw.cap}; \
+        return (ListType){ .data = (V*)raw.data, .len = raw.len, .cap = raw.cap }; \
     }
 
 #define SLOP_TAKE_DEFINE(V, ListType) \
@@ -690,6 +1064,63 @@ static inline slop_gmap_list _slop_take_raw(slop_gmap_list lst, int64_t n) {
         return lst; \
     }
 
+/* ============================================================
+ * Typed Integer-Keyed Map (generic via macro)
+ *
+ * Type-safe wrapper around the generic map for (Map K V) types with
+ * integer keys: values are copied at sizeof(V) with no intermediate
+ * buffer. Maps, and the lists _values and _keys return, live in the
+ * arena given to Name_new. SLOP_INT_MAP_DEFINE does both halves; the
+ * transpiler emits the typedef early (structs may hold the map before V
+ * is complete) and SLOP_INT_MAP_OPS_DEFINE once V is defined.
+ * ============================================================ */
+
+#define SLOP_INT_MAP_TYPEDEF(Name) \
+    typedef slop_gmap_t Name;
+
+#define SLOP_INT_MAP_OPS_DEFINE(K, V, Name, OptName, ListName) \
+    static inline Name* Name##_new(slop_arena* arena) { \
+        return (Name*)slop_gmap_new(arena, sizeof(V)); \
+    } \
+    \
+    static inline OptName Name##_get(Name* map, K key) { \
+        OptName result = {0}; \
+        V* v = (V*)_slop_map_get_ptr(map, (int64_t)key); \
+        if (v) { result.has_value = true; result.value = *v; } \
+        return result; \
+    } \
+    \
+    static inline V* Name##_get_ptr(Name* map, K key) { \
+        return (V*)_slop_map_get_ptr(map, (int64_t)key); \
+    } \
+    \
+    static inline void Name##_put(Name* map, K key, V value) { \
+        _slop_map_put_impl(map, (int64_t)key, &value, sizeof(V)); \
+    } \
+    \
+    static inline bool Name##_has(Name* map, K key) { \
+        return map_has(map, (int64_t)key); \
+    } \
+    \
+    static inline bool Name##_remove(Name* map, K key) { \
+        size_t len = map->gmap_len; \
+        map_remove(map, (int64_t)key); \
+        return map->gmap_len < len; \
+    } \
+    \
+    static inline ListName Name##_values(Name* map) { \
+        slop_gmap_list raw = _slop_map_values_raw(map, sizeof(V)); \
+        return (ListName){ .data = (V*)raw.data, .len = raw.len, .cap = raw.cap }; \
+    } \
+    \
+    static inline slop_list_int Name##_keys(Name* map) { \
+        return _slop_map_keys_raw(map); \
+    }
+
+#define SLOP_INT_MAP_DEFINE(K, V, Name, OptName, ListName) \
+    SLOP_INT_MAP_TYPEDEF(Name) \
+    SLOP_INT_MAP_OPS_DEFINE(K, V, Name, OptName, ListName)
+
 /* Generic take that works with any list type */
 #define take(n, lst) ({ \
     __auto_type _take_lst = (lst); \
@@ -0,0 +1,285 @@
+"""
+SLOP Timings - Phase instrumentation for the CLI pipeline
+
+Enabled by `slop --timings` (table on stderr), `slop --timings-trace
+FILE` (Chrome trace JSON, viewable in chrome://tracing or Perfetto) or
+the SLOP_TIMINGS environment variable (1 for the table, otherwise a
+file).
+
+Code marks the work it does with
+
+    with timings.phase('check', module='net'):
+        ...
+
+which costs one function call while timings are disabled (each() does
+the same for every iteration of a per-module loop). Each phase records:
+
+  wall      elapsed time
+  cpu       CPU time of this process (all threads)
+  child     CPU time of child processes reaped during the phase, i.e.
+            one-shot native tools and cc (main thread only). Long-lived
+            tool servers (see slop.toolserver) are read from /proc where
+            available.
+  rss       peak RSS of this process at the end of the phase
+
+Phases nest: a phase opened inside another is shown below it. step()
+starts a phase that lasts until the next step or the end of the
+enclosing phase.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class Event:
+    """One completed phase."""
+    name: str
+    module: Optional[str]
+    start: float          # seconds since the recorder started
+    wall: float           # seconds
+    cpu: Optional[float]  # seconds
+    child_cpu: Optional[float]
+    peak_rss_kb: Optional[int]
+    depth: int
+    thread: int
+    args: dict = field(default_factory=dict)
+
+
+@dataclass
+class _Open:
+    """A phase that has started but not finished."""
+    name: str
+    module: Optional[str]
+    pid: Optional[int]
+    args: dict
+    step: bool
+    start: float
+    cpu: float
+    children: Optional[float]
+    server: Optional[float]
+
+
+class Recorder:
+    """Collects phase events for one CLI invocation."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events: List[Event] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads = {threading.get_ident(): 0}
+        self._main_stack = self._stack()
+
+    def _stack(self) -> List[_Open]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _thread(self) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            return self._threads.setdefault(ident, len(self._threads))
+
+    def _open(self, name, module, pid, args, step) -> _Open:
+        # Children reaped by other threads would be counted too, so worker
+        # threads (e.g. parallel cc) only report wall time for their phases
+        main = threading.current_thread() is threading.main_thread()
+        frame = _Open(name, module, pid, args, step, time.perf_counter(),
+                      time.process_time(), _children_cpu() if main else None,
+                      _proc_cpu(pid) if pid else None)
+        self._stack().append(frame)
+        return frame
+
+    def _close(self) -> None:
+        stack = self._stack()
+        frame = stack.pop()
+        end = time.perf_counter()
+        child_cpu = None
+        if frame.server is not None:
+            after = _proc_cpu(frame.pid)
+            child_cpu = after - frame.server if after is not None else None
+        elif frame.children is not None:
+            child_cpu = _children_cpu() - frame.children
+        depth = len(stack)
+        if stack is not self._main_stack:
+            # Worker thread phases belong to whatever phase started them
+            depth += len(self._main_stack)
+        event = Event(frame.name, frame.module, frame.start - self.origin, end - frame.start,
+                      time.process_time() - frame.cpu, child_cpu, _peak_rss_kb(),
+                      depth, self._thread(), frame.args)
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def phase(self, name: str, module: Optional[str] = None, pid: Optional[int] = None,
+              **args):
+        frame = self._open(name, module, pid, args, step=False)
+        try:
+            yield
+        finally:
+            # Steps started inside this phase end with it
+            stack = self._stack()
+            while stack and stack[-1] is not frame:
+                self._close()
+            self._close()
+
+    def step(self, name: str, module: Optional[str] = None, **args) -> None:
+        stack = self._stack()
+        if stack and stack[-1].step:
+            self._close()
+        self._open(name, module, None, args, step=True)
+
+    def table(self) -> str:
+        """Events as an indented table, in the order the phases started."""
+        lines = [f"{'phase':<40} {'wall ms':>9} {'cpu ms':>9} {'child ms':>9} {'rss MB':>7}"]
+        for e in sorted(self.events, key=lambda e: (e.start, -e.wall)):
+            label = '  ' * e.depth + e.name + (f" [{e.module}]" if e.module else '')
+            child = f"{e.child_cpu * 1000:.1f}" if e.child_cpu is not None else '-'
+            rss = f"{e.peak_rss_kb / 1024:.1f}" if e.peak_rss_kb is not None else '-'
+            lines.append(f"{label:<40} {e.wall * 1000:>9.1f} {e.cpu * 1000:>9.1f} "
+                         f"{child:>9} {rss:>7}")
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Events in the Chrome trace event format (complete 'X' events)."""
+        trace = []
+        for e in self.events:
+            args = dict(e.args, cpu_ms=round(e.cpu * 1000, 3))
+            if e.module:
+                args['module'] = e.module
+            if e.child_cpu is not None:
+                args['child_cpu_ms'] = round(e.child_cpu * 1000, 3)
+            if e.peak_rss_kb is not None:
+                args['peak_rss_kb'] = e.peak_rss_kb
+            trace.append({
+                'name': e.name + (f" [{e.module}]" if e.module else ''),
+                'cat': 'slop', 'ph': 'X', 'pid': os.getpid(), 'tid': e.thread,
+                'ts': round(e.start * 1e6, 1), 'dur': round(e.wall * 1e6, 1),
+                'args': args,
+            })
+        trace.sort(key=lambda t: (t['tid'], t['ts']))
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+_recorder: Optional[Recorder] = None
+
+
+def enable() -> Recorder:
+    """Start recording phases for this process."""
+    global _recorder
+    _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+def recorder() -> Optional[Recorder]:
+    """The active recorder, or None while timings are disabled."""
+    return _recorder
+
+
+def phase(name: str, module: Optional[str] = None, pid: Optional[int] = None, **args):
+    """Context manager timing one phase; a no-op while timings are disabled.
+
+    Args:
+        name: Phase name, e.g. 'parse' or 'cc'
+        module: Module the phase works on, if any
+        pid: A long-lived child process whose CPU time the phase is spent
+            waiting for (counted as child time)
+        args: Extra values for the Chrome trace
+    """
+    if _recorder is None:
+        return nullcontext()
+    return _recorder.phase(name, module, pid, **args)
+
+
+def step(name: str, module: Optional[str] = None, **args) -> None:
+    """End the current step, if any, and start the next one.
+
+    Steps mark the successive stages of a long function without
+    re-indenting it. The last step ends with the enclosing phase.
+    """
+    if _recorder is not None:
+        _recorder.step(name, module, **args)
+
+
+def each(name: str, modules):
+    """Iterate over module names, timing each loop iteration as a phase.
+
+    For loops whose body is too long to wrap in `with phase(...)`.
+    """
+    if _recorder is None:
+        return iter(modules)
+    return _each(_recorder, name, modules)
+
+
+def _each(rec: Recorder, name: str, modules):
+    for module in modules:
+        with rec.phase(name, module):
+            yield module
+
+
+def report(destination: str) -> None:
+    """Write the recorded phases: '-' prints a table, anything else is a trace file."""
+    if _recorder is None:
+        return
+    if destination == '-':
+        print(_recorder.table(), file=sys.stderr)
+    else:
+        with open(destination, 'w') as f:
+            json.dump(_recorder.chrome_trace(), f, indent=1)
+        print(f"Timings written to {destination}", file=sys.stderr)
+
+
+def destination_from_env() -> Optional[str]:
+    """Where SLOP_TIMINGS asks for the report to go, if anywhere."""
+    value = os.environ.get('SLOP_TIMINGS', '')
+    if value in ('', '0'):
+        return None
+    return '-' if value == '1' else value
+
+
+def _children_cpu() -> Optional[float]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def _proc_cpu(pid: int) -> Optional[float]:
+    """CPU seconds used so far by a running process (Linux /proc only)."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # Fields after the parenthesized command name; utime and stime
+            # are fields 14 and 15 of the full line
+            fields = f.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
@@ -0,0 +1,213 @@
+"""
+SLOP Toolchain - Discovery of the native slop-parser/checker/transpiler
+
+find_component() probes the candidate locations for a binary once per
+process. Later calls only re-stat the binary that was found, and probe
+again if it disappeared or was rebuilt.
+
+Each resolved component records its path, size, mtime, version (from the
+component's slop.toml) and a content hash. Content hashes are stored in
+toolchain.json under the cache root (see slop.cache) when a disk cache
+is enabled. Each binary is then hashed once per build, not once per
+process. Entries are trusted only while the binary's size and mtime
+match.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+COMPONENTS = ('parser', 'checker', 'transpiler')
+
+# Repository root (this file is src/slop/toolchain.py)
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+HASH_CACHE_FILE = 'toolchain.json'
+
+
+@dataclass
+class NativeComponent:
+    """A resolved native toolchain binary."""
+    name: str
+    path: Path
+    size: int
+    mtime_ns: int
+    # lib/compiler/<name>, if the sources are available
+    source_dir: Optional[Path] = None
+    _sha256: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def sha256(self) -> str:
+        """Content hash of the binary, via the on-disk hash cache if enabled."""
+        if self._sha256 is None:
+            self._sha256 = _hash_binary(self)
+        return self._sha256
+
+    @property
+    def version(self) -> Optional[str]:
+        """Project version from the component's slop.toml."""
+        project, _ = self._config()
+        return project.version if project else None
+
+    def source_files(self) -> List[Path]:
+        """SLOP sources the binary is built from: its directory and includes."""
+        if self.source_dir is None:
+            return []
+        _, build = self._config()
+        dirs = [self.source_dir] + [(self.source_dir / inc).resolve()
+                                    for inc in (build.include if build else [])]
+        files = []
+        for d in dirs:
+            files.extend(sorted(d.glob('*.slop')))
+        return files
+
+    def newest_source(self) -> Optional[Tuple[Path, int]]:
+        """(path, mtime_ns) of the most recently modified source, if any."""
+        newest = None
+        for path in self.source_files():
+            mtime = path.stat().st_mtime_ns
+            if newest is None or mtime > newest[1]:
+                newest = (path, mtime)
+        return newest
+
+    @property
+    def stale(self) -> Optional[bool]:
+        """True if a source is newer than the binary, None if sources are unknown."""
+        newest = self.newest_source()
+        if newest is None:
+            return None
+        return newest[1] > self.mtime_ns
+
+    def _config(self):
+        from slop.providers import load_project_config
+        config = self.source_dir / 'slop.toml' if self.source_dir else None
+        if config is None or not config.exists():
+            return None, None
+        return load_project_config(str(config))
+
+    def to_dict(self) -> dict:
+        newest = self.newest_source()
+        return {
+            'name': self.name,
+            'path': str(self.path),
+            'version': self.version,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'sha256': self.sha256,
+            'source_dir': str(self.source_dir) if self.source_dir else None,
+            'newest_source': str(newest[0]) if newest else None,
+            'stale': self.stale,
+        }
+
+
+def candidate_paths(name: str) -> List[Path]:
+    """Locations searched for slop-<name>, in order of preference."""
+    binary_name = f"slop-{name}"
+    return [
+        PROJECT_ROOT / "bin" / binary_name,
+        Path.cwd() / binary_name,
+        Path.cwd() / "build" / binary_name,
+        # Native components built in lib/compiler/{name}/
+        Path.cwd() / "lib" / "compiler" / name / binary_name,
+    ]
+
+
+def _source_dir(name: str) -> Optional[Path]:
+    for root in (PROJECT_ROOT, Path.cwd()):
+        candidate = root / "lib" / "compiler" / name
+        if (candidate / "slop.toml").exists():
+            return candidate
+    return None
+
+
+# (name, cwd) -> resolved component, or None if not found
+_resolved: Dict[Tuple[str, Path], Optional[NativeComponent]] = {}
+_hash_cache_dir: Optional[Path] = None
+
+
+def set_hash_cache_dir(path: Optional[Path]) -> None:
+    """Keep binary content hashes in path/toolchain.json (None disables)."""
+    global _hash_cache_dir
+    _hash_cache_dir = Path(path) if path is not None else None
+
+
+def clear() -> None:
+    """Forget every component resolved by this process."""
+    _resolved.clear()
+
+
+def _discover(name: str) -> Optional[NativeComponent]:
+    for loc in candidate_paths(name):
+        try:
+            st = loc.stat()
+        except OSError:
+            continue
+        return NativeComponent(name, loc, st.st_size, st.st_mtime_ns, _source_dir(name))
+    return None
+
+
+def find_component(name: str) -> Optional[NativeComponent]:
+    """Resolve a native component, reusing this process's earlier result.
+
+    A cached hit costs one stat of the chosen binary. A binary that was
+    removed or rebuilt (size or mtime changed) is looked up again.
+    """
+    key = (name, Path.cwd())
+    if key in _resolved:
+        component = _resolved[key]
+        if component is None:
+            return None
+        try:
+            st = component.path.stat()
+        except OSError:
+            st = None
+        if st is not None and (st.st_size, st.st_mtime_ns) == (component.size, component.mtime_ns):
+            return component
+    component = _discover(name)
+    _resolved[key] = component
+    return component
+
+
+def _load_hashes() -> dict:
+    try:
+        with open(_hash_cache_dir / HASH_CACHE_FILE) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _hash_binary(component: NativeComponent) -> str:
+    key = str(component.path.resolve())
+    if _hash_cache_dir is not None:
+        entry = _load_hashes().get(key)
+        if (isinstance(entry, dict) and entry.get('size') == component.size
+                and entry.get('mtime_ns') == component.mtime_ns):
+            return entry['sha256']
+
+    h = hashlib.sha256()
+    with open(component.path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    # Never file a hash under the size/mtime of a different build
+    unchanged = (st.st_size, st.st_mtime_ns) == (component.size, component.mtime_ns)
+    if _hash_cache_dir is not None and unchanged:
+        hashes = _load_hashes()
+        hashes[key] = {'size': component.size, 'mtime_ns': component.mtime_ns, 'sha256': digest}
+        try:
+            _hash_cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=_hash_cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(hashes, f, indent=1, sort_keys=True)
+            os.replace(tmp, _hash_cache_dir / HASH_CACHE_FILE)
+        except OSError:
+            pass  # The cache is only an optimisation
+    return digest
@@ -0,0 +1,254 @@
+"""
+SLOP Tool Server - Long-lived native toolchain processes.
+
+slop-parser, slop-checker and slop-transpiler accept --serve, which keeps
+the process alive and answers one request per stdin line:
+
+    server -> "#ready"                 once, after startup
+    client -> "<path>\\t<path>...\\n"   files for one invocation
+    server -> <the tool's normal stdout>
+              "#done <status>"         status = the tool's exit code
+
+Binary output is framed as a "#bin <length>" line followed by that many
+raw bytes; the client drops the header, so the reply matches what a
+one-shot run writes.
+
+Anything the tool writes to stderr during a request is returned as
+that request's stderr: it is written before "#done", so it is already
+in the pipe when the marker arrives.
+
+(slop-parser answers in its --format json output by default; a request
+whose first path is --batch gets its keyed --batch result instead, and
+one starting with "--format bin" gets a binary AST per file.)
+
+Each request runs in a fresh arena, exactly like a one-shot invocation,
+so results are identical. Parsed files are kept between requests in a
+long-lived arena (lib/compiler/common/serve.slop) and reused while their
+size and modification time are unchanged, so besides process startup a
+request only pays for parsing the files that changed.
+
+Servers are kept for the lifetime of the Python process, one per binary
+and worker: a server answers one request at a time, so callers that
+run a tool concurrently pass each thread its own worker number.
+Binaries that predate --serve, or servers that die mid-request,
+transparently fall back to one subprocess per call. Set
+SLOP_NO_SERVER=1 to always use one-shot subprocesses.
+"""
+
+import atexit
+import os
+import selectors
+import subprocess
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+from slop import timings
+
+
+class ToolServerError(Exception):
+    """A tool server exited or broke the protocol."""
+    pass
+
+
+class ToolServer:
+    """One native tool running in --serve mode."""
+
+    READY = '#ready'
+    DONE = '#done '
+    BINARY = b'#bin '
+
+    def __init__(self, binary):
+        self.binary = str(binary)
+        self.proc: Optional[subprocess.Popen] = None
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+        # Start of the first line in _stdout not yet looked at
+        self._scan = 0
+
+    def start(self) -> bool:
+        """Launch the server, returning False if it does not speak the protocol."""
+        try:
+            proc = subprocess.Popen(
+                [self.binary, '--serve'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError:
+            return False
+        self.proc = proc
+        try:
+            ready = self._read_until(self.READY)
+        except ToolServerError:
+            ready = None
+        if ready is None or ready[0]:
+            # Older binaries treat --serve as a file name and exit
+            self.proc = None
+            proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+            return False
+        self._stderr.clear()
+        return True
+
+    def _read_until(self, marker: str) -> Tuple[bytes, str]:
+        """Read both pipes until a stdout line starts with marker.
+
+        Returns the stdout before that line and the rest of the line.
+        Both pipes are drained together, so a tool that writes a lot to
+        stderr cannot block on it while we wait for stdout.
+        """
+        prefix = marker.encode()
+        out, err = self.proc.stdout.fileno(), self.proc.stderr.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(out, selectors.EVENT_READ)
+            selector.register(err, selectors.EVENT_READ)
+            while True:
+                found = self._take_line(prefix)
+                if found is not None:
+                    return found
+                for key, _ in selector.select():
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        raise ToolServerError(f"{self.binary} exited during a request")
+                    (self._stdout if key.fd == out else self._stderr).extend(chunk)
+
+    def _take_line(self, prefix: bytes) -> Optional[Tuple[bytes, str]]:
+        """Split buffered stdout at the first complete line starting with prefix.
+
+        "#bin" headers on the way are removed and their payloads skipped
+        without being searched for lines.
+        """
+        while True:
+            start = self._scan
+            end = self._stdout.find(b'\n', start)
+            if end < 0:
+                return None
+            if self._stdout.startswith(self.BINARY, start):
+                size = int(self._stdout[start + len(self.BINARY):end])
+                if len(self._stdout) < end + 1 + size:
+                    return None
+                del self._stdout[start:end + 1]
+                self._scan = start + size
+            elif self._stdout.startswith(prefix, start):
+                before = bytes(self._stdout[:start])
+                line = self._stdout[start + len(prefix):end].decode()
+                del self._stdout[:end + 1]
+                self._scan = 0
+                return before, line
+            else:
+                self._scan = end + 1
+
+    def _drain_stderr(self) -> bytes:
+        """Return and clear the stderr written so far."""
+        err = self.proc.stderr.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(err, selectors.EVENT_READ)
+            while selector.select(timeout=0):
+                chunk = os.read(err, 65536)
+                if not chunk:
+                    break
+                self._stderr.extend(chunk)
+        data = bytes(self._stderr)
+        self._stderr.clear()
+        return data
+
+    def request(self, paths: Sequence[str], text: bool = True) -> subprocess.CompletedProcess:
+        """Run the tool over paths and return its output and status.
+
+        With text=False stdout and stderr are returned as bytes.
+        """
+        paths = [str(p) for p in paths]
+        if any('\t' in p or '\n' in p for p in paths):
+            raise ValueError("paths sent to a tool server cannot contain tabs or newlines")
+        with self._lock:
+            if self.proc is None or self.proc.poll() is not None:
+                raise ToolServerError(f"{self.binary} is not running")
+            try:
+                self.proc.stdin.write(('\t'.join(paths) + '\n').encode())
+                self.proc.stdin.flush()
+                stdout, status = self._read_until(self.DONE)
+                stderr = self._drain_stderr()
+                self.requests += 1
+                if text:
+                    stdout, stderr = stdout.decode(errors='replace'), stderr.decode(errors='replace')
+                return subprocess.CompletedProcess([self.binary] + paths, int(status), stdout, stderr)
+            except (OSError, ValueError) as e:
+                raise ToolServerError(f"{self.binary}: {e}") from e
+
+    def close(self) -> None:
+        if self.proc is None:
+            return
+        proc, self.proc = self.proc, None
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+_servers: Dict[Tuple[str, int], Optional[ToolServer]] = {}
+_servers_lock = threading.Lock()
+
+
+def get_server(binary, worker: int = 0) -> Optional[ToolServer]:
+    """Return the session's server for binary and worker, starting it on first use.
+
+    Returns None if the binary cannot serve or SLOP_NO_SERVER is set.
+    """
+    if os.environ.get('SLOP_NO_SERVER'):
+        return None
+    key = (str(binary), worker)
+    with _servers_lock:
+        if key not in _servers:
+            server = ToolServer(binary)
+            _servers[key] = server if server.start() else None
+        return _servers[key]
+
+
+def run_tool(binary, paths: Sequence[str], oneshot_args: Sequence[str] = (),
+             worker: int = 0, text: bool = True) -> subprocess.CompletedProcess:
+    """Run a native tool over paths, through its server when possible.
+
+    Equivalent to subprocess.run([binary, *oneshot_args, *paths],
+    capture_output=True, text=text); oneshot_args only apply to the
+    fallback (e.g. slop-parser's --format json, which --serve implies).
+    Concurrent callers should each pass a different worker so they get
+    their own server.
+    """
+    name = os.path.basename(str(binary))
+    server = get_server(binary, worker)
+    if server is not None:
+        try:
+            with timings.phase(name, pid=server.proc.pid if server.proc else None,
+                               files=len(paths), server=True):
+                return server.request(paths, text=text)
+        except ValueError:
+            pass
+        except ToolServerError:
+            # Forget the broken server; the one-shot run below reports
+            # whatever made it fail (including anything on stderr)
+            with _servers_lock:
+                _servers[(str(binary), worker)] = None
+            server.close()
+    with timings.phase(name, files=len(paths)):
+        return subprocess.run([str(binary)] + list(oneshot_args) + [str(p) for p in paths],
+                              capture_output=True, text=text)
+
+
+def shutdown() -> None:
+    """Stop all servers started by this process."""
+    with _servers_lock:
+        servers = [s for s in _servers.values() if s is not None]
+        _servers.clear()
+    for server in servers:
+        server.close()
+
+
+atexit.register(shutdown)
@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional, Set
 from slop.parser import SExpr, SList, Symbol, String, Number, is_form, parse, find_holes
 from slop.types import BUILTIN_FUNCTIONS
+from slop import timings
 
 
 class UnfilledHoleError(Exception):
@@ -87,6 +88,8 @@ class Transpiler:
         self.generated_thread_types: Set[str] = set()  # Track generated Thread<T> types: (type_name, result_c_type)
         self.generated_inline_records: Dict[str, str] = {}  # Track inline record types: type_name -> struct_body
         self.emitted_generated_types: Set[str] = set()  # Track which generated types have been emitted (to avoid duplicates)
+        self._deferred_map_accessors: Set[tuple] = set()  # String-keyed maps whose accessors wait for the value phase: (type_name, value_c_type)
+        self._deferred_int_map_ops: Set[tuple] = set()  # Integer-keyed maps whose ops wait for the value phase: (type_name, key_c_type, value_c_type)
         self.type_alias_defs: Dict[str, SExpr] = {}  # Track type alias definitions: alias_name -> underlying type expr
         self.union_variants: Dict[str, Dict[str, SExpr]] = {}  # Track union variant types: union_name -> {variant_tag -> payload_type_expr}
         self.union_variant_indices: Dict[str, Dict[str, int]] = {}  # Track union variant indices: union_name -> {variant_tag -> index}
@@ -365,6 +368,8 @@ class Transpiler:
                     return f"List[{elem_c_type}]"
                 # (Map K V) -> track as slop_map_K_V (C type name)
                 if op == 'Map' and len(type_expr) >= 3:
+                    if self._is_int_map_key(type_expr[1]):
+                        return f"{self._int_map_type(type_expr[2])}*"
                     key_c = self.to_c_type(type_expr[1])
                     val_c = self.to_c_type(type_expr[2])
                     key_id = self._type_to_identifier(key_c)
@@ -758,6 +763,42 @@ class Transpiler:
             result = 'int'
         return result
 
+    INT_MAP_KEY_TYPES = {'Int', 'I8', 'I16', 'I32', 'I64', 'U8', 'U16', 'U32', 'U64'}
+
+    def _is_int_map_key(self, key_type: SExpr) -> bool:
+        """Whether a Map with this key type uses the runtime's integer-keyed map."""
+        if isinstance(key_type, SList) and len(key_type) >= 1:
+            # Inline range: (Int 1 ..)
+            key_type = key_type[0]
+        if not isinstance(key_type, Symbol):
+            return False
+        if key_type.name in self.INT_MAP_KEY_TYPES:
+            return True
+        info = self.types.get(key_type.name)
+        return info is not None and info.is_range
+
+    def _int_map_type(self, value_type: SExpr) -> str:
+        """Register the typed integer-keyed map for a value type; returns its name.
+
+        All integer key types share one map per value type (keys are
+        stored as int64_t).
+        """
+        value_c = self.to_c_type(value_type)
+        value_id = self._type_to_identifier(value_c)
+        type_name = f"slop_map_int_{value_id}"
+        self.generated_map_types.add((type_name, 'int64_t', value_c))
+        self.generated_option_types.add((f"slop_option_{value_id}", value_c))
+        # For map-values
+        self.generated_list_types.add((f"slop_list_{value_id}", value_c))
+        return type_name
+
+    @staticmethod
+    def _int_map_name(map_type: Optional[str]) -> Optional[str]:
+        """The typed integer-keyed map name in an inferred map type, if any."""
+        if map_type and map_type.rstrip('*').startswith('slop_map_int_'):
+            return map_type.rstrip('*')
+        return None
+
     def _get_map_value_type_from_context(self) -> Optional[str]:
         """Get the value type for map_get from current return type context.
 
@@ -1335,6 +1376,8 @@ class Transpiler:
                 if op == 'map-new' and len(expr) >= 4:
                     key_type_expr = expr[2]
                     value_type_expr = expr[3]
+                    if self._is_int_map_key(key_type_expr):
+                        return f"{self._int_map_type(value_type_expr)}*"
                     key_c_type = self.to_c_type(key_type_expr)
                     value_c_type = self.to_c_type(value_type_expr)
                     value_id = self._type_to_identifier(value_c_type)
@@ -1365,6 +1408,7 @@ class Transpiler:
                     map_expr = expr[1]
                     map_type = self._infer_type(map_expr)
                     if map_type:
+                        map_type = map_type.rstrip('*')
                         # Extract value type from map type: slop_map_string_X -> X
                         if map_type.startswith('slop_map_string_'):
                             value_id = map_type[len('slop_map_string_'):]
@@ -1377,8 +1421,18 @@ class Transpiler:
                                 return f"slop_option_{value_id}"
                     return None
 
-                # Map keys: (map-keys map) -> List[String] (all SLOP maps are string-keyed)
+                # Map values of an integer-keyed map: (map-values map) -> List[value_type]
+                if op == 'map-values' and len(expr) >= 2:
+                    int_map = self._int_map_name(self._infer_type(expr[1]))
+                    for type_name, _, value_type in self.generated_map_types:
+                        if type_name == int_map:
+                            return f"List[{value_type}]"
+                    return None
+
+                # Map keys: (map-keys map) -> List[String], or List[Int] for integer keys
                 if op == 'map-keys':
+                    if len(expr) >= 2 and self._int_map_name(self._infer_type(expr[1])):
+                        return 'List[int64_t]'
                     return 'List[slop_string]'
 
                 # Dereference: (deref ptr) -> pointed-to type
@@ -1411,6 +1465,8 @@ class Transpiler:
                                     return f"List[{elem_c_type}]"
                                 # For map types, check if it's a typed map or generic
                                 if is_form(field_type, 'Map') and len(field_type) >= 3:
+                                    if self._is_int_map_key(field_type[1]):
+                                        return self.to_c_type(field_type)
                                     key_sym = field_type[1]
                                     value_c_type = self.to_c_type(field_type[2])
                                     value_id = self._type_to_identifier(value_c_type)
@@ -1447,7 +1503,8 @@ class Transpiler:
                     if is_form(ret_type, 'Map') and len(ret_type) >= 3:
                         c_type = self.to_c_type(ret_type)
                         # If it's a predefined typed map (slop_map_string_X), return that
-                        if c_type.startswith('slop_map_string_') and c_type != 'slop_map*':
+                        if self._int_map_name(c_type) or (
+                                c_type.startswith('slop_map_string_') and c_type != 'slop_map*'):
                             return c_type
                         # For generic maps (slop_map*), return Map[value_c_type] format
                         value_c_type = self.to_c_type(ret_type[2])
@@ -1738,6 +1795,15 @@ class Transpiler:
         for form in constants:
             self.transpile_const(form)
 
+        # FIRST PASS: Emit range types and simple aliases
+        # These must come before generated types like slop_list_Natural that reference them
+        # (and be known before scanning, since range-keyed maps use the integer map)
+        for form in types:
+            type_expr = form[2]
+            # Only process range types/aliases (not records, enums, unions)
+            if not is_form(type_expr, 'record') and not is_form(type_expr, 'enum') and not is_form(type_expr, 'union'):
+                self.transpile_type(form)
+
         # Pre-scan type definitions to discover needed generic types
         # This must happen BEFORE emitting struct definitions
         for form in types:
@@ -1746,20 +1812,17 @@ class Transpiler:
         # Pre-scan functions to discover needed generic types and track names
         for form in functions:
             self._scan_function_types(form)
+            self._scan_function_body_types(form)
             # Track function name
             if len(form) >= 2 and isinstance(form[1], Symbol):
                 self.defined_functions.add(form[1].name)
 
-        # FIRST PASS: Emit range types and simple aliases
-        # These must come before generated types like slop_list_Natural that reference them
-        for form in types:
-            type_expr = form[2]
-            # Only process range types/aliases (not records, enums, unions)
-            if not is_form(type_expr, 'record') and not is_form(type_expr, 'enum') and not is_form(type_expr, 'union'):
-                self.transpile_type(form)
-
         # SECOND: Emit List types first (they use pointers, so forward declarations are sufficient)
         # Then emit records, then Option types (which need full record definitions)
+        for form in types:
+            if is_form(form[2], 'record'):
+                qualified = self.to_qualified_type_name(form[1].name)
+                self.emit(f"typedef struct {qualified} {qualified};")
         self._emit_generated_types(phase='pointer')
 
         # THIRD PASS: Process records, enums, unions
@@ -4074,6 +4137,11 @@ class Transpiler:
                         if inferred:
                             map_type = inferred
 
+                    # Integer-keyed maps have typed accessors (SLOP_INT_MAP_OPS_DEFINE)
+                    int_map = self._int_map_name(map_type) or self._int_map_name(self._infer_type(map_var))
+                    if int_map:
+                        return f"{int_map}_get({m}, {key})"
+
                     # Extract value type from Map[V] format
                     if map_type and map_type.startswith('Map[') and map_type.endswith(']'):
                         value_type = map_type[4:-1]
@@ -4114,6 +4182,9 @@ class Transpiler:
                     # Try to infer map type from expression
                     map_expr = expr[1]
                     map_type = self._infer_type(map_expr)
+                    int_map = self._int_map_name(map_type)
+                    if int_map:
+                        return f"{int_map}_put({m}, {key}, {val})"
                     arena_expr = self._get_arena_from_expr(map_expr)
                     # Check for typed string-keyed maps (slop_map_string_string, slop_map_string_int)
                     if map_type and ('slop_map_string_string' in map_type or 'slop_map_string_int' in map_type):
@@ -4132,7 +4203,7 @@ class Transpiler:
                         val_type = self._infer_to_c_type(expr[3])
                         if val_type:
                             # Allocate on arena and store value, then put pointer
-                            return f"{{ {val_type}* _stored_val = ({val_type}*)slop_arena_alloc({arena_expr}, sizeof({val_type})); *_stored_val = {val}; slop_map_put({arena_expr}, {m}, {key}, _stored_val); }}"
+                            return f"{{ {val_type}* _stored_val = ({val_type}*)slop_map_value_alloc({arena_expr}, {m}, sizeof({val_type})); *_stored_val = {val}; slop_map_put({arena_expr}, {m}, {key}, _stored_val); }}"
                         return f"slop_map_put({arena_expr}, {m}, {key}, &({val}))"
                     # Fallback for generic maps - check if expression is already a pointer
                     # (deref ...) yields slop_map*, field access to Map field also yields pointer
@@ -4142,7 +4213,7 @@ class Transpiler:
                     val_type = self._infer_to_c_type(expr[3])
                     if val_type:
                         # Allocate on arena and store value, then put pointer
-                        return f"{{ {val_type}* _stored_val = ({val_type}*)slop_arena_alloc({arena_expr}, sizeof({val_type})); *_stored_val = {val}; slop_map_put({arena_expr}, {map_arg}, {key}, _stored_val); }}"
+                        return f"{{ {val_type}* _stored_val = ({val_type}*)slop_map_value_alloc({arena_expr}, {map_arg}, sizeof({val_type})); *_stored_val = {val}; slop_map_put({arena_expr}, {map_arg}, {key}, _stored_val); }}"
                     return f"slop_map_put({arena_expr}, {map_arg}, {key}, &({val}))"
 
                 if op == 'map-has':
@@ -4150,6 +4221,9 @@ class Transpiler:
                     key = self.transpile_expr(expr[2])
                     # Try to infer map type from expression
                     map_type = self._infer_type(expr[1])
+                    int_map = self._int_map_name(map_type)
+                    if int_map:
+                        return f"{int_map}_has({m}, {key})"
                     # Only use typed wrappers for predefined map types
                     if map_type and ('slop_map_string_string' in map_type or 'slop_map_string_int' in map_type):
                         base_type = map_type.rstrip('*')
@@ -4164,6 +4238,9 @@ class Transpiler:
                     m = self.transpile_expr(expr[1])
                     key = self.transpile_expr(expr[2])
                     map_type = self._infer_type(expr[1])
+                    int_map = self._int_map_name(map_type)
+                    if int_map:
+                        return f"{int_map}_remove({m}, {key})"
                     # For all string-keyed maps (including generic slop_map*), use slop_map_remove
                     if map_type and map_type.endswith('*'):
                         return f"slop_map_remove({m}, {key})"
@@ -4171,7 +4248,10 @@ class Transpiler:
 
                 if op == 'map-keys':
                     m = self.transpile_expr(expr[1])
-                    # In SLOP, all maps are string-keyed, so always use slop_map_keys
+                    int_map = self._int_map_name(self._infer_type(expr[1]))
+                    if int_map:
+                        return f"{int_map}_keys({m})"
+                    # Other maps are string-keyed, so use slop_map_keys
                     # Get arena from context (function param with arena field, or explicit arena in scope)
                     arena = self._get_arena_from_expr(expr[1])
                     # Check if map expression is a pointer - don't add & if already pointer
@@ -4192,6 +4272,9 @@ class Transpiler:
 
                 if op == 'map-values':
                     m = self.transpile_expr(expr[1])
+                    int_map = self._int_map_name(self._infer_type(expr[1]))
+                    if int_map:
+                        return f"{int_map}_values({m})"
                     # Use typed version: map_values_ValueType
                     value_type = self._get_list_element_type_from_context()
                     if value_type:
@@ -4372,6 +4455,8 @@ class Transpiler:
                     if len(expr) >= 4:
                         key_type_expr = expr[2]
                         value_type_expr = expr[3]
+                        if self._is_int_map_key(key_type_expr):
+                            return f"{self._int_map_type(value_type_expr)}_new({arena})"
                         value_c_type = self.to_c_type(value_type_expr)
                         value_id = self._type_to_identifier(value_c_type)
                         # String-keyed maps use specialized runtime functions only for predefined types
@@ -4546,7 +4631,8 @@ class Transpiler:
                         # Empty map
                         return "(slop_map){ .entries = NULL, .len = 0, .cap = 0 }"
 
-                    # Use static array for immutable map literal (safe to return from functions)
+                    # Use static array for immutable map literal (safe to return from functions);
+                    # cap 0 marks it unindexed, so the runtime scans it and copies it on first put
                     lit_name = f"_slop_lit_{self.literal_counter}"
                     self.literal_counter += 1
 
@@ -4555,7 +4641,7 @@ class Transpiler:
                     self.static_literals.append(
                         f"static slop_map_entry {lit_name}[] = {{{entries}}};"
                     )
-                    return f"(slop_map){{ .entries = {lit_name}, .len = {n}, .cap = {n} }}"
+                    return f"(slop_map){{ .entries = {lit_name}, .len = {n}, .cap = 0 }}"
 
                 # Union construction: (union-new Type Tag value?)
                 if op == 'union-new':
@@ -4875,6 +4961,8 @@ class Transpiler:
                 return type_name
 
             if head == 'Map':
+                if len(type_expr) > 2 and self._is_int_map_key(type_expr[1]):
+                    return f"{self._int_map_type(type_expr[2])}*"
                 key_type = self.to_c_type(type_expr[1])
                 value_type = self.to_c_type(type_expr[2]) if len(type_expr) > 2 else 'void*'
 
@@ -5072,7 +5160,9 @@ class Transpiler:
                         value_id = self._type_to_identifier(value_type)
                         # Only register typed map wrappers for predefined value types
                         # Custom value types use generic slop_map*
-                        if value_id in ('string', 'int'):
+                        if self._is_int_map_key(key_type_expr):
+                            self._int_map_type(value_type_expr)
+                        elif value_id in ('string', 'int'):
                             key_id = self._type_to_identifier(key_type)
                             type_name = f"slop_map_{key_id}_{value_id}"
                             self.generated_map_types.add((type_name, key_type, value_type))
@@ -5694,8 +5784,6 @@ class Transpiler:
                             # Mark typedef as emitted, but track that we need accessors later
                             self.emitted_generated_types.add(type_name)
                             # Add to set of maps needing deferred accessor emission
-                            if not hasattr(self, '_deferred_map_accessors'):
-                                self._deferred_map_accessors = set()
                             self._deferred_map_accessors.add((type_name, value_type))
                         else:
                             # Emit full macro - value type is simple/primitive/pointer
@@ -5712,14 +5800,15 @@ class Transpiler:
                             self.emit("#endif")
                             self.emitted_generated_types.add(type_name)
                     else:
-                        # For non-string keys, emit custom struct with guards
+                        # Integer keys use the generic map; its typed accessors are
+                        # emitted in value phase, once the value type is complete
                         guard = self._type_guard_name(type_name)
                         self.emit(f"#ifndef {guard}")
                         self.emit(f"#define {guard}")
-                        self.emit(f"typedef struct {{ {key_type} key; {value_type} value; bool occupied; }} {type_name}_entry;")
-                        self.emit(f"typedef struct {{ {type_name}_entry* entries; size_t len; size_t cap; }} {type_name};")
+                        self.emit(f"SLOP_INT_MAP_TYPEDEF({type_name})")
                         self.emit("#endif")
                         self.emitted_generated_types.add(type_name)
+                        self._deferred_int_map_ops.add((type_name, key_type, value_type))
                 # In value phase, emit accessor functions for deferred maps
                 if phase == 'value':
                     continue  # Skip - deferred accessors handled separately after all types
@@ -5881,7 +5970,7 @@ class Transpiler:
                     self.emitted_generated_types.add(type_name)
 
         # Emit deferred map accessor functions (after all value types are complete)
-        if phase == 'value' and hasattr(self, '_deferred_map_accessors'):
+        if phase == 'value' and self._deferred_map_accessors:
             for map_type_name, value_type in sorted(self._deferred_map_accessors):
                 if not emitted_any:
                     self.emit("/* Generated generic type definitions */")
@@ -5896,11 +5985,30 @@ class Transpiler:
                 # Emit the accessor functions using same pattern as SLOP_STRING_MAP_DEFINE
                 self.emit(f"static inline {map_type_name} {map_type_name}_new(slop_arena* arena, size_t cap) {{ return slop_map_new(arena, cap); }}")
                 self.emit(f"static inline {option_type} {map_type_name}_get({map_type_name}* map, slop_string key) {{ void* v = slop_map_get(map, key); if (v) return ({option_type}){{ .has_value = true, .value = *({value_type}*)v }}; return ({option_type}){{ .has_value = false }}; }}")
-                self.emit(f"static inline void {map_type_name}_put(slop_arena* arena, {map_type_name}* map, slop_string key, {value_type} value) {{ {value_type}* stored = ({value_type}*)slop_arena_alloc(arena, sizeof({value_type})); *stored = value; slop_map_put(arena, map, key, stored); }}")
+                self.emit(f"static inline void {map_type_name}_put(slop_arena* arena, {map_type_name}* map, slop_string key, {value_type} value) {{ {value_type}* stored = ({value_type}*)slop_map_value_alloc(arena, map, sizeof({value_type})); *stored = value; slop_map_put(arena, map, key, stored); }}")
                 self.emit(f"static inline bool {map_type_name}_has({map_type_name}* map, slop_string key) {{ return slop_map_get(map, key) != NULL; }}")
             # Clear the deferred set
             self._deferred_map_accessors.clear()
 
+        # Emit typed integer-keyed map operations (value types are complete here)
+        if phase == 'value' and self._deferred_int_map_ops:
+            for map_type_name, key_type, value_type in sorted(self._deferred_int_map_ops):
+                if not emitted_any:
+                    self.emit("/* Generated generic type definitions */")
+                    emitted_any = True
+                value_id = self._type_to_identifier(value_type)
+                option_type = f"slop_option_{value_id}"
+                if option_type not in self.RUNTIME_PREDEFINED_TYPES and option_type not in self.emitted_generated_types:
+                    self._emit_guarded_typedef(option_type,
+                        f"typedef struct {{ bool has_value; {value_type} value; }} {option_type};")
+                    self.emitted_generated_types.add(option_type)
+                guard = self._type_guard_name(f"{map_type_name}_ops")
+                self.emit(f"#ifndef {guard}")
+                self.emit(f"#define {guard}")
+                self.emit(f"SLOP_INT_MAP_OPS_DEFINE({key_type}, {value_type}, {map_type_name}, {option_type}, slop_list_{value_id})")
+                self.emit("#endif")
+            self._deferred_int_map_ops.clear()
+
         if emitted_any:
             self.emit("")
 
@@ -6334,12 +6442,17 @@ def transpile_multi(modules: dict, order: list) -> str:
     return '\n'.join(transpiler.output)
 
 
-def transpile_multi_split(modules: dict, order: list) -> dict:
+def transpile_multi_split(modules: dict, order: list, only: Optional[Set[str]] = None) -> dict:
     """Transpile multiple modules to separate header/implementation pairs.
 
     Args:
         modules: Dict mapping module name to ModuleInfo
         order: List of module names in topological order (dependencies first)
+        only: If given, generate code for these modules only. Earlier modules
+            in order are still scanned for the interface (types, enums,
+            function signatures) the later ones see, but their function
+            bodies are not transpiled; modules after the last one in only
+            are skipped.
 
     Returns:
         Dict mapping module_name -> (header_code, impl_code)
@@ -6347,6 +6460,9 @@ def transpile_multi_split(modules: dict, order: list) -> dict:
     from slop.parser import is_form, String
 
     results = {}
+    if only is not None:
+        wanted = [i for i, name in enumerate(order) if name in only]
+        order = order[:wanted[-1] + 1] if wanted else []
 
     # Accumulate enum definitions from all modules for cross-module lookup
     all_enums = {}
@@ -6361,7 +6477,21 @@ def transpile_multi_split(modules: dict, order: list) -> dict:
     # Accumulate type info for cross-module type lookups
     all_types = {}
 
-    for mod_name in order:
+    def accumulate(transpiler):
+        # Accumulate enum definitions for subsequent modules
+        all_enums.update(transpiler.enums)
+        # Accumulate type alias definitions for subsequent modules
+        all_type_alias_defs.update(transpiler.type_alias_defs)
+        # Accumulate function info for subsequent modules
+        all_functions.update(transpiler.functions)
+        # Accumulate record field info for subsequent modules
+        all_record_fields.update(transpiler.record_fields)
+        # Accumulate union variant info for subsequent modules
+        all_union_variants.update(transpiler.union_variants)
+        # Accumulate type info for subsequent modules
+        all_types.update(transpiler.types)
+
+    for mod_name in timings.each('transpile', order):
         info = modules[mod_name]
 
         # Create fresh transpiler for this module
@@ -6590,6 +6720,11 @@ def transpile_multi_split(modules: dict, order: list) -> dict:
         header_lines.append("")
         header_lines.append(f"#endif /* {guard_name} */")
 
+        if only is not None and mod_name not in only:
+            # Interface only: its types and signatures were registered above
+            accumulate(transpiler)
+            continue
+
         # ===== BUILD IMPLEMENTATION FILE =====
         impl_lines = []
         impl_lines.append(f'#include "slop_{c_mod_name}.h"')
@@ -6617,19 +6752,7 @@ def transpile_multi_split(modules: dict, order: list) -> dict:
             impl_lines.extend(transpiler.output)
 
         results[mod_name] = ('\n'.join(header_lines), '\n'.join(impl_lines))
-
-        # Accumulate enum definitions for subsequent modules
-        all_enums.update(transpiler.enums)
-        # Accumulate type alias definitions for subsequent modules
-        all_type_alias_defs.update(transpiler.type_alias_defs)
-        # Accumulate function info for subsequent modules
-        all_functions.update(transpiler.functions)
-        # Accumulate record field info for subsequent modules
-        all_record_fields.update(transpiler.record_fields)
-        # Accumulate union variant info for subsequent modules
-        all_union_variants.update(transpiler.union_variants)
-        # Accumulate type info for subsequent modules
-        all_types.update(transpiler.types)
+        accumulate(transpiler)
 
     return results
 
@@ -11,6 +11,7 @@ Performs compile-time type checking including:
 from dataclasses import dataclass, field
 from typing import Union, List, Dict, Optional, Tuple, Any, Set
 from slop.parser import SExpr, SList, Symbol, String, Number, is_form
+from slop import timings
 
 # Import all type classes and constants from the shared types module
 from slop.types import (
@@ -260,6 +261,7 @@ class TypeChecker:
         self.env.register_function('map-get', FnType((MapType(UNKNOWN, UNKNOWN), UNKNOWN), OptionType(UNKNOWN)))
         self.env.register_function('map-has', FnType((MapType(UNKNOWN, UNKNOWN), UNKNOWN), BOOL))
         self.env.register_function('map-keys', FnType((MapType(UNKNOWN, UNKNOWN),), ListType(UNKNOWN)))
+        self.env.register_function('map-values', FnType((MapType(UNKNOWN, UNKNOWN),), ListType(UNKNOWN)))
         self.env.register_function('map-remove', FnType((MapType(UNKNOWN, UNKNOWN), UNKNOWN), UNIT))
 
     def error(self, message: str, node: Optional[SExpr] = None, hint: Optional[str] = None):
@@ -2123,6 +2125,15 @@ class TypeChecker:
                 return ListType(map_type.pointee.key_type)
             return ListType(UNKNOWN)
 
+        # Special handling for map-values: (map-values map) -> (List V)
+        if fn_name == 'map-values' and len(args) == 1:
+            map_type = self.infer_expr(args[0])
+            if isinstance(map_type, PtrType):
+                map_type = map_type.pointee
+            if isinstance(map_type, MapType):
+                return ListType(map_type.value_type)
+            return ListType(UNKNOWN)
+
         # Special handling for map-remove: requires mutable map
         # (map-remove map key) -> Unit
         if fn_name == 'map-remove' and len(args) == 2:
@@ -2429,8 +2440,12 @@ class TypeChecker:
                             form
                         )
 
-    def check_module(self, ast: List[SExpr]) -> List[TypeDiagnostic]:
-        """Type check an entire module"""
+    def check_module(self, ast: List[SExpr], interface_only: bool = False) -> List[TypeDiagnostic]:
+        """Type check an entire module.
+
+        With interface_only, only collect types, constants and signatures
+        (enough for dependents) without checking function bodies.
+        """
         # Validate module structure first
         self._validate_module_structure(ast)
 
@@ -2465,6 +2480,9 @@ class TypeChecker:
             elif is_form(form, 'ffi'):
                 self._register_ffi_funcs(form)
 
+        if interface_only:
+            return self.diagnostics
+
         # Fourth pass: check function bodies
         for form in forms:
             if is_form(form, 'fn'):
@@ -2720,34 +2738,25 @@ def _find_project_config(start_path: 'Path') -> 'Optional[Path]':
     return None
 
 
-def check_file(path: str) -> List[TypeDiagnostic]:
-    """Type check a SLOP file.
+def _project_search_paths(file_path: 'Path', config_cache: Optional[dict] = None) -> 'List[Path]':
+    """Module search paths for a file.
 
-    If the file has imports, performs full module resolution to get
-    imported function signatures for accurate type checking.
-    Uses slop.toml configuration if found for module search paths.
+    In order: the include paths of the nearest slop.toml above the file
+    (or of ./slop.toml if that has none), then the file's directory and
+    its parent.
+
+    Args:
+        file_path: Resolved path of the .slop file
+        config_cache: Optional dict reused across calls, so each directory
+            is searched and each slop.toml read only once
     """
-    from slop.parser import parse_file, is_form
     from pathlib import Path
-    import sys
-
-    ast = parse_file(path)
-
-    # Check if file has imports
-    has_imports = any(
-        is_form(f, 'import') or
-        (is_form(f, 'module') and any(is_form(i, 'import') for i in f.items))
-        for f in ast
-    )
-
-    if has_imports:
-        # Use full module resolution to get imported signatures
-        from slop.resolver import ModuleResolver
-        from slop.providers import load_project_config
-
-        file_path = Path(path).resolve()
+    from slop.providers import load_project_config
 
-        # Build search paths from multiple sources
+    key = file_path.parent
+    if config_cache is not None and key in config_cache:
+        search_paths = list(config_cache[key])
+    else:
         search_paths = []
 
         # 1. Try to find project-local slop.toml by searching upward
@@ -2768,9 +2777,39 @@ def check_file(path: str) -> List[TypeDiagnostic]:
                 for p in build_cfg.include:
                     search_paths.append(Path(p).resolve())
 
-        # 3. Add parent directories as fallback
-        search_paths.extend([file_path.parent, file_path.parent.parent])
+        if config_cache is not None:
+            config_cache[key] = list(search_paths)
+
+    # 3. Add parent directories as fallback
+    search_paths.extend([file_path.parent, file_path.parent.parent])
+    return search_paths
+
 
+def check_file(path: str) -> List[TypeDiagnostic]:
+    """Type check a SLOP file.
+
+    If the file has imports, performs full module resolution to get
+    imported function signatures for accurate type checking.
+    Uses slop.toml configuration if found for module search paths.
+    """
+    from slop.parser import parse_file, is_form
+    from pathlib import Path
+    import sys
+
+    ast = parse_file(path)
+
+    # Check if file has imports
+    has_imports = any(
+        is_form(f, 'import') or
+        (is_form(f, 'module') and any(is_form(i, 'import') for i in f.items))
+        for f in ast
+    )
+
+    if has_imports:
+        # Use full module resolution to get imported signatures
+        from slop.resolver import ModuleResolver
+
+        search_paths = _project_search_paths(Path(path).resolve())
         resolver = ModuleResolver(search_paths)
         try:
             graph = resolver.build_dependency_graph(Path(path))
@@ -2794,6 +2833,90 @@ def check_file(path: str) -> List[TypeDiagnostic]:
         return checker.check_module(ast)
 
 
+def check_files(paths: List[str], jobs: Optional[int] = None,
+                resolver=None) -> Dict[str, List[TypeDiagnostic]]:
+    """Type check many SLOP files; the result for each matches check_file.
+
+    Unlike calling check_file in a loop, files are checked with a shared
+    ModuleResolver, so a module imported by many files is parsed once,
+    and each directory's slop.toml is read once. Imported modules are
+    only checked for their interface (as in incremental builds), not
+    re-checked in full for every importer.
+
+    With more than one job the files are checked in a process pool; each
+    worker process keeps its own resolver for the files it is given.
+
+    Args:
+        paths: .slop files to check
+        jobs: Worker processes (default: CPU count; 1 checks in-process)
+        resolver: ModuleResolver to use in-process, e.g. one the caller
+            already loaded the files with
+
+    Returns:
+        Dict mapping each path (as given) to its diagnostics. A file that
+        cannot be read or parsed gets a single error diagnostic.
+    """
+    import os
+    from pathlib import Path
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    if jobs == 1:
+        if resolver is None:
+            from slop.resolver import ModuleResolver
+            resolver = ModuleResolver()
+        config_cache: dict = {}
+        results = {}
+        for path in paths:
+            with timings.phase('check', module=Path(path).stem):
+                results[path] = _check_one(path, resolver, config_cache)
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor
+    with timings.phase('check pool', jobs=jobs, files=len(paths)), \
+            ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_check_worker, path) for path in paths]
+        return {path: future.result() for path, future in zip(paths, futures)}
+
+
+def _check_one(path: str, resolver, config_cache: dict) -> List[TypeDiagnostic]:
+    """check_file for check_files, parsing through a shared resolver."""
+    import sys
+    from pathlib import Path
+
+    file_path = Path(path).resolve()
+    try:
+        resolver.search_paths = _project_search_paths(file_path, config_cache)
+        info = resolver.load_module(file_path)
+    except Exception as e:
+        return [TypeDiagnostic('error', str(e), SourceLocation(path))]
+
+    if info.imports:
+        try:
+            graph = resolver.build_dependency_graph(file_path)
+            order = resolver.topological_sort(graph)
+            name = next((n for n, m in graph.modules.items() if m.path == file_path),
+                        file_path.stem)
+            # Imported modules only need their exports collected
+            results = check_modules(graph.modules, order,
+                                    interface_only=set(order) - {name})
+            return results.get(name, [])
+        except Exception as e:
+            print(f"warning: Module resolution failed ({e}), falling back to single-file check", file=sys.stderr)
+    return TypeChecker(path).check_module(info.ast)
+
+
+_worker_state = None
+
+
+def _check_worker(path: str) -> List[TypeDiagnostic]:
+    """Check one file in a check_files worker process."""
+    global _worker_state
+    if _worker_state is None:
+        from slop.resolver import ModuleResolver
+        _worker_state = (ModuleResolver(), {})
+    return _check_one(path, *_worker_state)
+
+
 def check_source(source: str, filename: str = "<string>") -> List[TypeDiagnostic]:
     """Type check SLOP source code"""
     from slop.parser import parse
@@ -2812,17 +2935,30 @@ def check_source_ast(ast: List, source_path: str = "<stdin>") -> List[TypeDiagno
     return checker.check_module(ast)
 
 
-def check_modules(modules: dict, order: list) -> Dict[str, List[TypeDiagnostic]]:
+def check_modules(modules: dict, order: list,
+                  interface_only: Optional[Set[str]] = None,
+                  jobs: int = 1) -> Dict[str, List[TypeDiagnostic]]:
     """Type check multiple modules in dependency order.
 
     Args:
         modules: Dict mapping module name to ModuleInfo (from resolver)
         order: List of module names in topological order (dependencies first)
+        interface_only: Modules whose bodies are known good (e.g. unchanged
+            since the last build); only their exports are collected and
+            they are omitted from the result
+        jobs: Worker processes (None: CPU count). With more than one, each
+            module is checked in a process pool as soon as all of its
+            imports have been; results and the resolved_type annotations
+            left on each module's AST are the same as checking in order.
 
     Returns:
         Dict mapping module_name to list of diagnostics
     """
-    from slop.parser import is_form, get_imports, parse_import
+    import os
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(order)))
+    if jobs > 1:
+        return _check_modules_parallel(modules, order, interface_only or set(), jobs)
 
     results: Dict[str, List[TypeDiagnostic]] = {}
     # Track exported function signatures for cross-module checking
@@ -2831,36 +2967,140 @@ def check_modules(modules: dict, order: list) -> Dict[str, List[TypeDiagnostic]]
 
     for mod_name in order:
         info = modules[mod_name]
-        checker = TypeChecker(str(info.path))
+        imported = _imported_exports(info, exported_sigs, exported_types)
 
-        # Register imported functions from already-checked modules
-        for imp in info.imports:
-            source_mod = imp.module_name
-            if source_mod in exported_sigs:
-                for fn_name in imp.symbols:
-                    if fn_name in exported_sigs[source_mod]:
-                        checker.env.register_import(fn_name, exported_sigs[source_mod][fn_name])
+        # Type check this module
+        if interface_only and mod_name in interface_only:
+            with timings.phase('check interface', module=mod_name):
+                _, sigs, types = _check_module(str(info.path), info.ast, info.exports,
+                                               imported, interface_only=True)
+        else:
+            with timings.phase('check', module=mod_name):
+                results[mod_name], sigs, types = _check_module(str(info.path), info.ast,
+                                                               info.exports, imported)
 
-            # Register imported types
-            if source_mod in exported_types:
-                for type_name, typ in exported_types[source_mod].items():
-                    checker.env.register_imported_type(type_name, typ)
+        exported_sigs[mod_name] = sigs
+        exported_types[mod_name] = types
 
-        # Type check this module
-        diagnostics = checker.check_module(info.ast)
-        results[mod_name] = diagnostics
+    return results
+
+
+def _imported_exports(info, exported_sigs: dict, exported_types: dict) -> list:
+    """What a module sees of its already-checked imports.
 
-        # Collect exported signatures for dependent modules
-        exported_sigs[mod_name] = {}
-        exported_types[mod_name] = {}
+    Returns one (function signatures, types) pair per import, in import
+    order; only the functions the import names are included.
+    """
+    imported = []
+    for imp in info.imports:
+        source_mod = imp.module_name
+        sigs = {}
+        if source_mod in exported_sigs:
+            for fn_name in imp.symbols:
+                if fn_name in exported_sigs[source_mod]:
+                    sigs[fn_name] = exported_sigs[source_mod][fn_name]
+        imported.append((sigs, exported_types.get(source_mod, {})))
+    return imported
+
+
+def _check_module(path: str, ast: List, exports: Set[str], imported: list,
+                  interface_only: bool = False) -> tuple:
+    """Check one module of check_modules against its imports' exports.
+
+    Returns (diagnostics, exported function signatures, exported types).
+    """
+    checker = TypeChecker(path)
 
-        for fn_name in info.exports:
-            if fn_name in checker.env.function_sigs:
-                exported_sigs[mod_name][fn_name] = checker.env.function_sigs[fn_name]
+    # Register imported functions and types from already-checked modules
+    for sigs, types in imported:
+        for fn_name, sig in sigs.items():
+            checker.env.register_import(fn_name, sig)
+        for type_name, typ in types.items():
+            checker.env.register_imported_type(type_name, typ)
 
-        # Export all types defined in this module
-        for type_name, typ in checker.env.type_registry.items():
-            if type_name not in checker.env.imported_types:
-                exported_types[mod_name][type_name] = typ
+    diagnostics = checker.check_module(ast, interface_only=interface_only)
 
-    return results
+    # Collect exported signatures for dependent modules
+    sigs = {fn_name: checker.env.function_sigs[fn_name]
+            for fn_name in exports if fn_name in checker.env.function_sigs}
+    # Export all types defined in this module
+    types = {type_name: typ for type_name, typ in checker.env.type_registry.items()
+             if type_name not in checker.env.imported_types}
+    return diagnostics, sigs, types
+
+
+# Modules being checked by _check_modules_parallel, in a worker process
+_pool_modules: dict = {}
+
+
+def _init_module_worker(modules: dict) -> None:
+    # Forked workers inherit modules without copying; spawned ones unpickle
+    # them once here rather than once per task
+    global _pool_modules
+    _pool_modules = modules
+
+
+def _check_module_worker(name: str, imported: list, interface_only: bool) -> tuple:
+    """_check_module in a worker process.
+
+    Returns its result plus the resolved_type annotations the check left
+    on the module's AST, as (node index, type) pairs in preorder.
+    """
+    info = _pool_modules[name]
+    result = _check_module(str(info.path), info.ast, info.exports, imported, interface_only)
+    annotations = [(i, node.resolved_type) for i, node in enumerate(_walk(info.ast))
+                   if node.resolved_type is not None]
+    return result + (annotations,)
+
+
+def _walk(ast: List):
+    """Every node of a module's AST, in preorder."""
+    stack = list(reversed(ast))
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, SList):
+            stack.extend(reversed(node.items))
+
+
+def _check_modules_parallel(modules: dict, order: list, interface_only: Set[str],
+                            jobs: int) -> Dict[str, List[TypeDiagnostic]]:
+    """check_modules on a process pool, scheduling modules by their imports."""
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    names = set(order)
+    waiting_on = {name: {imp.module_name for imp in modules[name].imports} & names - {name}
+                  for name in order}
+    results: Dict[str, List[TypeDiagnostic]] = {}
+    exported_sigs: Dict[str, Dict[str, FnType]] = {}
+    exported_types: Dict[str, Dict[str, Type]] = {}
+    running = {}
+
+    with timings.phase('check pool', jobs=jobs, modules=len(order)), \
+            ProcessPoolExecutor(max_workers=jobs, initializer=_init_module_worker,
+                                initargs=(modules,)) as pool:
+        while waiting_on or running:
+            # Submit in topological order so long dependency chains start first
+            for name in [n for n in order if n in waiting_on and not waiting_on[n]]:
+                imported = _imported_exports(modules[name], exported_sigs, exported_types)
+                future = pool.submit(_check_module_worker, name, imported,
+                                     name in interface_only)
+                running[future] = name
+                del waiting_on[name]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                diagnostics, sigs, types, annotations = future.result()
+                # Copy over the types the worker's checker left on its AST
+                nodes = list(_walk(modules[name].ast))
+                for i, typ in annotations:
+                    nodes[i].resolved_type = typ
+                if name not in interface_only:
+                    results[name] = diagnostics
+                exported_sigs[name] = sigs
+                exported_types[name] = types
+                for deps in waiting_on.values():
+                    deps.discard(name)
+
+    return {name: results[name] for name in order if name in results}
@@ -3,6 +3,7 @@ Pytest fixtures for SLOP test suite
 """
 
 import pytest
+import shutil
 import sys
 from pathlib import Path
 
@@ -12,6 +13,21 @@ if src_path.exists():
     sys.path.insert(0, str(src_path))
 
 
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", default=False,
+                     help="also run the wall-clock benchmarks (tests marked benchmark)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark tests unless --benchmark is given: timings are too noisy to gate on"""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def examples_dir():
     """Path to examples directory"""
@@ -34,3 +50,30 @@ def hello_source(examples_dir):
 def comprehensive_source():
     """Comprehensive transpiler test source"""
     return (Path(__file__).parent / "comprehensive.slop").read_text()
+
+
+def _build_native(tmp_path_factory, component):
+    """Build lib/compiler/<component> with the Python toolchain"""
+    if not shutil.which("cc"):
+        pytest.skip("No C compiler available")
+    from slop import cli
+    out = tmp_path_factory.mktemp("native")
+    binary = out / f"slop-{component}"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(Path(__file__).parent.parent / "lib" / "compiler" / component)
+        mp.setenv("SLOP_CACHE_DIR", str(out / "cache"))
+        mp.setattr(sys, 'argv', ['slop', 'build', '--python', '-o', str(binary)])
+        assert cli.main() == 0
+    return binary
+
+
+@pytest.fixture(scope="session")
+def native_parser(tmp_path_factory):
+    """slop-parser built from lib/compiler/parser with the Python toolchain"""
+    return _build_native(tmp_path_factory, "parser")
+
+
+@pytest.fixture(scope="session")
+def native_transpiler(tmp_path_factory):
+    """slop-transpiler built from lib/compiler/transpiler with the Python toolchain"""
+    return _build_native(tmp_path_factory, "transpiler")
@@ -0,0 +1,128 @@
+"""
+Native-vs-Python toolchain benchmark tests for SLOP
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from slop import bench, cli, toolchain
+from slop.parser import parse
+
+
+REPO_ROOT = Path(__file__).parent.parent
+HELLO = REPO_ROOT / "examples" / "hello.slop"
+
+
+class TestNormalization:
+    """Outputs of both toolchains reduce to the same comparable form"""
+
+    def test_quote_shorthand(self):
+        native = [{'type': 'List', 'line': 1, 'col': 0, 'items': [
+            {'type': 'Symbol', 'name': 'f', 'line': 1, 'col': 1},
+            {'type': 'List', 'line': 1, 'col': 3, 'items': [
+                {'type': 'Symbol', 'name': 'quote', 'line': 1, 'col': 3},
+                {'type': 'Symbol', 'name': 'ok', 'line': 1, 'col': 4}]},
+            {'type': 'Number', 'value': 2, 'is_float': False, 'line': 1, 'col': 7}]}]
+        assert [bench.shape_sexpr(f) for f in parse("(f 'ok 2)")] == \
+            bench.normalize_native('parse', json.dumps(native))
+
+    def test_check_keeps_error_lines(self):
+        stdout = json.dumps({'m': {'diagnostics': [
+            {'level': 'error', 'line': 9, 'col': 1, 'message': 'b'},
+            {'level': 'warning', 'line': 2, 'col': 1, 'message': 'w'},
+            {'level': 'error', 'line': 4, 'col': 1, 'message': 'a'}]}})
+        assert bench.normalize_native('check', stdout) == [4, 9]
+
+    def test_transpile_strips_module_prefix(self):
+        stdout = json.dumps({'my-mod': {
+            'header': "static inline my_mod_Age my_mod_Age_new(int64_t v) {\n}\n",
+            'impl': "int64_t my_mod_add(int64_t a, int64_t b) {\n}\n"
+                    "int main(void) {\n}\nint64_t my_mod_decl(void);\n"}})
+        assert bench.normalize_native('transpile', stdout) == ['Age_new', 'add', 'main']
+
+    def test_unparseable_output(self):
+        assert bench.normalize_native('parse', "Parse error at line 1") is None
+
+
+class TestRunBenchmark:
+    """Measurements and report layout"""
+
+    def test_measure(self):
+        run = bench.measure([sys.executable, '-c', 'print("hi"); x = bytearray(64 << 20)'])
+        assert run['status'] == 0 and run['stdout'].strip() == "hi"
+        assert run['wall_ms'] > 0
+        assert run['peak_rss_kb'] >= 64 << 10
+        assert bench.measure([sys.executable, '-c', 'raise SystemExit(3)'])['status'] == 3
+
+    def test_python_only(self):
+        report = bench.run_benchmark([HELLO], ['parse', 'transpile'],
+                                     binaries={'parser': None, 'transpiler': None},
+                                     root=REPO_ROOT)
+        [entry] = report['files']
+        assert entry['path'] == "examples/hello.slop"
+        for phase in ('parse', 'transpile'):
+            result = entry['phases'][phase]
+            assert result['python']['ok'] and result['native'] is None
+            assert result['equivalent'] is None
+            assert 'output' not in result['python']
+        assert report['summary']['parse']['compared'] == 0
+        assert report['summary']['parse']['speedup'] is None
+        json.dumps(report)
+
+    def test_parse_against_native(self, native_parser):
+        files = [HELLO, REPO_ROOT / "lib" / "compiler" / "parser" / "sexpr.slop"]
+        report = bench.run_benchmark(files, ['parse'], binaries={'parser': native_parser})
+        summary = report['summary']['parse']
+        assert summary['files'] == summary['compared'] == summary['equivalent'] == 2
+        assert summary['native_peak_rss_kb'] > 0
+        assert "parse" in bench.format_summary(report)
+
+    def test_differences_are_listed(self, tmp_path):
+        # A "native parser" that parses everything to nothing
+        fake = tmp_path / "slop-parser"
+        fake.write_text(f"#!{sys.executable}\nprint('[]')\n")
+        fake.chmod(0o755)
+        report = bench.run_benchmark([HELLO], ['parse'], binaries={'parser': fake})
+        assert report['files'][0]['phases']['parse']['equivalent'] is False
+        assert f"{HELLO} (parse)" in bench.format_summary(report)
+
+
+class TestBenchCommand:
+    """Test `slop bench toolchain`"""
+
+    @pytest.fixture
+    def no_native(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(toolchain, 'PROJECT_ROOT', tmp_path)
+        monkeypatch.chdir(tmp_path)
+        toolchain.clear()
+        yield
+        toolchain.clear()
+
+    def test_report_written(self, no_native, tmp_path, monkeypatch, capsys):
+        out = tmp_path / "report.json"
+        monkeypatch.setattr(sys, 'argv', ['slop', '--no-cache', 'bench', 'toolchain',
+                                          str(HELLO), '--phase', 'parse', '-o', str(out)])
+        assert cli.main() == 0
+        captured = capsys.readouterr()
+        assert "slop-parser not found" in captured.err
+        assert captured.out.startswith("phase")
+        report = json.loads(out.read_text())
+        assert report['version'] == bench.REPORT_VERSION
+        assert list(report['summary']) == ['parse']
+        assert report['native'] == {'parser': None}
+
+    def test_options_before_paths(self, no_native, tmp_path, monkeypatch, capsys):
+        # The documented `slop bench toolchain -o FILE PATHS` form
+        out = tmp_path / "report.json"
+        monkeypatch.setattr(sys, 'argv', ['slop', '--no-cache', 'bench', 'toolchain',
+                                          '-o', str(out), '--phase', 'parse', str(HELLO)])
+        assert cli.main() == 0
+        capsys.readouterr()
+        report = json.loads(out.read_text())
+        assert [entry['path'] for entry in report['files']] == [str(HELLO)]
+
+    def test_no_files(self, no_native, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, 'argv', ['slop', 'bench', 'toolchain', str(tmp_path)])
+        assert cli.main() == 1
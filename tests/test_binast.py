@@ -0,0 +1,257 @@
+"""
+Binary AST format tests for SLOP
+"""
+
+import json
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from slop.binast import decode_binary_ast, decode_binary_batch, BinaryAstError, BINAST_VERSION
+from slop import cli
+from slop.cli import _json_to_ast
+from slop.parser import parse, parse_file, Symbol, String, SList
+
+
+REPO_ROOT = Path(__file__).parent.parent
+BENCH_FILE = REPO_ROOT / "lib" / "compiler" / "transpiler" / "expr.slop"
+
+
+def encode(forms):
+    """Reference encoder mirroring lib/compiler/parser/binast.slop"""
+    out = [b'SLAB', struct.pack('<BI', BINAST_VERSION, len(forms))]
+    table = {}
+
+    def node(expr):
+        if isinstance(expr, SList):
+            out.append(struct.pack('<BIII', 0, expr.line, expr.col, len(expr.items)))
+            for item in expr.items:
+                node(item)
+        elif isinstance(expr, Symbol):
+            if expr.name in table:
+                out.append(struct.pack('<BIII', 2, expr.line, expr.col, table[expr.name]))
+            else:
+                table[expr.name] = len(table)
+                data = expr.name.encode()
+                out.append(struct.pack('<BIII', 1, expr.line, expr.col, len(data)) + data)
+        elif isinstance(expr, String):
+            data = expr.value.encode()
+            out.append(struct.pack('<BIII', 3, expr.line, expr.col, len(data)) + data)
+        elif isinstance(expr.value, float):
+            data = repr(expr.value).encode()
+            out.append(struct.pack('<BIII', 5, expr.line, expr.col, len(data)) + data)
+        else:
+            out.append(struct.pack('<BIIq', 4, expr.line, expr.col, expr.value))
+
+    for form in forms:
+        node(form)
+    return b''.join(out)
+
+
+def encode_batch(entries):
+    """Reference batch encoder: entries are (path, forms or error message)"""
+    out = [b'SLBB', struct.pack('<BI', BINAST_VERSION, len(entries))]
+    for path, result in entries:
+        data = path.encode()
+        out.append(struct.pack('<I', len(data)) + data)
+        if isinstance(result, str):
+            message = result.encode()
+            out.append(struct.pack('<BI', 1, len(message)) + message)
+        else:
+            out.append(b'\x00' + encode(result))
+    return b''.join(out)
+
+
+def shape(expr):
+    """Comparable view of a node including positions"""
+    if isinstance(expr, SList):
+        return ('list', expr.line, expr.col, [shape(item) for item in expr.items])
+    value = expr.name if isinstance(expr, Symbol) else expr.value
+    return (type(expr).__name__, value, expr.line, expr.col)
+
+
+class TestDecoder:
+    """Decode streams produced by the reference encoder"""
+
+    def test_roundtrip(self, rate_limiter_source):
+        forms = parse(rate_limiter_source)
+        decoded = decode_binary_ast(encode(forms))
+        assert [shape(f) for f in decoded] == [shape(f) for f in forms]
+
+    def test_scalars(self):
+        forms = parse('(f -7 2.5 "s\\"q" 9223372036854775807 sym)')
+        assert [shape(f) for f in decode_binary_ast(encode(forms))] == [shape(f) for f in forms]
+
+    def test_symbols_share_one_string(self):
+        decoded = decode_binary_ast(encode(parse("(let (let let))")))
+        names = [decoded[0].items[0].name, decoded[0].items[1].items[0].name,
+                 decoded[0].items[1].items[1].name]
+        assert all(name is names[0] for name in names)
+
+    def test_deep_nesting(self):
+        depth = 100_000
+        # (((...))) nested far beyond the recursion limit
+        forms = decode_binary_ast(b'SLAB' + struct.pack('<BI', BINAST_VERSION, 1)
+                                  + struct.pack('<BIII', 0, 1, 1, 1) * (depth - 1)
+                                  + struct.pack('<BIII', 0, 1, 1, 0))
+        expr, n = forms[0], 1
+        while expr.items:
+            expr, n = expr.items[0], n + 1
+        assert n == depth
+
+    def test_empty_file(self):
+        assert decode_binary_ast(encode([])) == []
+
+    @pytest.mark.parametrize("data", [
+        b'',
+        b'JSON\x01\x00\x00\x00\x00',
+        b'SLAB\x63\x00\x00\x00\x00',
+    ])
+    def test_bad_header(self, data):
+        with pytest.raises(BinaryAstError):
+            decode_binary_ast(data)
+
+    def test_truncated(self):
+        data = encode(parse("(module m (fn f () 1))"))
+        for cut in (len(data) - 1, len(data) - 9, 12):
+            with pytest.raises(BinaryAstError):
+                decode_binary_ast(data[:cut])
+
+    def test_batch(self):
+        forms = parse("(module m (fn f () 1))")
+        decoded = decode_binary_batch(encode_batch([
+            ("a.slop", forms), ("bad.slop", "Parse error at line 1, col 2: x"), ("b.slop", []),
+        ]))
+        assert list(decoded) == ["a.slop", "bad.slop", "b.slop"]
+        ast, success = decoded["a.slop"]
+        assert success and [shape(f) for f in ast] == [shape(f) for f in forms]
+        assert decoded["bad.slop"] == ("Parse error at line 1, col 2: x", False)
+        assert decoded["b.slop"] == ([], True)
+
+    def test_batch_truncated(self):
+        data = encode_batch([("a.slop", parse("(f 1)")), ("b.slop", "error")])
+        for cut in (len(data) - 1, len(data) - 7, 12):
+            with pytest.raises(BinaryAstError):
+                decode_binary_batch(data[:cut])
+        with pytest.raises(BinaryAstError):
+            decode_binary_batch(encode(parse("(f 1)")))
+
+    def test_bad_symbol_reference(self):
+        data = (b'SLAB' + struct.pack('<BI', BINAST_VERSION, 1)
+                + struct.pack('<BIII', 2, 1, 1, 5))
+        with pytest.raises(BinaryAstError):
+            decode_binary_ast(data)
+
+
+class TestNativeBinaryFormat:
+    """slop-parser --format bin against --format json"""
+
+    def _run(self, parser, fmt, path, text):
+        return subprocess.run([str(parser), '--format', fmt, str(path)],
+                              capture_output=True, text=text)
+
+    def test_matches_json_on_repository_sources(self, native_parser):
+        files = sorted(REPO_ROOT.glob("**/*.slop"))
+        assert files
+        for path in files:
+            as_json = self._run(native_parser, 'json', path, True)
+            as_bin = self._run(native_parser, 'bin', path, False)
+            assert as_bin.returncode == as_json.returncode, path
+            if as_json.returncode == 0:
+                expected = [shape(f) for f in _json_to_ast(json.loads(as_json.stdout))]
+                assert [shape(f) for f in decode_binary_ast(as_bin.stdout)] == expected, path
+
+    def test_batch_matches_single_files(self, native_parser, tmp_path):
+        bad = tmp_path / "bad.slop"
+        bad.write_text("(module bad (fn f (")
+        # Failing files in the middle must not stop the rest of the batch
+        files = [str(path) for path in sorted(REPO_ROOT.glob("**/*.slop"))]
+        files[1:1] = [str(bad), str(tmp_path / "missing.slop")]
+        result = subprocess.run([str(native_parser), '--format', 'bin', '--batch'] + files,
+                                capture_output=True)
+        assert result.returncode == 1
+        batch = decode_binary_batch(result.stdout)
+        assert list(batch) == files
+        for path in files:
+            single = self._run(native_parser, 'bin', path, False)
+            ast, success = batch[path]
+            if single.returncode == 0:
+                assert success, path
+                assert [shape(f) for f in ast] == \
+                    [shape(f) for f in decode_binary_ast(single.stdout)], path
+            else:
+                assert not success, path
+                assert ast == single.stdout.decode().strip()
+        assert batch[str(bad)][0].startswith("Parse error at line 1")
+
+    def test_json_batch_is_keyed_by_path(self, native_parser, tmp_path):
+        good = REPO_ROOT / "tests" / "multimod" / "src" / "base.slop"
+        missing = tmp_path / "missing.slop"
+        result = subprocess.run([str(native_parser), '--format', 'json', '--batch',
+                                 str(good), str(missing)], capture_output=True, text=True)
+        batch = json.loads(result.stdout)
+        single = self._run(native_parser, 'json', good, True)
+        assert batch == {
+            str(good): {'ast': json.loads(single.stdout)},
+            str(missing): {'error': f"Error: Could not open file: {missing}"},
+        }
+
+    def test_smaller_than_json(self, native_parser):
+        as_json = self._run(native_parser, 'json', BENCH_FILE, True).stdout
+        as_bin = self._run(native_parser, 'bin', BENCH_FILE, False).stdout
+        assert len(as_bin) < len(as_json)
+
+    @pytest.mark.benchmark
+    def test_decode_faster_than_json(self, native_parser):
+        as_json = self._run(native_parser, 'json', BENCH_FILE, True).stdout
+        as_bin = self._run(native_parser, 'bin', BENCH_FILE, False).stdout
+
+        def best_of(fn, runs=5):
+            best = float('inf')
+            for _ in range(runs):
+                start = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        json_time = best_of(lambda: _json_to_ast(json.loads(as_json)))
+        bin_time = best_of(lambda: decode_binary_ast(as_bin))
+        print(f"\n{BENCH_FILE.name}: json {len(as_json)} bytes {json_time * 1000:.2f}ms, "
+              f"binary {len(as_bin)} bytes {bin_time * 1000:.2f}ms "
+              f"({json_time / bin_time:.2f}x)")
+        assert bin_time < json_time
+
+    def test_parse_native_batch(self, native_parser, monkeypatch, tmp_path):
+        monkeypatch.setattr(cli, 'find_native_component', lambda name: native_parser)
+        good = str(REPO_ROOT / "tests" / "multimod" / "src" / "base.slop")
+        missing = str(tmp_path / "missing.slop")
+        batch = cli.parse_native_batch([good, missing])
+        assert batch[good][1]
+        assert [shape(f) for f in batch[good][0]] == [shape(f) for f in parse_file(good)]
+        assert batch[missing] == (f"Error: Could not open file: {missing}", False)
+
+    def test_parse_native_batch_matches_parse_file(self, native_parser, monkeypatch):
+        # Quoted symbols and bare record forms are normalized as parse_file
+        # does, and infix {...} lists get the Python parser's positions
+        monkeypatch.setattr(cli, 'find_native_component', lambda name: native_parser)
+        files = sorted((REPO_ROOT / "lib" / "compiler" / "checker").glob("*.slop"))
+        files.append(REPO_ROOT / "examples" / "fizzbuzz.slop")
+        batch = cli.parse_native_batch(files)
+        for path in files:
+            ast, success = batch[str(path)]
+            assert success, path
+            expected = parse_file(str(path))
+            assert repr(ast) == repr(expected), path
+            assert [shape(f) for f in ast] == [shape(f) for f in expected], path
+
+    def test_parser_without_batch(self, monkeypatch, tmp_path):
+        # Older parsers take --batch for a file name
+        old = tmp_path / "slop-parser"
+        old.write_text(f"#!{sys.executable}\n"
+                       "import sys\nprint('Error: Could not open file:', sys.argv[3])\nsys.exit(1)\n")
+        old.chmod(0o755)
+        monkeypatch.setattr(cli, 'find_native_component', lambda name: old)
+        assert cli.parse_native_batch(["a.slop"]) is None
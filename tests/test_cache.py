@@ -0,0 +1,297 @@
+"""
+On-disk cache tests for SLOP
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from slop import cli
+from slop.cache import BuildCache, ParseCache, interface_fingerprint
+from slop.parser import parse, parse_file, set_parse_cache
+
+
+MULTIMOD_DIR = Path(__file__).parent / "multimod"
+
+
+def _locations(expr, out):
+    out.append((type(expr).__name__, expr.line, expr.col))
+    if hasattr(expr, 'items'):
+        for item in expr.items:
+            _locations(item, out)
+    return out
+
+
+class TestParseCache:
+    """Test ParseCache storage, lookup and eviction"""
+
+    def test_roundtrip(self, tmp_path, rate_limiter_source):
+        cache = ParseCache(tmp_path)
+        ast = parse(rate_limiter_source)
+        assert cache.get(rate_limiter_source) is None
+        cache.put(rate_limiter_source, ast)
+
+        cached = cache.get(rate_limiter_source)
+        assert repr(cached) == repr(ast)
+        assert [_locations(f, []) for f in cached] == [_locations(f, []) for f in ast]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_keyed_by_content(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        cache.put("(a)", parse("(a)"))
+        assert cache.get("(b)") is None
+        assert repr(cache.get("(a)")) == "[(a)]"
+
+    def test_corrupt_entry_is_miss(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        cache.put("(a)", parse("(a)"))
+        entry = next(cache.dir.iterdir())
+        entry.write_bytes(b"not marshal data")
+        assert cache.get("(a)") is None
+        assert not entry.exists()
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        sources = [f"(fn f{i} () {i})" for i in range(3)]
+        for i, src in enumerate(sources):
+            cache.put(src, parse(src))
+            entry = cache._entry_path(src)
+            os.utime(entry, (1000 + i, 1000 + i))
+        entry_size = cache.stats().total_bytes // 3
+
+        # Touch the oldest entry, then shrink the budget to two entries
+        assert cache.get(sources[0]) is not None
+        cache.max_bytes = entry_size * 2 + 1
+        cache.put("(extra)", parse("(extra)"))
+
+        assert cache.get(sources[0]) is not None
+        assert cache.get(sources[1]) is None
+        assert cache.stats().total_bytes <= cache.max_bytes
+
+    def test_put_scans_only_when_over_budget(self, tmp_path, monkeypatch):
+        cache = ParseCache(tmp_path)
+        scans = []
+        entries = cache._entries
+        monkeypatch.setattr(cache, '_entries', lambda: scans.append(1) or entries())
+        for i in range(20):
+            cache.put(f"(f{i})", parse(f"(f{i})"))
+        assert len(scans) == 1
+
+        cache.max_bytes = cache.stats().total_bytes
+        del scans[:]
+        cache.put("(extra)", parse("(extra)"))
+        assert len(scans) == 1
+        assert cache.stats().total_bytes <= cache.max_bytes
+
+    def test_clear(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        cache.put("(a)", parse("(a)"))
+        cache.put("(b)", parse("(b)"))
+        assert cache.clear() == 2
+        assert cache.stats().entries == 0
+
+
+class TestParseFileCache:
+    """Test that parse_file consults the installed cache"""
+
+    @pytest.fixture
+    def installed_cache(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        previous = set_parse_cache(cache)
+        yield cache
+        set_parse_cache(previous)
+
+    def test_parse_file_populates_and_hits(self, tmp_path, installed_cache):
+        src = tmp_path / "m.slop"
+        src.write_text("(module m (fn f () 1))")
+        first = parse_file(str(src))
+        second = parse_file(str(src))
+        assert repr(first) == repr(second)
+        assert (installed_cache.hits, installed_cache.misses) == (1, 1)
+
+    def test_edit_invalidates(self, tmp_path, installed_cache):
+        src = tmp_path / "m.slop"
+        src.write_text("(a)")
+        parse_file(str(src))
+        src.write_text("(b)")
+        assert repr(parse_file(str(src))) == "[(b)]"
+
+
+class TestBuildCache:
+    """Test BuildCache manifest handling"""
+
+    def test_manifest_roundtrip(self, tmp_path):
+        cache = BuildCache("target", tmp_path)
+        cache.modules['m'] = {'source': 'abc', 'deps': {}, 'diagnostics': []}
+        cache.save()
+        assert BuildCache("target", tmp_path).modules == cache.modules
+
+    def test_targets_are_separate(self, tmp_path):
+        cache = BuildCache("one", tmp_path)
+        cache.modules['m'] = {}
+        cache.save()
+        assert BuildCache("two", tmp_path).modules == {}
+
+    def test_version_mismatch_discards_state(self, tmp_path):
+        cache = BuildCache("target", tmp_path)
+        cache.modules['m'] = {}
+        cache.manifest['version'] = BuildCache.VERSION + 1
+        cache.save()
+        assert BuildCache("target", tmp_path).modules == {}
+
+    def test_write_if_changed(self, tmp_path):
+        cache = BuildCache("target", tmp_path)
+        assert cache.write_if_changed("a.c", "int x;")
+        mtime = (cache.dir / "a.c").stat().st_mtime_ns
+        assert not cache.write_if_changed("a.c", "int x;")
+        assert (cache.dir / "a.c").stat().st_mtime_ns == mtime
+        assert cache.write_if_changed("a.c", "int y;")
+
+    def test_clean(self, tmp_path):
+        cache = BuildCache("target", tmp_path)
+        cache.write_if_changed("a.c", "int x;")
+        cache.modules['m'] = {}
+        cache.save()
+        cache.clean()
+        assert not cache.dir.exists()
+        assert BuildCache("target", tmp_path).modules == {}
+
+
+class TestInterfaceFingerprint:
+    """Test that fingerprints track only what importers can see"""
+
+    BASE = """
+    (module m
+      (export f)
+      (type Small (Int 0 .. 10))
+      (fn f ((x Int))
+        (@intent "Exported")
+        (@spec ((Int) -> Int))
+        (+ x 1))
+      (fn helper ((y Int))
+        (@spec ((Int) -> Int))
+        y))
+    """
+
+    def fingerprint(self, source):
+        exports = {'f', 'helper'} if "(export f helper)" in source else {'f'}
+        return interface_fingerprint(parse(source), exports)
+
+    @pytest.mark.parametrize("old, new", [
+        ("(+ x 1)", "(+ x 2)"),
+        ('(@intent "Exported")', '(@intent "Reworded")'),
+        ("(fn helper ((y Int))", "(fn helper ((y Int) (z Int))"),
+        ("(module m", "\n\n(module m"),
+    ])
+    def test_private_changes_keep_fingerprint(self, old, new):
+        assert self.fingerprint(self.BASE.replace(old, new)) == self.fingerprint(self.BASE)
+
+    @pytest.mark.parametrize("old, new", [
+        ("((Int) -> Int))\n        (+ x 1)", "((Int) -> Bool))\n        (+ x 1)"),
+        ("(Int 0 .. 10)", "(Int 0 .. 20)"),
+        ("(export f)", "(export f helper)"),
+    ])
+    def test_interface_changes_change_fingerprint(self, old, new):
+        changed = self.BASE.replace(old, new)
+        assert changed != self.BASE
+        assert self.fingerprint(changed) != self.fingerprint(self.BASE)
+
+
+class TestIncrementalBuild:
+    """Test that slop build only redoes work for changed modules"""
+
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        if not shutil.which("cc"):
+            pytest.skip("No C compiler available")
+        shutil.copytree(MULTIMOD_DIR / "src", tmp_path / "src")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("SLOP_CACHE_DIR", str(tmp_path / "cache"))
+        return tmp_path
+
+    def build(self, monkeypatch, capsys, *extra):
+        monkeypatch.setattr(sys, 'argv', ['slop', '-v', 'build', 'src/main.slop', '-o', 'out/app',
+                                          '--python', '-I', 'src', '-j', '2', *extra])
+        assert cli.main() == 0
+        return capsys.readouterr().out
+
+    def test_rebuild_only_changed_modules(self, project, monkeypatch, capsys):
+        out = self.build(monkeypatch, capsys)
+        assert "[main] rebuilding: not built before" in out
+        assert "Built out/app" in out
+
+        out = self.build(monkeypatch, capsys)
+        assert "4 unchanged module(s) skipped" in out
+        assert "out/app is up to date" in out
+
+        main_src = project / "src" / "main.slop"
+        main_src.write_text(main_src.read_text().replace('"HELLO"', '"HELLO AGAIN"'))
+        out = self.build(monkeypatch, capsys)
+        assert "[main] rebuilding: source changed" in out
+        assert "3 object file(s) up to date" in out
+        run = subprocess.run(["./out/app"], capture_output=True, text=True)
+        assert "HELLO AGAIN" in run.stdout
+
+    def test_build_verbose_flag(self, project, monkeypatch, capsys):
+        self.build(monkeypatch, capsys)
+        monkeypatch.setattr(sys, 'argv', ['slop', 'build', 'src/main.slop', '-o', 'out/app',
+                                          '--python', '-I', 'src', '-v'])
+        assert cli.main() == 0
+        out = capsys.readouterr().out
+        assert "[main] skipped: unchanged" in out
+
+    def test_body_edit_does_not_cascade(self, project, monkeypatch, capsys):
+        self.build(monkeypatch, capsys)
+        base_src = project / "src" / "base.slop"
+        base_src.write_text(base_src.read_text().replace("(* x x)", "(* x (+ x 0))"))
+        out = self.build(monkeypatch, capsys)
+        assert "[base] rebuilding: source changed" in out
+        assert "[math] skipped: base changed but not its interface" in out
+        assert "[main] skipped: base changed but not its interface" in out
+
+    def test_skipped_modules_keep_generated_code(self, project, monkeypatch, capsys):
+        # Printing an imported function's result needs the call's inferred
+        # type, which an interface-only check of main does not provide
+        math_src = project / "src" / "math.slop"
+        math_src.write_text(math_src.read_text().replace("(export add", "(export greeting add").replace(
+            "(fn add ", '(fn greeting ()\n    (@spec (() -> String))\n    "HELLO")\n\n  (fn add ', 1))
+        main_src = project / "src" / "main.slop"
+        main_src.write_text(main_src.read_text().replace("(import math (add", "(import math (greeting add")
+                            .replace('(println "HELLO")', "(println (greeting))"))
+        self.build(monkeypatch, capsys)
+        generated = {path.name: path.read_text()
+                     for path in (project / "cache" / "build").glob("*/slop_*.c")}
+        base_src = project / "src" / "base.slop"
+        base_src.write_text(base_src.read_text().replace("(* x x)", "(* x (+ x 0))"))
+        out = self.build(monkeypatch, capsys)
+        assert "3 object file(s) up to date" in out
+        for path in (project / "cache" / "build").glob("*/slop_*.c"):
+            if path.name != "slop_base.c":
+                assert path.read_text() == generated[path.name], path.name
+
+    def test_changed_generated_code_is_rebuilt(self, project, monkeypatch, capsys):
+        self.build(monkeypatch, capsys)
+        # As left behind by a build that failed after writing its sources
+        [impl] = (project / "cache" / "build").glob("*/slop_main.c")
+        impl.write_text(impl.read_text() + "#error stale\n")
+        out = self.build(monkeypatch, capsys)
+        assert "[main] rebuilding: generated C changed" in out
+        assert "#error" not in impl.read_text()
+
+    def test_interface_change_cascades(self, project, monkeypatch, capsys):
+        self.build(monkeypatch, capsys)
+        base_src = project / "src" / "base.slop"
+        base_src.write_text(base_src.read_text().replace(
+            "(type BaseError", "(type Extra (Int 0 .. 10))\n  (type BaseError"))
+        out = self.build(monkeypatch, capsys)
+        assert "[math] rebuilding: interface of base changed" in out
+        assert "[main] rebuilding: interface of math changed" in out
+
+    def test_rebuild_flag(self, project, monkeypatch, capsys):
+        self.build(monkeypatch, capsys)
+        out = self.build(monkeypatch, capsys, '--rebuild')
+        assert "not built before" in out
+        assert "Built out/app" in out
@@ -0,0 +1,160 @@
+"""
+Multi-file `slop check` tests
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from slop import cli
+from slop.resolver import ModuleResolver
+from slop.type_checker import check_file, check_files
+
+
+MULTIMOD_DIR = Path(__file__).parent / "multimod" / "src"
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+BAD = """(module bad
+  (fn f ((x Int))
+    (@intent "Return x")
+    (@spec ((Int) -> String))
+    x))
+"""
+
+
+@pytest.fixture
+def bad_file(tmp_path):
+    path = tmp_path / "bad.slop"
+    path.write_text(BAD)
+    return str(path)
+
+
+class TestCheckFiles:
+    """Test type checking many files at once"""
+
+    FILES = [str(MULTIMOD_DIR / name) for name in ("base.slop", "math.slop", "main.slop")] + \
+        [str(EXAMPLES / "hello.slop")]
+
+    def _strs(self, results):
+        return {path: [str(d) for d in diagnostics] for path, diagnostics in results.items()}
+
+    def test_matches_check_file(self, bad_file):
+        files = self.FILES + [bad_file]
+        expected = {path: [str(d) for d in check_file(path)] for path in files}
+        results = check_files(files, jobs=1)
+        assert list(results) == files
+        assert self._strs(results) == expected
+        assert any(d.severity == 'error' for d in results[bad_file])
+
+    def test_parallel_matches_sequential(self, bad_file):
+        files = self.FILES + [bad_file]
+        assert self._strs(check_files(files, jobs=2)) == self._strs(check_files(files, jobs=1))
+
+    def test_imports_parsed_once(self):
+        resolver = ModuleResolver()
+        check_files(self.FILES, jobs=1, resolver=resolver)
+        paths = [p.name for p in resolver.cache]
+        assert len(paths) == len(set(paths))
+        assert {"base.slop", "math.slop", "main.slop", "native.slop"} <= set(paths)
+
+    def test_unparseable_file(self, tmp_path):
+        broken = tmp_path / "broken.slop"
+        broken.write_text("(fn broken (")
+        missing = str(tmp_path / "missing.slop")
+        results = check_files([str(broken), missing], jobs=1)
+        for path in (str(broken), missing):
+            [diagnostic] = results[path]
+            assert diagnostic.severity == 'error'
+            assert diagnostic.location.file == path
+
+
+class TestCheckCommand:
+    """Test `slop check` with several paths, globs and --json"""
+
+    def run(self, monkeypatch, *argv):
+        monkeypatch.setattr(sys, 'argv', ['slop', '--no-cache', 'check', '--python', *argv])
+        return cli.main()
+
+    def test_single_file_output(self, monkeypatch, capsys):
+        assert self.run(monkeypatch, str(EXAMPLES / "hello.slop")) == 0
+        assert capsys.readouterr().out == "  Type checking...\n✓ All checks passed\n"
+
+    def test_directory(self, monkeypatch, capsys):
+        assert self.run(monkeypatch, str(MULTIMOD_DIR)) == 0
+        out = capsys.readouterr().out
+        assert "in 4 files" in out.splitlines()[-1]
+
+    def test_glob_and_errors(self, monkeypatch, capsys, bad_file, tmp_path):
+        (tmp_path / "good.slop").write_text((EXAMPLES / "hello.slop").read_text())
+        assert self.run(monkeypatch, str(tmp_path / "*.slop"), '-j', '1') == 1
+        out = capsys.readouterr().out
+        assert f"{bad_file}:" in out
+        assert out.splitlines()[-1].endswith("in 2 files")
+
+    def test_glob_without_matches(self, monkeypatch, capsys, tmp_path):
+        assert self.run(monkeypatch, str(tmp_path / "*.slop")) == 1
+        assert "No files match" in capsys.readouterr().err
+
+    def test_json(self, monkeypatch, capsys, bad_file):
+        hello = str(EXAMPLES / "hello.slop")
+        assert self.run(monkeypatch, '--json', hello, bad_file, hello) == 1
+        report = json.loads(capsys.readouterr().out)
+        assert list(report['files']) == [hello, bad_file]
+        assert report['files'][hello]['errors'] == 0
+        bad = report['files'][bad_file]
+        assert report['errors'] == bad['errors'] > 0
+        assert {'level', 'line', 'col', 'message'} == set(bad['diagnostics'][0])
+        assert any(d['level'] == 'error' and d['line'] > 0 for d in bad['diagnostics'])
+
+
+# Stand-in for slop-checker: reports its pid in a warning, an error for
+# paths containing "bad", and takes long enough that requests overlap
+FAKE_CHECKER = '''#!{python}
+import json, os, sys, time
+
+def check(path):
+    time.sleep(0.2)
+    diags = [{{"level": "warning", "line": 1, "col": 1, "message": str(os.getpid())}}]
+    if "bad" in path:
+        diags.append({{"level": "error", "line": 2, "col": 1, "message": "bad"}})
+    print(json.dumps({{"mod": {{"diagnostics": diags}}}}))
+    return 1 if "bad" in path else 0
+
+if sys.argv[1:] != ["--serve"]:
+    sys.exit(check(sys.argv[1]))
+print("#ready", flush=True)
+for line in sys.stdin:
+    status = check(line.rstrip("\\n"))
+    print("#done", status, flush=True)
+'''
+
+
+class TestCheckNative:
+    """Test `slop check` through native checker servers"""
+
+    @pytest.fixture
+    def checker(self, tmp_path, monkeypatch):
+        from slop import toolserver
+        monkeypatch.delenv('SLOP_NO_SERVER', raising=False)
+        path = tmp_path / "slop-checker"
+        path.write_text(FAKE_CHECKER.format(python=sys.executable))
+        path.chmod(0o755)
+        toolserver.shutdown()
+        yield path
+        toolserver.shutdown()
+
+    def test_parallel_keeps_order(self, checker, capsys):
+        paths = ["a.slop", "bad.slop", "c.slop", "d.slop"]
+        assert cli._check_native(checker, paths, as_json=True, jobs=2) == 1
+        report = json.loads(capsys.readouterr().out)
+        assert list(report['files']) == paths
+        assert report['files']['bad.slop']['errors'] == 1
+        pids = {f['diagnostics'][0]['message'] for f in report['files'].values()}
+        assert len(pids) == 2
+
+    def test_one_job_uses_one_server(self, checker, capsys):
+        paths = ["a.slop", "b.slop", "c.slop"]
+        assert cli._check_native(checker, paths, as_json=True, jobs=1) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert len({f['diagnostics'][0]['message'] for f in report['files'].values()}) == 1
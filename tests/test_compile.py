@@ -5,13 +5,17 @@ These tests verify that transpiled C code actually compiles
 with a real C compiler and executes correctly.
 """
 
+import json
 import shutil
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 
+from slop import cli
+from slop.cli import _compile_parallel, _transpile_native_to_dir
 from slop.transpiler import transpile
 
 
@@ -37,6 +41,43 @@ def runtime_path():
     return Path(__file__).parent.parent / "src" / "slop" / "runtime"
 
 
+INT_MAP_SOURCE = """\
+(type PetId (Int 1 ..))
+(type Pet (record (id PetId) (legs Int)))
+(type State (record (pets (Map PetId Pet))))
+
+(fn legs-of ((state (Ptr State)) (id PetId))
+  (@intent "Legs of a pet, or -1")
+  (@spec (((Ptr State) PetId) -> Int))
+  (match (map-get (. state pets) id)
+    ((some p) (. p legs))
+    ((none) -1)))
+
+(fn main ()
+  (@intent "Exercise integer-keyed maps")
+  (@spec (() -> Int))
+  (with-arena 4096
+    (let ((state (cast (Ptr State) (arena-alloc arena (sizeof State))))
+          (counts (map-new arena Int Int))
+          (mut total 0)
+          (mut legs 0))
+      (set! state pets (map-new arena PetId Pet))
+      (for (i 1 1001)
+        (map-put (. state pets) i (record-new Pet (id i) (legs (% i 5))))
+        (map-put counts (% i 7) i))
+      (map-remove (. state pets) 3)
+      (for-each (k (map-keys counts))
+        (set! total (+ total k)))
+      (for-each (p (map-values (. state pets)))
+        (set! legs (+ legs (. p legs))))
+      (if (and (== (legs-of state 4) 4) (== (legs-of state 3) -1)
+               (map-has (. state pets) 1000) (not (map-has counts 7))
+               (== total 21) (== legs 1997)
+               (== (list-len (map-values (. state pets))) 999))
+        0 1))))
+"""
+
+
 class TestCompileAndRun:
     """Test that transpiled C code compiles and runs correctly"""
 
@@ -125,3 +166,115 @@ class TestCompileAndRun:
             # hello.slop should return 0 and print "Hello, World!"
             assert run_result.returncode == 0
             assert "Hello" in run_result.stdout
+
+
+    def test_int_keyed_maps_compile_and_run(self, c_compiler, runtime_path, tmp_path):
+        """Maps keyed by Int and by a range type use the typed integer map"""
+        c_code = transpile(INT_MAP_SOURCE)
+        assert "SLOP_INT_MAP_OPS_DEFINE(int64_t, Pet, slop_map_int_Pet, slop_option_Pet, slop_list_Pet)" in c_code
+        assert "SLOP_INT_MAP_OPS_DEFINE(int64_t, int64_t, slop_map_int_int, slop_option_int, slop_list_int)" in c_code
+
+        c_file = tmp_path / "int_map.c"
+        exe_file = tmp_path / "int_map"
+        c_file.write_text(c_code)
+        compile_result = subprocess.run(
+            [c_compiler, "-O2", "-Wall", f"-I{runtime_path}", "-o", str(exe_file), str(c_file)],
+            capture_output=True,
+            text=True,
+        )
+        assert compile_result.returncode == 0, compile_result.stderr
+        assert "warning" not in compile_result.stderr
+
+        run_result = subprocess.run([str(exe_file)], capture_output=True, text=True)
+        assert run_result.returncode == 0
+
+
+class TestParallelCompile:
+    """Test per-module compilation through the worker pool"""
+
+    def test_objects_built_and_errors_grouped(self, c_compiler, tmp_path):
+        sources = {
+            'good-a': "int a(void) { return 1; }\n",
+            'bad': "int b(void) { return undeclared_name; }\n",
+            'good-b': "int c(void) { return 3; }\n",
+        }
+        commands = {}
+        for name, code in sources.items():
+            c_file = tmp_path / f"{name}.c"
+            c_file.write_text(code)
+            commands[name] = [c_compiler, "-c", "-o", str(tmp_path / f"{name}.o"), str(c_file)]
+
+        failures = _compile_parallel(commands, jobs=2)
+
+        assert list(failures) == ['bad']
+        assert "undeclared_name" in failures['bad']
+        assert (tmp_path / "good-a.o").exists()
+        assert (tmp_path / "good-b.o").exists()
+
+    def test_no_commands(self):
+        assert _compile_parallel({}) == {}
+
+
+# A transpiler that predates --out-dir: treats every argument as a file
+OLD_TRANSPILER = '''#!{python}
+import json
+print(json.dumps({{"m": {{"header": "", "impl": ""}}}}))
+'''
+
+
+class TestTranspileToDir:
+    """Test the native transpiler writing C sources into the build directory"""
+
+    SOURCES = [Path(__file__).parent / "multimod" / "src" / name
+               for name in ("base.slop", "math.slop")]
+
+    def test_files_match_json_output(self, native_transpiler, tmp_path, monkeypatch):
+        monkeypatch.setenv('SLOP_NO_SERVER', '1')
+        files = [str(path) for path in self.SOURCES]
+        written = _transpile_native_to_dir(native_transpiler, files, tmp_path)
+        assert written == {
+            'base': {'header': 'slop_base.h', 'impl': 'slop_base.c'},
+            'math': {'header': 'slop_math.h', 'impl': 'slop_math.c'},
+        }
+
+        result = subprocess.run([str(native_transpiler)] + files,
+                                capture_output=True, text=True)
+        for name, data in json.loads(result.stdout).items():
+            header = (tmp_path / written[name]['header']).read_text()
+            impl = (tmp_path / written[name]['impl']).read_text()
+            assert header == data['header']
+            assert impl == (f'#include "slop_runtime.h"\n#include "slop_{name}.h"\n\n'
+                            f'{data["impl"]}')
+
+    def test_old_transpiler_falls_back(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('SLOP_NO_SERVER', '1')
+        tool = tmp_path / "slop-transpiler"
+        tool.write_text(OLD_TRANSPILER.format(python=sys.executable))
+        tool.chmod(0o755)
+        assert _transpile_native_to_dir(tool, ["m.slop"], tmp_path) is None
+
+    def test_transpile_errors_are_raised(self, native_transpiler, tmp_path, monkeypatch):
+        monkeypatch.setenv('SLOP_NO_SERVER', '1')
+        bad = tmp_path / "bad.slop"
+        bad.write_text("(fn f (")
+        with pytest.raises(RuntimeError, match="Parse error at line 1"):
+            _transpile_native_to_dir(native_transpiler, [str(bad)], tmp_path)
+
+    def test_malformed_manifest_is_an_error(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('SLOP_NO_SERVER', '1')
+        tool = tmp_path / "slop-transpiler"
+        tool.write_text(f'#!{sys.executable}\nprint(\'{{"out_dir":"x","modules":\')\n')
+        tool.chmod(0o755)
+        with pytest.raises(RuntimeError, match="Malformed manifest"):
+            _transpile_native_to_dir(tool, ["m.slop"], tmp_path)
+
+    def test_transpile_command_writes_modules(self, native_transpiler, tmp_path,
+                                              monkeypatch, capsys):
+        monkeypatch.setattr(cli, 'find_native_component', lambda name: native_transpiler)
+        out = tmp_path / "out"
+        monkeypatch.setattr(sys, 'argv', ['slop', 'transpile', str(self.SOURCES[1]),
+                                          '-o', f"{out}/"])
+        assert cli.main() == 0
+        assert sorted(p.name for p in out.iterdir()) == [
+            'slop_base.c', 'slop_base.h', 'slop_math.c', 'slop_math.h']
+        assert f"Wrote {out}/slop_math.c" in capsys.readouterr().out
@@ -0,0 +1,121 @@
+"""
+Tests for converting the native parser's JSON AST to Python nodes
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from slop.cli import _json_to_ast
+from slop.parser import parse, Symbol, String, Number, SList
+
+
+REPO_ROOT = Path(__file__).parent.parent
+COMPILER_SOURCES = sorted((REPO_ROOT / "lib" / "compiler").glob("**/*.slop"))
+
+
+def to_json(expr):
+    """Encode a node the way `slop-parser --format json` does"""
+    if isinstance(expr, SList):
+        return {'type': 'List', 'items': [to_json(item) for item in expr.items],
+                'line': expr.line, 'col': expr.col}
+    if isinstance(expr, Symbol):
+        return {'type': 'Symbol', 'name': expr.name, 'line': expr.line, 'col': expr.col}
+    if isinstance(expr, String):
+        return {'type': 'String', 'value': expr.value, 'line': expr.line, 'col': expr.col}
+    return {'type': 'Number', 'value': expr.value, 'is_float': isinstance(expr.value, float),
+            'line': expr.line, 'col': expr.col}
+
+
+def recursive_json_to_ast(json_data):
+    """The previous recursive converter, kept as reference and baseline"""
+    if isinstance(json_data, list):
+        return [recursive_json_to_ast(item) for item in json_data]
+    t = json_data['type']
+    line = json_data.get('line', 0)
+    col = json_data.get('col', 0)
+    if t == 'Symbol':
+        return Symbol(json_data['name'], line, col)
+    elif t == 'String':
+        return String(json_data['value'], line, col)
+    elif t == 'Number':
+        return Number(json_data['value'], line, col)
+    elif t == 'List':
+        return SList([recursive_json_to_ast(item) for item in json_data['items']], line, col)
+    raise ValueError(f"Unknown AST node type: {t}")
+
+
+def shape(expr):
+    if isinstance(expr, SList):
+        return ('list', expr.line, expr.col, [shape(item) for item in expr.items])
+    value = expr.name if isinstance(expr, Symbol) else expr.value
+    return (type(expr).__name__, value, expr.line, expr.col)
+
+
+def compiler_json():
+    """JSON text for every compiler source, as the native parser emits it"""
+    return [json.dumps([to_json(form) for form in parse(path.read_text())])
+            for path in COMPILER_SOURCES]
+
+
+class TestJsonToAst:
+    """Iterative converter against the recursive reference"""
+
+    def test_matches_reference_on_compiler_sources(self):
+        assert COMPILER_SOURCES
+        for text in compiler_json():
+            data = json.loads(text)
+            assert ([shape(f) for f in _json_to_ast(data)]
+                    == [shape(f) for f in recursive_json_to_ast(data)])
+
+    def test_single_node(self):
+        node = {'type': 'Symbol', 'name': 'x', 'line': 3, 'col': 4}
+        assert shape(_json_to_ast(node)) == ('Symbol', 'x', 3, 4)
+        empty = {'type': 'List', 'items': []}
+        assert shape(_json_to_ast(empty)) == ('list', 0, 0, [])
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 5
+        node = {'type': 'List', 'items': []}
+        for _ in range(depth - 1):
+            node = {'type': 'List', 'items': [node]}
+        with pytest.raises(RecursionError):
+            recursive_json_to_ast(node)
+        expr, n = _json_to_ast(node), 1
+        while expr.items:
+            expr, n = expr.items[0], n + 1
+        assert n == depth
+
+    def test_symbols_interned(self):
+        forms = _json_to_ast(json.loads(json.dumps([to_json(f) for f in parse("(let (let))")])))
+        assert forms[0].items[0].name is forms[0].items[1].items[0].name
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError):
+            _json_to_ast([{'type': 'List', 'items': [{'type': 'Bogus'}]}])
+
+
+@pytest.mark.benchmark
+class TestJsonToAstBenchmark:
+    """Iterative vs. recursive conversion of the compiler's own sources"""
+
+    def _best_of(self, convert, docs, runs=3):
+        best = float('inf')
+        for _ in range(runs):
+            start = time.perf_counter()
+            for doc in docs:
+                convert(doc)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_not_slower_than_recursive(self):
+        docs = [json.loads(text) for text in compiler_json()]
+        recursive_time = self._best_of(recursive_json_to_ast, docs)
+        iterative_time = self._best_of(_json_to_ast, docs)
+        print(f"\n{len(docs)} compiler sources: recursive {recursive_time * 1000:.1f}ms, "
+              f"iterative {iterative_time * 1000:.1f}ms "
+              f"({recursive_time / iterative_time:.2f}x)")
+        # Generous margin: timing noise on shared CI machines
+        assert iterative_time < recursive_time * 1.25
@@ -0,0 +1,93 @@
+"""
+Lexer tests for SLOP
+
+The hand-written scanner (Lexer) must produce exactly the same token
+stream as the reference regex lexer (RegexLexer), including error
+positions.
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+from slop.parser import Lexer, RegexLexer, ParseError
+
+
+REPO_ROOT = Path(__file__).parent.parent
+BENCH_FILE = REPO_ROOT / "lib" / "compiler" / "transpiler" / "expr.slop"
+
+
+def tokenize_or_error(lexer_cls, source):
+    """Tokenize source, returning the error position instead of raising."""
+    try:
+        return lexer_cls(source).tokenize()
+    except ParseError as e:
+        return ('error', e.message, e.line, e.col)
+
+
+class TestScannerMatchesRegexLexer:
+    """Differential tests against the regex lexer"""
+
+    @pytest.mark.parametrize("source", [
+        "",
+        "(foo bar)",
+        "; only a comment",
+        "(a ; trailing\n b)",
+        '"multi\nline\nstring" after',
+        '"escaped \\" quote" "tab\\t"',
+        "-7 -x -> 3.14 1..5 1.",
+        "(Int 0 .. 150)",
+        "'sym :keyword $result @intent",
+        "{x >= 0 and y != 1}",
+        "a.b . .. ... +-5 --5",
+        "\x0b\x0c(x) y",
+        "٣٤",
+        "(foo # bar)",
+        '"unterminated',
+        "(a\r\n  b)",
+    ])
+    def test_edge_cases(self, source):
+        assert tokenize_or_error(Lexer, source) == tokenize_or_error(RegexLexer, source)
+
+    def test_repository_sources(self):
+        """Every .slop file in the repository tokenizes identically"""
+        files = sorted(REPO_ROOT.glob("**/*.slop"))
+        assert files
+        for path in files:
+            source = path.read_text()
+            assert tokenize_or_error(Lexer, source) == tokenize_or_error(RegexLexer, source), path
+
+    def test_comments_not_materialized(self):
+        tokens = Lexer("; header\n(a) ; tail").tokenize()
+        assert [t[0] for t in tokens] == ['LPAREN', 'SYMBOL', 'RPAREN']
+
+    def test_line_col_tracking(self):
+        tokens = Lexer('(a\n  "x\ny" b)').tokenize()
+        assert tokens == [
+            ('LPAREN', '(', 1, 1),
+            ('SYMBOL', 'a', 1, 2),
+            ('STRING', '"x\ny"', 2, 3),
+            ('SYMBOL', 'b', 3, 4),
+            ('RPAREN', ')', 3, 5),
+        ]
+
+
+@pytest.mark.benchmark
+class TestLexerBenchmark:
+    """Scanner vs. regex lexer on the native transpiler's expression module"""
+
+    def _best_of(self, lexer_cls, source, runs=5):
+        best = float('inf')
+        for _ in range(runs):
+            start = time.perf_counter()
+            lexer_cls(source).tokenize()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_scanner_faster_than_regex(self):
+        source = BENCH_FILE.read_text()
+        regex_time = self._best_of(RegexLexer, source)
+        scan_time = self._best_of(Lexer, source)
+        print(f"\n{BENCH_FILE.name}: regex {regex_time * 1000:.2f}ms, "
+              f"scanner {scan_time * 1000:.2f}ms ({regex_time / scan_time:.2f}x)")
+        assert scan_time < regex_time
@@ -2,8 +2,13 @@
 Parser tests for SLOP
 """
 
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List
+
 import pytest
-from slop.parser import parse, parse_file, pretty_print, find_holes, is_form, SList, Symbol, Number, String, ParseError
+from slop.parser import parse, parse_file, parse_iter, pretty_print, find_holes, is_form, SList, Symbol, Number, String, ParseError
 
 
 class TestBasicParsing:
@@ -391,3 +396,131 @@ class TestInfixContracts:
             assert is_form(eq, '==')
             arith = eq[1]
             assert is_form(arith, op), f"Failed for operator {op}"
+
+
+class TestStreamingParse:
+    """Test parse_iter and header-only parsing"""
+
+    def test_yields_forms_lazily(self):
+        forms = parse_iter("(a 1) (b 2) (c 3)")
+        first = next(forms)
+        assert is_form(first, 'a')
+        assert [f[0].name for f in forms] == ['b', 'c']
+
+    def test_matches_parse(self, rate_limiter_source):
+        assert repr(list(parse_iter(rate_limiter_source))) == repr(parse(rate_limiter_source))
+
+    def test_error_deferred_until_reached(self):
+        forms = parse_iter("(ok) (bad # char)")
+        assert is_form(next(forms), 'ok')
+        with pytest.raises(ParseError):
+            next(forms)
+
+    def test_path_input(self, examples_dir):
+        path = examples_dir / "hello.slop"
+        assert repr(list(parse_iter(path))) == repr(parse_file(str(path)))
+
+    def test_header_only_module(self):
+        source = """
+        (module m
+          (export foo)
+          (import other (bar baz))
+          (fn foo () (bar))
+          (fn broken (((()
+        """
+        header = list(parse_iter(source, header_only=True))
+        assert len(header) == 1
+        module = header[0]
+        assert is_form(module, 'module')
+        assert module[1].name == 'm'
+        assert [item[0].name for item in module.items[2:]] == ['export', 'import']
+
+    def test_header_only_top_level_imports(self):
+        header = list(parse_iter("(import a x) (import b y) (fn f () 1) (import c z)",
+                                 header_only=True))
+        assert [form[1].name for form in header] == ['a', 'b']
+
+
+# Node classes as they were before slotting, for the memory benchmark
+
+@dataclass
+class _DictSymbol:
+    name: str
+    line: int = 0
+    col: int = 0
+    resolved_type: Any = None
+
+@dataclass
+class _DictString:
+    value: str
+    line: int = 0
+    col: int = 0
+    resolved_type: Any = None
+
+@dataclass
+class _DictNumber:
+    value: Any
+    line: int = 0
+    col: int = 0
+    resolved_type: Any = None
+
+@dataclass
+class _DictSList:
+    items: List[Any]
+    line: int = 0
+    col: int = 0
+    resolved_type: Any = None
+
+
+def _to_dict_nodes(expr):
+    """Rebuild an AST with __dict__-based nodes and un-interned names."""
+    if isinstance(expr, SList):
+        return _DictSList([_to_dict_nodes(x) for x in expr.items], expr.line, expr.col)
+    if isinstance(expr, Symbol):
+        return _DictSymbol(expr.name.encode().decode(), expr.line, expr.col)
+    if isinstance(expr, String):
+        return _DictString(expr.value.encode().decode(), expr.line, expr.col)
+    return _DictNumber(expr.value, expr.line, expr.col)
+
+
+def _count_nodes(expr):
+    if isinstance(expr, SList):
+        return 1 + sum(_count_nodes(x) for x in expr.items)
+    return 1
+
+
+def _retained_bytes(build):
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+class TestAstMemoryBenchmark:
+    """Bytes per node for the self-hosted compiler sources"""
+
+    def test_slotted_nodes_smaller(self):
+        compiler_dir = Path(__file__).parent.parent / "lib" / "compiler"
+        sources = [p.read_text() for p in sorted(compiler_dir.glob("**/*.slop"))]
+
+        after_ast, after = _retained_bytes(lambda: [parse(src) for src in sources])
+        _, before = _retained_bytes(
+            lambda: [[_to_dict_nodes(form) for form in forms] for forms in after_ast])
+        nodes = sum(_count_nodes(form) for forms in after_ast for form in forms)
+
+        print(f"\n{nodes} nodes: {before / nodes:.1f} bytes/node before, "
+              f"{after / nodes:.1f} bytes/node after")
+        assert after < before
+
+    def test_symbol_names_interned(self):
+        a, b = parse("(let foo) (let foo)")
+        assert a[0].name is b[0].name
+        assert a[1].name is b[1].name
+
+    def test_nodes_have_no_dict(self):
+        node = parse("(f x)")[0]
+        assert not hasattr(node, '__dict__')
+        assert not hasattr(node[0], '__dict__')
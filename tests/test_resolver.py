@@ -0,0 +1,140 @@
+"""
+Module resolver tests for SLOP
+"""
+
+from pathlib import Path
+
+import pytest
+from slop.parser import get_parse_cache, parse_file, set_parse_cache
+from slop.resolver import ModuleResolver, ResolverError
+
+
+LINKING_DIR = Path(__file__).parent / "linking"
+MULTIMOD_DIR = Path(__file__).parent / "multimod" / "src"
+
+
+class TestDependencyGraph:
+    """Test dependency graph construction"""
+
+    def test_build_order(self):
+        resolver = ModuleResolver()
+        graph = resolver.build_dependency_graph(LINKING_DIR / "main.slop")
+        order = resolver.topological_sort(graph)
+        assert set(order) == {'main', 'core', 'strings'}
+        assert order[-1] == 'main'
+
+    def test_headers_only_matches_full(self):
+        full = ModuleResolver().build_dependency_graph(MULTIMOD_DIR / "main.slop")
+        headers = ModuleResolver().build_dependency_graph(MULTIMOD_DIR / "main.slop",
+                                                          headers_only=True)
+        assert headers.dependencies == full.dependencies
+        for name, info in full.modules.items():
+            assert headers.modules[name].exports == info.exports
+            assert [i.module_name for i in headers.modules[name].imports] == \
+                [i.module_name for i in info.imports]
+
+    def test_header_excludes_bodies(self):
+        info = ModuleResolver().load_module_header(MULTIMOD_DIR / "base.slop")
+        module = info.ast[0]
+        assert [item[0].name for item in module.items[2:]] == ['export']
+        assert info.exports == {'BaseError', 'ComputeResult', 'compute'}
+
+    def test_missing_module(self):
+        resolver = ModuleResolver()
+        with pytest.raises(ResolverError):
+            resolver.resolve_module('does-not-exist', LINKING_DIR / "main.slop")
+
+    def test_parallel_matches_sequential(self):
+        sequential = ModuleResolver()
+        parallel = ModuleResolver()
+        seq_graph = sequential.build_dependency_graph(MULTIMOD_DIR / "main.slop")
+        par_graph = parallel.build_dependency_graph(MULTIMOD_DIR / "main.slop", jobs=2)
+
+        assert list(par_graph.modules) == list(seq_graph.modules)
+        assert par_graph.dependencies == seq_graph.dependencies
+        for name, info in seq_graph.modules.items():
+            assert repr(par_graph.modules[name].ast) == repr(info.ast)
+        assert parallel.topological_sort(par_graph) == sequential.topological_sort(seq_graph)
+
+    def test_parallel_workers_fill_parse_cache(self, tmp_path):
+        from slop.cache import ParseCache
+        previous = set_parse_cache(ParseCache(tmp_path))
+        try:
+            parallel = ModuleResolver()
+            graph = parallel.build_dependency_graph(MULTIMOD_DIR / "main.slop", jobs=2)
+            cache = get_parse_cache()
+        finally:
+            set_parse_cache(previous)
+
+        expected = ModuleResolver().build_dependency_graph(MULTIMOD_DIR / "main.slop")
+        assert {name: repr(info.ast) for name, info in graph.modules.items()} == \
+            {name: repr(info.ast) for name, info in expected.modules.items()}
+        # math and native share a frontier, so workers parsed them and the
+        # parent loaded both from the cache
+        assert cache.hits == 2
+
+    def test_batch_parses_each_frontier_once(self):
+        calls = []
+
+        def parse_batch(paths):
+            calls.append(sorted(path.name for path in paths))
+            # One file fails in the batch and must be parsed again
+            return {str(path): ("boom", False) if path.name == "math.slop"
+                    else (parse_file(str(path)), True) for path in paths}
+
+        batched = ModuleResolver(parse_batch=parse_batch)
+        graph = batched.build_dependency_graph(MULTIMOD_DIR / "main.slop")
+        expected = ModuleResolver().build_dependency_graph(MULTIMOD_DIR / "main.slop")
+
+        assert calls == [["main.slop"], ["math.slop", "native.slop"], ["base.slop"]]
+        assert graph.dependencies == expected.dependencies
+        for name, info in expected.modules.items():
+            assert repr(graph.modules[name].ast) == repr(info.ast)
+
+    def test_prefetch_caches_what_the_batch_parsed(self):
+        paths = [MULTIMOD_DIR / "base.slop", MULTIMOD_DIR / "math.slop"]
+        resolver = ModuleResolver(parse_batch=lambda paths: {
+            str(paths[0]): (parse_file(str(paths[0])), True),
+            str(paths[1]): ("boom", False),
+        })
+        resolver.prefetch(paths)
+        assert list(resolver.cache) == [paths[0].resolve()]
+        # Without parse_batch there is nothing to do
+        plain = ModuleResolver()
+        plain.prefetch(paths)
+        assert plain.cache == {}
+
+
+
+class TestPathIndex:
+    """Test the directory index used by resolve_module"""
+
+    def test_repeat_lookups_do_not_probe(self):
+        resolver = ModuleResolver([MULTIMOD_DIR, LINKING_DIR])
+        resolver.resolve_module('math', MULTIMOD_DIR / "main.slop")
+        resolver.resolve_module('strings', MULTIMOD_DIR / "main.slop")
+        probes = resolver.fs_probes
+        assert probes > 0
+        for _ in range(10):
+            resolver.resolve_module('math', MULTIMOD_DIR / "main.slop")
+            resolver.resolve_module('strings', MULTIMOD_DIR / "main.slop")
+        assert resolver.fs_probes == probes
+
+    def test_search_order(self, tmp_path):
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        (first / "dup.slop").write_text("(module dup)")
+        (second / "dup.slop").write_text("(module dup)")
+        resolver = ModuleResolver([second, first])
+        assert resolver.resolve_module('dup') == (second / "dup.slop").resolve()
+        assert resolver.resolve_module('dup', first / "main.slop") == (first / "dup.slop").resolve()
+
+    def test_refresh_picks_up_new_files(self, tmp_path):
+        resolver = ModuleResolver([tmp_path])
+        with pytest.raises(ResolverError):
+            resolver.resolve_module('late')
+        (tmp_path / "late.slop").write_text("(module late)")
+        resolver.refresh()
+        assert resolver.resolve_module('late') == (tmp_path / "late.slop").resolve()
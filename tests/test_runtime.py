@@ -0,0 +1,463 @@
+"""
+Tests for the C runtime (slop_runtime.h) data structures
+"""
+
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+RUNTIME_DIR = Path(__file__).parent.parent / "src" / "slop" / "runtime"
+
+# Applies map operations read from stdin, one per line, printing results:
+#   p KEY VALUE   put            g KEY   get (value or "none")
+#   h KEY         has (0/1)      r KEY   remove
+#   k             keys, in order n       number of keys
+GMAP_DRIVER = r"""
+#include "slop_runtime.h"
+
+typedef struct { int64_t value; int64_t check; } driver_value;
+
+int main(void) {
+    void* m = map_empty();
+    char op;
+    long long k, v;
+    while (scanf(" %c", &op) == 1) {
+        if (op == 'p' && scanf("%lld %lld", &k, &v) == 2) {
+            driver_value dv = {v, ~v};
+            map_put(m, k, dv);
+        } else if (op == 'g' && scanf("%lld", &k) == 1) {
+            slop_gmap_option_raw r = _slop_map_get_raw(m, k);
+            driver_value dv;
+            memcpy(&dv, r.data.some, sizeof dv);
+            if (r.tag != 0) printf("none\n");
+            else printf("%lld\n", dv.check == ~dv.value ? (long long)dv.value : -1LL);
+        } else if (op == 'h' && scanf("%lld", &k) == 1) {
+            printf("%d\n", map_has(m, k));
+        } else if (op == 'r' && scanf("%lld", &k) == 1) {
+            map_remove(m, k);
+        } else if (op == 'k') {
+            slop_list_int keys = map_keys(m);
+            for (size_t i = 0; i < keys.len; i++) printf("%lld ", (long long)keys.data[i]);
+            printf("\n");
+        } else if (op == 'n') {
+            printf("%zu\n", ((slop_gmap_t*)m)->gmap_len);
+        }
+    }
+    return 0;
+}
+"""
+
+
+# The same operations through the typed accessors on an arena map, with
+# a value larger than the untyped get's 256-byte buffer, plus
+#   v             values, in order
+TYPED_GMAP_DRIVER = r"""
+#include "slop_runtime.h"
+
+typedef struct { int64_t value; int64_t pad[40]; int64_t check; } driver_value;
+typedef struct { bool has_value; driver_value value; } driver_option;
+typedef struct { driver_value* data; size_t len; size_t cap; } driver_list;
+SLOP_INT_MAP_DEFINE(int64_t, driver_value, driver_map, driver_option, driver_list)
+
+int main(void) {
+    slop_arena arena = slop_arena_new(4096);
+    driver_map* m = driver_map_new(&arena);
+    char op;
+    long long k, v;
+    while (scanf(" %c", &op) == 1) {
+        if (op == 'p' && scanf("%lld %lld", &k, &v) == 2) {
+            driver_value dv = {v, {0}, ~v};
+            driver_map_put(m, k, dv);
+        } else if (op == 'g' && scanf("%lld", &k) == 1) {
+            driver_option r = driver_map_get(m, k);
+            if (!r.has_value) printf("none\n");
+            else printf("%lld\n", r.value.check == ~r.value.value ? (long long)r.value.value : -1LL);
+        } else if (op == 'h' && scanf("%lld", &k) == 1) {
+            printf("%d\n", driver_map_has(m, k));
+        } else if (op == 'r' && scanf("%lld", &k) == 1) {
+            driver_map_remove(m, k);
+        } else if (op == 'k') {
+            slop_list_int keys = driver_map_keys(m);
+            for (size_t i = 0; i < keys.len; i++) printf("%lld ", (long long)keys.data[i]);
+            printf("\n");
+        } else if (op == 'v') {
+            driver_list values = driver_map_values(m);
+            for (size_t i = 0; i < values.len; i++) printf("%lld ", (long long)values.data[i].value);
+            printf("\n");
+        } else if (op == 'n') {
+            printf("%zu\n", m->gmap_len);
+        }
+    }
+    slop_arena_free(&arena);
+    return 0;
+}
+"""
+
+# String-keyed map operations, one per line, through the typed
+# slop_map_string_int accessors:
+#   p KEY VALUE   put            g KEY   get (value or "none")
+#   h KEY         has (0/1)      r KEY   remove (0/1: whether it was there)
+#   k             keys, sorted   n       number of keys
+#   R N           reserve room for N keys
+# With the argument "literal" the map starts as the literal {a: 1, b: 2, c: 3}.
+STRING_MAP_DRIVER = r"""
+#include "slop_runtime.h"
+
+static int64_t one = 1, two = 2, three = 3;
+static slop_map_entry literal[] = {
+    { .key = {1, "b"}, .value = &two, .occupied = true },
+    { .key = {1, "a"}, .value = &one, .occupied = true },
+    { .key = {1, "c"}, .value = &three, .occupied = true },
+};
+
+static int compare_keys(const void* a, const void* b) {
+    const slop_string* x = a;
+    const slop_string* y = b;
+    int c = memcmp(x->data, y->data, x->len < y->len ? x->len : y->len);
+    return c ? c : (x->len > y->len) - (x->len < y->len);
+}
+
+int main(int argc, char** argv) {
+    slop_arena arena = slop_arena_new(1 << 16);
+    slop_map_string_int m = slop_map_string_int_new(&arena, 0);
+    if (argc > 1 && strcmp(argv[1], "literal") == 0) {
+        m = (slop_map){ .entries = literal, .len = 3, .cap = 0 };
+    }
+    char op, buf[64];
+    long long v;
+    while (scanf(" %c", &op) == 1) {
+        if (op == 'p' && scanf("%63s %lld", buf, &v) == 2) {
+            slop_string key = slop_string_new_len(&arena, buf, strlen(buf));
+            slop_map_string_int_put(&arena, &m, key, v);
+        } else if (op == 'g' && scanf("%63s", buf) == 1) {
+            slop_option_int r = slop_map_string_int_get(&m, slop_string_new_len(&arena, buf, strlen(buf)));
+            if (!r.has_value) printf("none\n");
+            else printf("%lld\n", (long long)r.value);
+        } else if (op == 'h' && scanf("%63s", buf) == 1) {
+            printf("%d\n", slop_map_string_int_has(&m, slop_string_new_len(&arena, buf, strlen(buf))));
+        } else if (op == 'r' && scanf("%63s", buf) == 1) {
+            printf("%d\n", slop_map_remove(&m, slop_string_new_len(&arena, buf, strlen(buf))));
+        } else if (op == 'R' && scanf("%lld", &v) == 1) {
+            slop_map_reserve(&arena, &m, (size_t)v);
+        } else if (op == 'k') {
+            slop_list_string keys = slop_map_keys(&arena, &m);
+            qsort(keys.data, keys.len, sizeof(slop_string), compare_keys);
+            for (size_t i = 0; i < keys.len; i++) printf("%.*s ", (int)keys.data[i].len, keys.data[i].data);
+            printf("\n");
+        } else if (op == 'n') {
+            printf("%zu\n", m.len);
+        }
+    }
+    slop_arena_free(&arena);
+    return 0;
+}
+"""
+
+# Prints slop_hash_string of each input line, in hex, from an exactly
+# sized heap copy (so sanitizers catch reads past the end)
+HASH_DRIVER = r"""
+#include "slop_runtime.h"
+
+int main(void) {
+    char line[4096];
+    while (fgets(line, sizeof line, stdin)) {
+        size_t len = strcspn(line, "\n");
+        char* key = malloc(len ? len : 1);
+        memcpy(key, line, len);
+        printf("%016llx\n", (unsigned long long)slop_hash_string((slop_string){len, key}));
+        free(key);
+    }
+    return 0;
+}
+"""
+
+# Arena operations, one per line:
+#   a SIZE   allocate SIZE bytes and fill them with a per-allocation byte
+#   c        check every live allocation is intact and 8-byte aligned (0/1)
+#   b        number of blocks in the arena
+#   r        reset (forgetting the allocations)
+ARENA_DRIVER = r"""
+#include "slop_runtime.h"
+
+typedef struct { uint8_t* ptr; size_t size; } allocation;
+
+int main(void) {
+    slop_arena arena = slop_arena_new(64);
+    allocation* live = malloc(sizeof(allocation) * 1000000);
+    size_t count = 0;
+    char op;
+    size_t size;
+    while (scanf(" %c", &op) == 1) {
+        if (op == 'a' && scanf("%zu", &size) == 1) {
+            uint8_t* ptr = slop_arena_alloc(&arena, size);
+            memset(ptr, (int)(count & 0xff), size);
+            live[count++] = (allocation){ptr, size};
+        } else if (op == 'c') {
+            int ok = 1;
+            for (size_t i = 0; i < count; i++) {
+                ok &= ((uintptr_t)live[i].ptr & 7) == 0;
+                for (size_t j = 0; j < live[i].size; j++) ok &= live[i].ptr[j] == (uint8_t)(i & 0xff);
+            }
+            printf("%d\n", ok);
+        } else if (op == 'b') {
+            size_t blocks = 1;
+            for (slop_arena* b = arena.next; b; b = b->next) blocks++;
+            printf("%zu\n", blocks);
+        } else if (op == 'r') {
+            slop_arena_reset(&arena);
+            count = 0;
+        }
+    }
+    slop_arena_free(&arena);
+    free(live);
+    return 0;
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def c_compiler():
+    for cc in ("cc", "gcc"):
+        if shutil.which(cc):
+            return cc
+    pytest.skip("No C compiler available")
+
+
+def build_driver(cc, source, tmp_path, *flags):
+    """Compile a test driver, with sanitizers where the compiler has them."""
+    c_file = tmp_path / "driver.c"
+    exe = tmp_path / "driver"
+    c_file.write_text(source)
+    cmd = [cc, "-O1", "-Wall", "-Werror", *flags, f"-I{RUNTIME_DIR}", str(c_file), "-o", str(exe)]
+    if subprocess.run(cmd + ["-fsanitize=address,undefined"], capture_output=True).returncode:
+        subprocess.run(cmd, check=True, capture_output=True)
+    return exe
+
+
+def run_driver(exe, lines, *args, detect_leaks=False):
+    """Feed a driver one operation per line; returns its output lines."""
+    result = subprocess.run([str(exe), *args], input="\n".join(lines) + "\n", capture_output=True,
+                            text=True, env={"ASAN_OPTIONS": f"detect_leaks={int(detect_leaks)}"})
+    assert result.returncode == 0, result.stderr
+    return result.stdout.splitlines()
+
+
+class TestGenericMap:
+    """Differential test of the integer-keyed map against a dict"""
+
+    def expected(self, ops):
+        model, out = {}, []
+        for line in ops:
+            op, *args = line.split()
+            if op == 'p':
+                model[int(args[0])] = int(args[1])
+            elif op == 'g':
+                out.append(str(model.get(int(args[0]), "none")))
+            elif op == 'h':
+                out.append(str(int(int(args[0]) in model)))
+            elif op == 'r':
+                model.pop(int(args[0]), None)
+            elif op == 'k':
+                out.append("".join(f"{key} " for key in model))
+            elif op == 'v':
+                out.append("".join(f"{value} " for value in model.values()))
+            elif op == 'n':
+                out.append(str(len(model)))
+        return out
+
+    @pytest.mark.parametrize("driver", [GMAP_DRIVER, TYPED_GMAP_DRIVER], ids=["untyped", "typed"])
+    @pytest.mark.parametrize("seed, key_range", [(1, 8), (2, 100), (3, 5000), (4, 1 << 62)])
+    def test_random_operations(self, c_compiler, tmp_path, driver, seed, key_range):
+        exe = build_driver(c_compiler, driver, tmp_path)
+        rng = random.Random(seed)
+        keys = [rng.randrange(-key_range, key_range) for _ in range(300)]
+        ops = []
+        for _ in range(20000):
+            op = rng.choices("pghrkn", weights=[40, 20, 15, 25, 0.2, 1])[0]
+            key = rng.choice(keys)
+            if op == 'p':
+                ops.append(f"p {key} {rng.randrange(1 << 40)}")
+            elif op in "ghr":
+                ops.append(f"{op} {key}")
+            else:
+                ops.append(op)
+        ops += ["k", "n"]
+        assert run_driver(exe, ops) == self.expected(ops)
+
+    @pytest.mark.parametrize("driver", [GMAP_DRIVER, TYPED_GMAP_DRIVER], ids=["untyped", "typed"])
+    def test_grow_and_drain(self, c_compiler, tmp_path, driver):
+        exe = build_driver(c_compiler, driver, tmp_path)
+        n = 50000
+        ops = [f"p {k * 7919} {k}" for k in range(n)]
+        ops += [f"r {k * 7919}" for k in range(0, n, 2)]
+        ops += [f"g {k * 7919}" for k in range(0, n, 997)]
+        ops += [f"p {k * 7919} {k}" for k in range(0, n, 2)]
+        ops += ["n", "k"]
+        assert run_driver(exe, ops) == self.expected(ops)
+
+    def test_typed_lists_from_arena(self, c_compiler, tmp_path):
+        # Keys, values and the map itself all come from the arena, so
+        # freeing it alone leaves nothing behind
+        exe = build_driver(c_compiler, TYPED_GMAP_DRIVER, tmp_path)
+        ops = [f"p {k * 31} {k}" for k in range(2000)]
+        ops += [f"r {k * 31}" for k in range(0, 2000, 3)]
+        ops += [f"p {k * 31} {k + 1}" for k in range(0, 2000, 6)]
+        ops += ["k", "v", "n"]
+        assert run_driver(exe, ops, detect_leaks=True) == self.expected(ops)
+
+    def test_value_size_mismatch_aborts(self, c_compiler, tmp_path):
+        # Checked in every build, not only under SLOP_DEBUG
+        source = r"""
+#include "slop_runtime.h"
+
+int main(void) {
+    slop_gmap_t* m = map_empty();
+    int64_t small = 1;
+    int32_t other = 2;
+    map_put(m, 1, small);
+    map_put(m, 2, other);
+    return 0;
+}
+"""
+        exe = build_driver(c_compiler, source, tmp_path)
+        result = subprocess.run([str(exe)], capture_output=True, text=True,
+                                env={"ASAN_OPTIONS": "detect_leaks=0"})
+        assert result.returncode != 0
+        assert "value of 4 bytes in a map of 8-byte values" in result.stderr
+
+
+class TestStringMap:
+    """Differential test of the string-keyed map against a dict"""
+
+    LITERAL = {"a": 1, "b": 2, "c": 3}
+
+    def expected(self, ops, model):
+        out = []
+        for line in ops:
+            op, *args = line.split()
+            if op == 'p':
+                model[args[0]] = int(args[1])
+            elif op == 'g':
+                out.append(str(model.get(args[0], "none")))
+            elif op == 'h':
+                out.append(str(int(args[0] in model)))
+            elif op == 'r':
+                out.append(str(int(model.pop(args[0], None) is not None)))
+            elif op == 'k':
+                out.append("".join(f"{key} " for key in sorted(model)))
+            elif op == 'n':
+                out.append(str(len(model)))
+        return out
+
+    @pytest.mark.parametrize("start", ["empty", "literal"])
+    @pytest.mark.parametrize("seed, key_count", [(1, 5), (2, 60), (3, 3000)])
+    def test_random_operations(self, c_compiler, tmp_path, start, seed, key_count):
+        exe = build_driver(c_compiler, STRING_MAP_DRIVER, tmp_path)
+        rng = random.Random(seed)
+        # Keys sharing long prefixes and differing in length
+        keys = ["a", "b", "c"] + [f"k{rng.randrange(key_count)}" * rng.randint(1, 3)
+                                  for _ in range(key_count)]
+        ops = []
+        for _ in range(20000):
+            op = rng.choices("pghrRkn", weights=[40, 20, 15, 25, 0.1, 0.2, 1])[0]
+            key = rng.choice(keys)
+            if op == 'p':
+                ops.append(f"p {key} {rng.randrange(1 << 40)}")
+            elif op in "ghr":
+                ops.append(f"{op} {key}")
+            elif op == 'R':
+                ops.append(f"R {rng.randrange(2 * key_count)}")
+            else:
+                ops.append(op)
+        ops += ["k", "n"]
+        model = dict(self.LITERAL) if start == "literal" else {}
+        assert run_driver(exe, ops, start) == self.expected(ops, model)
+
+    @pytest.mark.parametrize("flags", [[], ["-DSLOP_HASH_FNV1A"]], ids=["wyhash", "fnv1a"])
+    def test_churn_reuses_tombstones(self, c_compiler, tmp_path, flags):
+        """Removing and re-adding keys many times keeps every key reachable"""
+        exe = build_driver(c_compiler, STRING_MAP_DRIVER, tmp_path, *flags)
+        ops = ["R 100"] + [f"p key{k} {k}" for k in range(100)]
+        for round_ in range(50):
+            ops += [f"r key{k}" for k in range(round_ % 2, 100, 2)]
+            ops += [f"p key{k} {k + round_}" for k in range(round_ % 2, 100, 2)]
+        ops += [f"g key{k}" for k in range(100)] + ["n"]
+        assert run_driver(exe, ops) == self.expected(ops, {})
+
+
+def fnv1a(data):
+    h = 14695981039346656037
+    for byte in data:
+        h = ((h ^ byte) * 1099511628211) % (1 << 64)
+    return h
+
+
+class TestStringHash:
+    """Test the SLOP_HASH_* string hashes"""
+
+    # Every length through the 4/16/48-byte branch boundaries and a few past
+    KEYS = ["".join(chr(97 + (i * 7 + n) % 26) for i in range(n)) for n in range(200)] + \
+        ["x" * 1000, "/api/v1/users/42", "Content-Type", "content-type"]
+
+    def hashes(self, exe, keys):
+        return [int(line, 16) for line in run_driver(exe, keys)]
+
+    def test_fnv1a_switch(self, c_compiler, tmp_path):
+        exe = build_driver(c_compiler, HASH_DRIVER, tmp_path, "-DSLOP_HASH_FNV1A")
+        assert self.hashes(exe, self.KEYS) == [fnv1a(key.encode()) for key in self.KEYS]
+
+    def test_wyhash_without_int128(self, c_compiler, tmp_path):
+        """The portable 64x64->128 multiply gives the same hashes"""
+        default = self.hashes(build_driver(c_compiler, HASH_DRIVER, tmp_path), self.KEYS)
+        (tmp_path / "portable").mkdir()
+        portable = build_driver(c_compiler, HASH_DRIVER, tmp_path / "portable", "-U__SIZEOF_INT128__")
+        assert self.hashes(portable, self.KEYS) == default
+        assert default != [fnv1a(key.encode()) for key in self.KEYS]
+
+    def test_collision_quality(self, c_compiler, tmp_path):
+        """No 64-bit collisions, and the low bits a map probes from are uniform"""
+        exe = build_driver(c_compiler, HASH_DRIVER, tmp_path)
+        keys = [f"/api/v1/users/{i // 8}/orders?page={i % 8}" for i in range(40000)] + \
+            [str(i) for i in range(40000)]
+        values = self.hashes(exe, keys)
+        assert len(set(values)) == len(keys)
+        buckets = 1024
+        counts = [0] * buckets
+        for value in values:
+            counts[value % buckets] += 1
+        expected = len(keys) / buckets
+        chi2 = sum((count - expected) ** 2 / expected for count in counts)
+        # df = 1023: the 99.9th percentile is about 1170
+        assert chi2 < 1200
+
+
+class TestArena:
+    """Test the arena's block list"""
+
+    def test_allocations_stay_intact(self, c_compiler, tmp_path):
+        exe = build_driver(c_compiler, ARENA_DRIVER, tmp_path)
+        rng = random.Random(5)
+        ops = []
+        for _ in range(3):
+            ops += [f"a {rng.choice([0, 1, 7, 8, 24, 100, 5000, 70000])}" for _ in range(3000)]
+            ops += ["c", "r"]
+        assert run_driver(exe, ops) == ["1", "1", "1"]
+
+    def test_blocks_grow_geometrically(self, c_compiler, tmp_path):
+        exe = build_driver(c_compiler, ARENA_DRIVER, tmp_path)
+        ops = ["a 16"] * 200000 + ["b", "c"]
+        blocks, ok = run_driver(exe, ops)
+        # 3.2 MB from a 64-byte first block, doubling from SLOP_ARENA_DEFAULT_SIZE
+        assert int(blocks) <= 12 and ok == "1"
+
+    def test_reset_keeps_largest_block(self, c_compiler, tmp_path):
+        exe = build_driver(c_compiler, ARENA_DRIVER, tmp_path)
+        cycle = ["a 16"] * 20000 + ["b", "r"]
+        out = run_driver(exe, cycle * 3)
+        # Once the kept block is big enough it holds a whole cycle
+        assert int(out[0]) > 3 and out == sorted(out, key=int, reverse=True)
+        assert out[-1] == "2"
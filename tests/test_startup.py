@@ -0,0 +1,89 @@
+"""
+CLI startup cost tests for SLOP
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Modules only the commands that compile, check or fill should load
+COMPILER_MODULES = {
+    'slop.parser', 'slop.transpiler', 'slop.type_checker', 'slop.hole_filler',
+    'slop.providers', 'slop.resolver', 'slop.formatter', 'slop.types',
+}
+
+
+def importtime(code, env=None):
+    """Run code under -X importtime.
+
+    Returns {module: cumulative microseconds} for every module imported;
+    modules imported directly by code (not by another module) are
+    additionally listed in the 'top' entry.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import sys; sys.path.insert(0, {SRC!r})\n{code}"],
+        capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    modules, top = {}, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(' '):
+            top[name.strip()] = int(cumulative)
+    modules['top'] = top
+    return modules
+
+
+class TestLazyImports:
+    """Subcommand modules are imported only when their command runs"""
+
+    def test_import_cli(self):
+        assert not COMPILER_MODULES & set(importtime("import slop.cli"))
+
+    @pytest.mark.parametrize("argv", [
+        ['slop', 'ref', '--list'],
+        ['slop', 'ref', 'types'],
+        ['slop', '--help'],
+    ])
+    def test_light_commands(self, argv, tmp_path):
+        code = (f"sys.argv = {argv!r}\nimport slop.cli\n"
+                f"try:\n    slop.cli.main()\nexcept SystemExit:\n    pass")
+        env = dict(os.environ, SLOP_CACHE_DIR=str(tmp_path))
+        assert not COMPILER_MODULES & set(importtime(code, env))
+
+    def test_compiler_loaded_on_use(self):
+        assert 'slop.parser' in importtime("import slop.cli\nslop.cli._has_imports([])")
+
+    def test_package_exports(self):
+        import slop
+        from slop import TypeChecker, INT, parse
+        assert parse("(f 1)")[0][0].name == 'f'
+        assert {'transpile', 'check_file', 'UNKNOWN'} <= set(dir(slop))
+        assert slop.TypeChecker is TypeChecker and slop.INT is INT
+        with pytest.raises(AttributeError):
+            slop.no_such_name
+
+
+class TestStartupBenchmark:
+    """Importing the CLI costs a fraction of importing the compiler"""
+
+    def _best(self, code, runs=3):
+        return min(sum(importtime(code)['top'].values()) for _ in range(runs))
+
+    def test_cli_import_fraction(self):
+        lazy = self._best("import slop.cli")
+        eager = self._best("import slop.cli, slop.transpiler, slop.type_checker, "
+                           "slop.hole_filler, slop.resolver, slop.formatter")
+        print(f"\nimport slop.cli: {lazy / 1000:.1f}ms, "
+              f"with the compiler modules: {eager / 1000:.1f}ms")
+        assert lazy < eager / 2
@@ -0,0 +1,144 @@
+"""
+Phase timing instrumentation tests for SLOP
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from slop import cli, timings
+
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+@pytest.fixture
+def recorder():
+    rec = timings.enable()
+    yield rec
+    timings.disable()
+
+
+def _names(rec):
+    return [(e.depth, e.name, e.module) for e in sorted(rec.events, key=lambda e: e.start)]
+
+
+class TestRecorder:
+    """Test phase nesting and output formats"""
+
+    def test_disabled(self):
+        assert timings.recorder() is None
+        with timings.phase('parse'):
+            timings.step('check')
+        assert list(timings.each('check', ['a'])) == ['a']
+
+    def test_nesting(self, recorder):
+        with timings.phase('build'):
+            timings.step('parse')
+            with timings.phase('parse', module='a'):
+                pass
+            timings.step('check')
+            for _ in timings.each('check', ['a', 'b']):
+                pass
+        assert _names(recorder) == [
+            (0, 'build', None), (1, 'parse', None), (2, 'parse', 'a'),
+            (1, 'check', None), (2, 'check', 'a'), (2, 'check', 'b')]
+        build = next(e for e in recorder.events if e.name == 'build')
+        assert build.wall >= sum(e.wall for e in recorder.events if e.depth == 1)
+        assert build.peak_rss_kb > 0
+
+    def test_phase_ends_on_exception(self, recorder):
+        with pytest.raises(ValueError):
+            with timings.phase('build'):
+                timings.step('parse')
+                raise ValueError
+        with timings.phase('next'):
+            pass
+        assert _names(recorder) == [(0, 'build', None), (1, 'parse', None), (0, 'next', None)]
+
+    def test_worker_threads(self, recorder):
+        def work():
+            with timings.phase('cc', module='m'):
+                pass
+        with timings.phase('compile'):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        cc = next(e for e in recorder.events if e.name == 'cc')
+        assert cc.depth == 1 and cc.thread == 1
+        assert cc.child_cpu is None
+
+    def test_child_cpu(self, recorder):
+        import subprocess
+        with timings.phase('spin'):
+            subprocess.run([sys.executable, '-c', 'sum(range(3_000_000))'])
+        assert recorder.events[0].child_cpu > 0
+
+    def test_chrome_trace(self, recorder):
+        with timings.phase('build', files=2):
+            timings.step('parse', module='a')
+        trace = json.loads(json.dumps(recorder.chrome_trace()))
+        parse, build = sorted(trace['traceEvents'], key=lambda t: -t['ts'])
+        assert build['ph'] == parse['ph'] == 'X'
+        assert build['name'] == 'build' and build['args']['files'] == 2
+        assert parse['name'] == 'parse [a]' and parse['args']['module'] == 'a'
+        assert build['ts'] <= parse['ts']
+        assert parse['ts'] + parse['dur'] <= build['ts'] + build['dur']
+
+    def test_table(self, recorder):
+        with timings.phase('build'):
+            with timings.phase('check', module='net'):
+                pass
+        lines = recorder.table().splitlines()
+        assert lines[0].split() == ['phase', 'wall', 'ms', 'cpu', 'ms', 'child', 'ms', 'rss', 'MB']
+        assert lines[1].startswith('build ')
+        assert lines[2].startswith('  check [net] ')
+
+    @pytest.mark.parametrize("value, expected", [
+        ('', None), ('0', None), ('1', '-'), ('out.json', 'out.json')])
+    def test_destination_from_env(self, monkeypatch, value, expected):
+        monkeypatch.setenv('SLOP_TIMINGS', value)
+        assert timings.destination_from_env() == expected
+
+
+class TestTimingsFlag:
+    """Test --timings and --timings-trace on the CLI"""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, monkeypatch):
+        monkeypatch.delenv('SLOP_TIMINGS', raising=False)
+        yield
+        timings.disable()
+
+    def run(self, monkeypatch, *argv):
+        monkeypatch.setattr(sys, 'argv', ['slop', '--no-cache', *argv])
+        return cli.main()
+
+    def test_table(self, monkeypatch, capsys):
+        assert self.run(monkeypatch, '--timings', 'check', '--python',
+                        str(EXAMPLES / "hello.slop")) == 0
+        err = capsys.readouterr().err
+        assert err.splitlines()[0].startswith('phase')
+        assert '\ncheck ' in err
+        assert '\n  parse ' in err and '\n  check ' in err
+
+    def test_trace_from_env(self, monkeypatch, tmp_path, capsys):
+        trace = tmp_path / "trace.json"
+        monkeypatch.setenv('SLOP_TIMINGS', str(trace))
+        assert self.run(monkeypatch, 'check', '--python', str(EXAMPLES / "hello.slop")) == 0
+        names = {t['name'] for t in json.loads(trace.read_text())['traceEvents']}
+        assert {'check', 'parse'} <= names
+
+    def test_trace_flag(self, monkeypatch, tmp_path, capsys):
+        trace = tmp_path / "trace.json"
+        assert self.run(monkeypatch, '--timings-trace', str(trace), 'check', '--python',
+                        str(EXAMPLES / "hello.slop")) == 0
+        assert json.loads(trace.read_text())['traceEvents']
+        assert f"Timings written to {trace}" in capsys.readouterr().err
+
+    def test_off_by_default(self, monkeypatch, capsys):
+        assert self.run(monkeypatch, 'check', '--python', str(EXAMPLES / "hello.slop")) == 0
+        assert 'wall ms' not in capsys.readouterr().err
+        assert timings.recorder() is None
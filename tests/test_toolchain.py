@@ -0,0 +1,143 @@
+"""
+Native toolchain discovery tests for SLOP
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from slop import cli, toolchain
+from slop.toolchain import find_component
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """A fake project root with parser sources and an empty bin/"""
+    monkeypatch.setattr(toolchain, 'PROJECT_ROOT', tmp_path)
+    monkeypatch.chdir(tmp_path)
+    source_dir = tmp_path / "lib" / "compiler" / "parser"
+    source_dir.mkdir(parents=True)
+    (source_dir / "slop.toml").write_text(
+        '[project]\nname = "slop-parser"\nversion = "1.2.3"\n\n'
+        '[build]\ninclude = ["../common"]\n')
+    (source_dir / "main.slop").write_text("(module main)\n")
+    (tmp_path / "lib" / "compiler" / "common").mkdir()
+    (tmp_path / "lib" / "compiler" / "common" / "types.slop").write_text("(module types)\n")
+    (tmp_path / "bin").mkdir()
+    toolchain.clear()
+    toolchain.set_hash_cache_dir(None)
+    yield tmp_path
+    toolchain.clear()
+    toolchain.set_hash_cache_dir(None)
+
+
+def _install(root, name, content=b"binary", mtime_ns=None):
+    path = root / "bin" / f"slop-{name}"
+    path.write_bytes(content)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def _age_sources(root, mtime_ns):
+    for path in (root / "lib" / "compiler").glob("*/*.slop"):
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFindComponent:
+    """Test per-process resolution of native binaries"""
+
+    def test_not_found(self, root):
+        assert find_component('parser') is None
+        assert cli.find_native_component('parser') is None
+
+    def test_resolved_once(self, root):
+        path = _install(root, 'parser')
+        first = find_component('parser')
+        assert first.path == path
+        assert find_component('parser') is first
+        assert cli.find_native_component('parser') == path
+
+    def test_rebuilt_binary_is_rediscovered(self, root):
+        path = _install(root, 'parser', mtime_ns=1_000_000_000)
+        first = find_component('parser')
+        assert first.sha256
+        _install(root, 'parser', b"rebuilt binary", mtime_ns=2_000_000_000)
+        second = find_component('parser')
+        assert second is not first
+        assert second.sha256 != first.sha256
+        path.unlink()
+        assert find_component('parser') is None
+
+    def test_version_and_sources(self, root):
+        _install(root, 'parser')
+        component = find_component('parser')
+        assert component.version == "1.2.3"
+        assert [p.name for p in component.source_files()] == ["main.slop", "types.slop"]
+
+    def test_staleness(self, root):
+        _age_sources(root, 1_000_000_000)
+        _install(root, 'parser', mtime_ns=2_000_000_000)
+        assert find_component('parser').stale is False
+        types = root / "lib" / "compiler" / "common" / "types.slop"
+        os.utime(types, ns=(3_000_000_000, 3_000_000_000))
+        assert find_component('parser').stale is True
+        assert find_component('parser').newest_source()[0] == types
+
+    def test_unknown_sources(self, root):
+        _install(root, 'checker')
+        assert find_component('checker').stale is None
+
+
+class TestHashCache:
+    """Test the on-disk cache of binary content hashes"""
+
+    def test_hash_reused_while_unchanged(self, root, tmp_path):
+        toolchain.set_hash_cache_dir(tmp_path / "cache")
+        _install(root, 'parser', mtime_ns=1_000_000_000)
+        digest = find_component('parser').sha256
+        hashes = json.loads((tmp_path / "cache" / "toolchain.json").read_text())
+        [entry] = hashes.values()
+        assert entry['sha256'] == digest
+
+        # Same size and mtime in a new process: the stored hash is trusted
+        entry['sha256'] = "from-cache"
+        (tmp_path / "cache" / "toolchain.json").write_text(json.dumps(hashes))
+        toolchain.clear()
+        assert find_component('parser').sha256 == "from-cache"
+
+        # A rebuilt binary is hashed again
+        _install(root, 'parser', mtime_ns=2_000_000_000)
+        assert find_component('parser').sha256 == digest
+
+    def test_disabled_by_default(self, root, tmp_path):
+        _install(root, 'parser')
+        assert find_component('parser').sha256
+        assert not list(tmp_path.glob("**/toolchain.json"))
+
+
+class TestToolchainInfo:
+    """Test `slop toolchain info`"""
+
+    def run(self, monkeypatch, capsys, *extra):
+        monkeypatch.setattr(sys, 'argv', ['slop', '--no-cache', 'toolchain', 'info', *extra])
+        assert cli.main() == 0
+        return capsys.readouterr().out
+
+    def test_report(self, root, monkeypatch, capsys):
+        _age_sources(root, 1_000_000_000)
+        _install(root, 'parser', mtime_ns=2_000_000_000)
+        out = self.run(monkeypatch, capsys)
+        assert f"parser      {root / 'bin' / 'slop-parser'}" in out
+        assert "version 1.2.3" in out
+        assert "up to date" in out
+        assert "checker     not found" in out
+
+    def test_json_reports_stale(self, root, monkeypatch, capsys):
+        _install(root, 'parser', mtime_ns=1_000_000_000)
+        _age_sources(root, 2_000_000_000)
+        report = json.loads(self.run(monkeypatch, capsys, '--json'))
+        assert report['parser']['stale'] is True
+        assert report['parser']['version'] == "1.2.3"
+        assert report['checker'] is None
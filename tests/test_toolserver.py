@@ -0,0 +1,205 @@
+"""
+Native tool server tests for SLOP
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from slop import toolserver
+from slop.toolserver import ToolServer, run_tool
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Minimal stand-in for a native tool: echoes each path, status 1 for "bad",
+# writes to stderr for "warn" (one line) and "noisy" (more than a pipe holds),
+# and sends BLOB as binary output for "blob".
+FAKE_TOOL = '''#!{python}
+import os, sys
+BLOB = {blob!r}
+args = sys.argv[1:]
+if args != ['--serve']:
+    print("oneshot", os.getpid(), *args)
+    sys.exit(0)
+print("#ready", flush=True)
+for line in sys.stdin:
+    paths = line.rstrip("\\n").split("\\t")
+    if "crash" in paths:
+        sys.exit(3)
+    if "warn" in paths:
+        print("warning:", *paths, file=sys.stderr, flush=True)
+    if "noisy" in paths:
+        sys.stderr.write("x" * 200000)
+        sys.stderr.flush()
+    if "blob" in paths:
+        print("#bin", len(BLOB), flush=True)
+        sys.stdout.buffer.write(BLOB)
+        sys.stdout.buffer.flush()
+    print("served", os.getpid(), *paths)
+    print("#done", 1 if "bad" in paths else 0, flush=True)
+'''
+
+# Binary output that looks like the end of a reply
+BLOB = b"\x00\n#done 7\n#bin 99\n\xff"
+
+# A tool that predates --serve: treats every argument as a file
+OLD_TOOL = '''#!{python}
+import sys
+print("Error: Could not open file:", sys.argv[1])
+sys.exit(1)
+'''
+
+
+def _write_tool(path, template):
+    path.write_text(template.format(python=sys.executable, blob=BLOB))
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def fresh_servers(monkeypatch):
+    monkeypatch.delenv('SLOP_NO_SERVER', raising=False)
+    toolserver.shutdown()
+    yield
+    toolserver.shutdown()
+
+
+class TestToolServer:
+    """Test the client side of the --serve protocol"""
+
+    def test_requests_share_one_process(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        first = run_tool(tool, ["a.slop", "b.slop"])
+        second = run_tool(tool, ["c.slop"])
+        assert first.returncode == 0
+        assert first.stdout.split()[0] == "served"
+        assert first.stdout.split()[2:] == ["a.slop", "b.slop"]
+        # Same pid: the second request went to the same process
+        assert second.stdout.split()[1] == first.stdout.split()[1]
+
+    def test_workers_get_their_own_process(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        first = run_tool(tool, ["a.slop"], worker=0)
+        second = run_tool(tool, ["b.slop"], worker=1)
+        again = run_tool(tool, ["c.slop"], worker=1)
+        assert first.stdout.split()[1] != second.stdout.split()[1]
+        assert again.stdout.split()[1] == second.stdout.split()[1]
+
+    def test_status_is_returned(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        assert run_tool(tool, ["bad"]).returncode == 1
+
+    def test_stderr_is_returned_per_request(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        warned = run_tool(tool, ["warn", "a.slop"])
+        assert warned.stderr == "warning: warn a.slop\n"
+        assert warned.stdout.split()[0] == "served"
+        assert run_tool(tool, ["b.slop"]).stderr == ""
+        noisy = run_tool(tool, ["noisy"])
+        assert noisy.stderr == "x" * 200000
+        assert noisy.stdout.split()[2:] == ["noisy"]
+
+    def test_binary_output_is_passed_through(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        result = run_tool(tool, ["blob"], text=False)
+        assert result.returncode == 0
+        pid = toolserver.get_server(tool).proc.pid
+        assert result.stdout == BLOB + f"served {pid} blob\n".encode()
+        assert result.stderr == b""
+        # The stream is back in step for the next request
+        assert run_tool(tool, ["a.slop"]).stdout == f"served {pid} a.slop\n"
+
+    def test_tool_without_serve_falls_back(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", OLD_TOOL)
+        assert toolserver.get_server(tool) is None
+        result = run_tool(tool, ["x.slop"])
+        assert result.stdout == "Error: Could not open file: x.slop\n"
+
+    def test_crash_falls_back_to_oneshot(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        result = run_tool(tool, ["crash"], oneshot_args=["--flag"])
+        assert result.stdout.split()[0] == "oneshot"
+        assert result.stdout.split()[2:] == ["--flag", "crash"]
+        assert toolserver.get_server(tool) is None
+
+    def test_disabled_by_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('SLOP_NO_SERVER', '1')
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        assert run_tool(tool, ["a.slop"]).stdout.split()[0] == "oneshot"
+
+    def test_close_stops_process(self, tmp_path):
+        tool = _write_tool(tmp_path / "tool", FAKE_TOOL)
+        server = ToolServer(tool)
+        assert server.start()
+        proc = server.proc
+        server.close()
+        assert proc.returncode == 0
+
+
+class TestNativeServe:
+    """Test --serve in the native parser against one-shot runs"""
+
+    def test_matches_oneshot_output(self, native_parser):
+        files = [str(REPO_ROOT / "tests" / "multimod" / "src" / name)
+                 for name in ("base.slop", "math.slop")]
+        for path in files:
+            served = run_tool(native_parser, [path])
+            oneshot = subprocess.run([str(native_parser), '--format', 'json', path],
+                                     capture_output=True, text=True)
+            assert served.returncode == oneshot.returncode == 0
+            assert json.loads(served.stdout) == json.loads(oneshot.stdout)
+        assert toolserver.get_server(native_parser).requests == 2
+
+    def test_batch_request(self, native_parser, tmp_path):
+        good = str(REPO_ROOT / "tests" / "multimod" / "src" / "base.slop")
+        missing = str(tmp_path / "missing.slop")
+        result = run_tool(native_parser, ['--batch', good, missing])
+        assert result.returncode == 1
+        batch = json.loads(result.stdout)
+        assert list(batch) == [good, missing]
+        assert 'ast' in batch[good] and 'error' in batch[missing]
+
+    def test_binary_request_matches_oneshot(self, native_parser, tmp_path):
+        good = str(REPO_ROOT / "tests" / "multimod" / "src" / "base.slop")
+        missing = str(tmp_path / "missing.slop")
+        for path in (good, missing):
+            served = run_tool(native_parser, ['--format', 'bin', path], text=False)
+            oneshot = subprocess.run([str(native_parser), '--format', 'bin', path],
+                                     capture_output=True)
+            assert served.returncode == oneshot.returncode
+            assert served.stdout == oneshot.stdout
+        assert toolserver.get_server(native_parser).requests == 2
+
+    def test_binary_batch_matches_oneshot(self, native_parser, tmp_path):
+        good = str(REPO_ROOT / "tests" / "multimod" / "src" / "base.slop")
+        missing = str(tmp_path / "missing.slop")
+        args = ['--format', 'bin', '--batch', good, missing]
+        served = run_tool(native_parser, args, text=False)
+        oneshot = subprocess.run([str(native_parser)] + args, capture_output=True)
+        assert served.returncode == oneshot.returncode == 1
+        assert served.stdout == oneshot.stdout
+        assert toolserver.get_server(native_parser).requests == 1
+
+    def test_error_status(self, native_parser, tmp_path):
+        missing = str(tmp_path / "missing.slop")
+        result = run_tool(native_parser, [missing])
+        assert result.returncode == 1
+        assert "Could not open file" in result.stdout
+        # The server survives a failed request
+        assert toolserver.get_server(native_parser) is not None
+
+    def test_changed_file_is_parsed_again(self, native_parser, tmp_path):
+        # Times in the past, so the server caches both versions
+        path = tmp_path / "mod.slop"
+        path.write_text("(fn a () 1)\n")
+        os.utime(path, (1_600_000_000, 1_600_000_000))
+        first = run_tool(native_parser, [str(path)])
+        assert run_tool(native_parser, [str(path)]).stdout == first.stdout
+        path.write_text("(fn b () 22)\n")
+        os.utime(path, (1_600_000_001, 1_600_000_001))
+        second = json.loads(run_tool(native_parser, [str(path)]).stdout)
+        assert second[0]['items'][1]['name'] == 'b'
@@ -863,6 +863,21 @@ class TestMultiModuleTypes:
         assert 'math_Score' in main_header
         assert 'main_Score' not in main_header
 
+    def test_only_matches_full_transpile(self):
+        """Transpiling a subset gives the same C as transpiling every module"""
+        from pathlib import Path
+        from slop.transpiler import transpile_multi_split
+        from slop.resolver import ModuleResolver
+
+        src = Path(__file__).parent / "multimod" / "src"
+        resolver = ModuleResolver([src])
+        graph = resolver.build_dependency_graph(src / "main.slop")
+        order = resolver.topological_sort(graph)
+        full = transpile_multi_split(graph.modules, order)
+        for name in order:
+            assert transpile_multi_split(graph.modules, order, only={name}) == {name: full[name]}
+        assert transpile_multi_split(graph.modules, order, only=set()) == {}
+
 
 class TestTranspilerValidation:
     """Test that transpiler rejects malformed input instead of generating invalid C"""
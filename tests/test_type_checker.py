@@ -2,12 +2,18 @@
 Type checker tests for SLOP
 """
 
+import os
+import time
+from pathlib import Path
+
 import pytest
 from slop.type_checker import (
     TypeChecker, check_source, check_file,
     RangeBounds, RangeType, RecordType, EnumType, PtrType
 )
 from slop.parser import parse
+from slop.resolver import ModuleResolver
+from slop.type_checker import check_modules
 
 
 class TestRangeBounds:
@@ -197,6 +203,101 @@ class TestModuleTypeChecking:
         assert len(errors) == 0
 
 
+class TestInterfaceOnlyChecking:
+    """Test check_modules with modules restricted to interface collection"""
+
+    @pytest.fixture
+    def graph(self, tmp_path):
+        (tmp_path / "base.slop").write_text("""
+        (module base
+          (export twice)
+          (fn twice ((x Int))
+            (@spec ((Int) -> Int))
+            "not an int"))
+        """)
+        (tmp_path / "app.slop").write_text("""
+        (module app
+          (import base (twice))
+          (fn main ()
+            (@spec (() -> Int))
+            (twice 21)))
+        """)
+        resolver = ModuleResolver([tmp_path])
+        graph = resolver.build_dependency_graph(tmp_path / "app.slop")
+        return graph, resolver.topological_sort(graph)
+
+    def test_full_check_reports_body_errors(self, graph):
+        graph, order = graph
+        results = check_modules(graph.modules, order)
+        assert any(d.severity == 'error' for d in results['base'])
+
+    def test_interface_only_skips_bodies_but_exports_signatures(self, graph):
+        graph, order = graph
+        results = check_modules(graph.modules, order, interface_only={'base'})
+        assert 'base' not in results
+        assert [d for d in results['app'] if d.severity == 'error'] == []
+
+
+class TestParallelModuleChecking:
+    """Test check_modules on a worker pool against the sequential order"""
+
+    TRANSPILER = Path(__file__).parent.parent / "lib" / "compiler" / "transpiler" / "main.slop"
+
+    def _check(self, entry, jobs, interface_only=None):
+        from slop.type_checker import _project_search_paths, _walk
+        resolver = ModuleResolver(_project_search_paths(entry.resolve()))
+        graph = resolver.build_dependency_graph(entry)
+        order = resolver.topological_sort(graph)
+        start = time.perf_counter()
+        results = check_modules(graph.modules, order, interface_only, jobs=jobs)
+        elapsed = time.perf_counter() - start
+        diagnostics = {name: [str(d) for d in ds] for name, ds in results.items()}
+        annotations = [(name, i, repr(node.resolved_type)) for name in order
+                       for i, node in enumerate(_walk(graph.modules[name].ast))
+                       if node.resolved_type is not None]
+        return diagnostics, annotations, elapsed
+
+    def test_same_as_sequential(self):
+        entry = Path(__file__).parent / "multimod" / "src" / "main.slop"
+        sequential = self._check(entry, 1, {'base'})
+        parallel = self._check(entry, 3, {'base'})
+        assert list(parallel[0]) == list(sequential[0])
+        assert parallel[:2] == sequential[:2]
+        assert sequential[1]
+
+    def test_errors_reported(self, tmp_path):
+        (tmp_path / "base.slop").write_text("""
+        (module base
+          (export twice)
+          (fn twice ((x Int))
+            (@spec ((Int) -> Int))
+            "not an int"))
+        """)
+        (tmp_path / "other.slop").write_text("(module other (export one) (fn one () (@spec (() -> Int)) 1))")
+        (tmp_path / "app.slop").write_text("""
+        (module app
+          (import base (twice))
+          (import other (one))
+          (fn main ()
+            (@spec (() -> Int))
+            (twice (one))))
+        """)
+        diagnostics, _, _ = self._check(tmp_path / "app.slop", 2)
+        assert any('error' in d for d in diagnostics['base'])
+        assert diagnostics['app'] == diagnostics['other'] == []
+
+    def test_benchmark_transpiler(self):
+        """The native transpiler's modules, checked in order and in parallel"""
+        sequential = self._check(self.TRANSPILER, 1)
+        parallel = self._check(self.TRANSPILER, os.cpu_count() or 1)
+        parallel4 = self._check(self.TRANSPILER, 4)
+        print(f"\ncheck_modules on lib/compiler/transpiler ({len(sequential[0])} modules, "
+              f"{os.cpu_count()} CPUs): sequential {sequential[2] * 1000:.0f}ms, "
+              f"jobs={os.cpu_count()} {parallel[2] * 1000:.0f}ms, "
+              f"jobs=4 {parallel4[2] * 1000:.0f}ms")
+        assert parallel[:2] == parallel4[:2] == sequential[:2]
+
+
 class TestExampleFiles:
     """Test type checking example files"""
 